@@ -0,0 +1,15 @@
+# AutoTransform
+# Large scale, component based code modification library
+#
+# Licensed under the MIT License <http://opensource.org/licenses/MIT>
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2022-present Nathan Rockenbach <http://github.com/nathro>
+
+# @black_format
+
+"""Benchmarks for AutoTransform components, run against generated synthetic monorepos.
+
+Run the suite with `python -m benchmarks run --size 10k --output results.json` from the root of
+the repository, with src/python on the PYTHONPATH. Results from two runs can be compared using
+`python -m benchmarks compare baseline.json results.json`.
+"""
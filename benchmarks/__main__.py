@@ -0,0 +1,120 @@
+# AutoTransform
+# Large scale, component based code modification library
+#
+# Licensed under the MIT License <http://opensource.org/licenses/MIT>
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2022-present Nathan Rockenbach <http://github.com/nathro>
+
+# @black_format
+
+"""The entry point for running and comparing benchmarks."""
+
+import json
+import os
+import sys
+import tempfile
+from argparse import ArgumentParser, Namespace
+
+from benchmarks.generator import SIZES, get_repo
+from benchmarks.suite import compare, run_suite
+
+
+def run_command(args: Namespace) -> int:
+    """Runs the benchmark suite for each requested repo size.
+
+    Args:
+        args (Namespace): The arguments supplied to the run command.
+
+    Returns:
+        int: The exit code.
+    """
+
+    report = {}
+    for size in args.size or ["10k"]:
+        num_files = SIZES[size] if size in SIZES else int(size)
+        print(f"Preparing repo with {num_files} files")
+        repo_path = get_repo(num_files, args.repo_cache, args.seed)
+        report[size] = run_suite(repo_path, repeat=args.repeat, patterns=args.benchmark)
+
+    if args.output:
+        with open(args.output, "w", encoding="UTF-8") as output_file:
+            json.dump(report, output_file, indent=4)
+    else:
+        print(json.dumps(report, indent=4))
+    return 0
+
+
+def compare_command(args: Namespace) -> int:
+    """Compares saved results, failing if any benchmark regressed.
+
+    Args:
+        args (Namespace): The arguments supplied to the compare command.
+
+    Returns:
+        int: The exit code, 1 if there are regressions.
+    """
+
+    with open(args.baseline, "r", encoding="UTF-8") as baseline_file:
+        baseline = json.load(baseline_file)
+    with open(args.current, "r", encoding="UTF-8") as current_file:
+        current = json.load(current_file)
+
+    has_regressions = False
+    for size, results in current.items():
+        if size not in baseline:
+            continue
+        for name, baseline_seconds, current_seconds in compare(
+            baseline[size], results, args.threshold
+        ):
+            has_regressions = True
+            print(
+                f"[{size}] {name}: {baseline_seconds:.4f}s -> {current_seconds:.4f}s "
+                + f"({current_seconds / baseline_seconds - 1:+.1%})"
+            )
+    if not has_regressions:
+        print("No regressions found")
+    return 1 if has_regressions else 0
+
+
+def main() -> None:
+    """Parses arguments and runs the requested command."""
+
+    parser = ArgumentParser(prog="python -m benchmarks", description="AutoTransform benchmarks")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = subparsers.add_parser("run", help="Runs the benchmark suite.")
+    run_parser.add_argument(
+        "--size",
+        action="append",
+        help=f"The repo size to benchmark, one of {', '.join(SIZES)} or a number of files. "
+        + "May be repeated. Defaults to 10k.",
+    )
+    run_parser.add_argument(
+        "--benchmark",
+        action="append",
+        help="A glob pattern selecting benchmarks to run, such as filter.*. May be repeated.",
+    )
+    run_parser.add_argument("--repeat", type=int, default=3, help="Repeats of each benchmark.")
+    run_parser.add_argument("--seed", type=int, default=0, help="The seed for generated repos.")
+    run_parser.add_argument(
+        "--repo-cache",
+        default=os.path.join(tempfile.gettempdir(), "autotransform_benchmarks"),
+        help="The directory generated repos are kept in between runs.",
+    )
+    run_parser.add_argument("--output", help="The file to write JSON results to.")
+    run_parser.set_defaults(func=run_command)
+
+    compare_parser = subparsers.add_parser("compare", help="Compares saved results.")
+    compare_parser.add_argument("baseline", help="The JSON results of the baseline run.")
+    compare_parser.add_argument("current", help="The JSON results of the current run.")
+    compare_parser.add_argument(
+        "--threshold", type=float, default=0.1, help="The relative slowdown that is a regression."
+    )
+    compare_parser.set_defaults(func=compare_command)
+
+    args = parser.parse_args()
+    sys.exit(args.func(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+# AutoTransform
+# Large scale, component based code modification library
+#
+# Licensed under the MIT License <http://opensource.org/licenses/MIT>
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2022-present Nathan Rockenbach <http://github.com/nathro>
+
+# @black_format
+
+"""LibCST codemods used by benchmarks."""
+
+import libcst
+from libcst.codemod import VisitorBasedCodemodCommand
+
+
+class RenameNameAttributeCommand(VisitorBasedCodemodCommand):
+    """Renames the name attribute of objects to label, keeping the cost of the codemod itself
+    small so that benchmarks measure parsing and code generation."""
+
+    DESCRIPTION = "Renames name attributes to label."
+
+    def leave_Attribute(  # pylint: disable=invalid-name
+        self, original_node: libcst.Attribute, updated_node: libcst.Attribute
+    ) -> libcst.Attribute:
+        """Renames name attributes.
+
+        Args:
+            original_node (libcst.Attribute): The original attribute.
+            updated_node (libcst.Attribute): The attribute with updated children.
+
+        Returns:
+            libcst.Attribute: The renamed attribute.
+        """
+
+        if updated_node.attr.value == "name":
+            return updated_node.with_changes(attr=libcst.Name("label"))
+        return updated_node
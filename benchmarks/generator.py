@@ -0,0 +1,207 @@
+# AutoTransform
+# Large scale, component based code modification library
+#
+# Licensed under the MIT License <http://opensource.org/licenses/MIT>
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2022-present Nathan Rockenbach <http://github.com/nathro>
+
+# @black_format
+
+"""Generates synthetic monorepos for benchmarking. Repos are deterministic for a given number of
+files and seed, contain nested directories of Python sources alongside docs and config files,
+and have a CODEOWNERS file assigning ownership to teams."""
+
+import math
+import os
+import random
+import shutil
+import subprocess
+from typing import Dict, List, Optional
+
+# Bump when the generated content changes so cached repos are regenerated
+GENERATOR_VERSION = 1
+
+SIZES: Dict[str, int] = {"10k": 10000, "100k": 100000, "1m": 1000000}
+
+# Top level directories of the generated repos and the teams owning them, None if unowned
+TOP_LEVEL_DIRS: Dict[str, Optional[str]] = {
+    "services": "@synthetic/backend",
+    "libs": "@synthetic/platform",
+    "tools": "@synthetic/devtools",
+    "web": "@synthetic/frontend",
+    "experimental": None,
+}
+DIR_NAMES = ["api", "core", "data", "jobs", "models", "utils", "storage", "client"]
+OWNER_OVERRIDES = ["@synthetic/infra", "@synthetic/ml", "@synthetic/security", "@alice", "@bob"]
+
+BASE_BRANCH = "main"
+CODEOWNERS_PATH = "CODEOWNERS"
+MARKER_FILE = ".benchmark_repo"
+
+# The average number of files within each leaf directory
+FILES_PER_DIR = 16
+DIR_FANOUT = len(DIR_NAMES)
+
+
+def get_leaf_dirs(num_files: int, rng: random.Random) -> List[str]:
+    """Gets the leaf directories for a repo. Directory depth grows with the size of the repo,
+    with some directories nested one level deeper than others.
+
+    Args:
+        num_files (int): The number of files in the repo.
+        rng (random.Random): The random number generator to use.
+
+    Returns:
+        List[str]: The leaf directories, relative to the root of the repo.
+    """
+
+    num_dirs = max(math.ceil(num_files / FILES_PER_DIR), 1)
+    depth = max(math.ceil(math.log(num_dirs, DIR_FANOUT)), 1)
+    top_level_dirs = list(TOP_LEVEL_DIRS)
+    leaf_dirs = []
+    for idx in range(num_dirs):
+        parts = [top_level_dirs[idx % len(top_level_dirs)]]
+        remainder = idx // len(top_level_dirs)
+        for level in range(depth):
+            parts.append(f"{DIR_NAMES[remainder % DIR_FANOUT]}{level}")
+            remainder //= DIR_FANOUT
+        if rng.random() < 0.25:
+            parts.append(rng.choice(["internal", "impl", "legacy"]))
+        leaf_dirs.append("/".join(parts))
+    return leaf_dirs
+
+
+def get_python_source(module: str, rng: random.Random) -> str:
+    """Gets the content of a generated Python source file.
+
+    Args:
+        module (str): The name of the module.
+        rng (random.Random): The random number generator to use.
+
+    Returns:
+        str: The source of the module.
+    """
+
+    lines = [
+        f"# Module: {module}",
+        f'"""The {module} module."""',
+        "",
+        "import os",
+        "import logging" if rng.random() < 0.5 else "import json",
+        "",
+        "",
+        f"class {module.title().replace('_', '')}:",
+        f'    """Handles {module} requests."""',
+        "",
+        "    def __init__(self, name):",
+        "        self.name = name",
+        "",
+    ]
+    for idx in range(rng.randint(2, 8)):
+        lines.extend(
+            [
+                f"    def handle_{idx}(self, value):",
+                f'        message = "{{}}: {{}}".format(self.name, value)',
+                f"        return os.path.join(message, str(value * {idx}))",
+                "",
+            ]
+        )
+    if rng.random() < 0.1:
+        lines.append("# TODO: remove deprecated_call once callers are migrated")
+        lines.append("def deprecated_call():")
+        lines.append("    return None")
+        lines.append("")
+    return "\n".join(lines)
+
+
+def get_codeowners(leaf_dirs: List[str], rng: random.Random) -> str:
+    """Gets the content of the CODEOWNERS file for a repo.
+
+    Args:
+        leaf_dirs (List[str]): The leaf directories of the repo.
+        rng (random.Random): The random number generator to use.
+
+    Returns:
+        str: The content of the CODEOWNERS file.
+    """
+
+    lines = ["*.md @synthetic/docs"]
+    lines.extend(
+        f"/{directory}/ {owner}" for directory, owner in TOP_LEVEL_DIRS.items() if owner is not None
+    )
+    # Override ownership of some second level directories within owned directories
+    sub_dirs = sorted(
+        {
+            "/".join(directory.split("/")[:2])
+            for directory in leaf_dirs
+            if TOP_LEVEL_DIRS[directory.split("/")[0]] is not None
+        }
+    )
+    for sub_dir in rng.sample(sub_dirs, len(sub_dirs) // 4):
+        lines.append(f"/{sub_dir}/ {rng.choice(OWNER_OVERRIDES)}")
+    return "\n".join(lines) + "\n"
+
+
+def generate_repo(path: str, num_files: int, seed: int = 0) -> None:
+    """Generates a synthetic monorepo with a single commit on the main branch.
+
+    Args:
+        path (str): The directory to create the repo in. Must not exist.
+        num_files (int): The number of files to generate.
+        seed (int, optional): The seed for random generation. Defaults to 0.
+    """
+
+    rng = random.Random(seed)
+    leaf_dirs = get_leaf_dirs(num_files, rng)
+    os.makedirs(path)
+    for idx in range(num_files):
+        directory = leaf_dirs[idx % len(leaf_dirs)]
+        os.makedirs(os.path.join(path, directory), exist_ok=True)
+        kind = rng.random()
+        if kind < 0.05:
+            file_name, content = f"README_{idx}.md", f"# Docs {idx}\n\nSee {directory}.\n"
+        elif kind < 0.1:
+            file_name, content = f"config_{idx}.json", f'{{"id": {idx}, "enabled": true}}\n'
+        else:
+            module = f"{rng.choice(DIR_NAMES)}_{idx}"
+            file_name, content = f"{module}.py", get_python_source(module, rng)
+        with open(os.path.join(path, directory, file_name), "w", encoding="UTF-8") as file:
+            file.write(content)
+
+    with open(os.path.join(path, CODEOWNERS_PATH), "w", encoding="UTF-8") as file:
+        file.write(get_codeowners(leaf_dirs, rng))
+
+    def git(*args: str) -> None:
+        subprocess.run(["git", *args], cwd=path, check=True, capture_output=True)
+
+    git("init", "-q")
+    git("symbolic-ref", "HEAD", f"refs/heads/{BASE_BRANCH}")
+    git("config", "user.name", "AutoTransform Benchmark")
+    git("config", "user.email", "benchmark@autotransform.invalid")
+    git("config", "commit.gpgsign", "false")
+    git("add", "-A")
+    git("commit", "-q", "-m", "Initial commit")
+
+
+def get_repo(num_files: int, cache_dir: str, seed: int = 0) -> str:
+    """Gets a generated repo, generating it only if it is not already in the cache directory.
+
+    Args:
+        num_files (int): The number of files in the repo.
+        cache_dir (str): The directory generated repos are stored in.
+        seed (int, optional): The seed for random generation. Defaults to 0.
+
+    Returns:
+        str: The path of the repo.
+    """
+
+    path = os.path.join(cache_dir, f"repo_{num_files}_{seed}_v{GENERATOR_VERSION}")
+    if os.path.exists(os.path.join(path, ".git", MARKER_FILE)):
+        return path
+
+    # Remove partially generated repos from interrupted runs
+    shutil.rmtree(path, ignore_errors=True)
+    generate_repo(path, num_files, seed)
+    with open(os.path.join(path, ".git", MARKER_FILE), "w", encoding="UTF-8") as file:
+        file.write(str(num_files))
+    return path
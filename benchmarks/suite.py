@@ -0,0 +1,357 @@
+# AutoTransform
+# Large scale, component based code modification library
+#
+# Licensed under the MIT License <http://opensource.org/licenses/MIT>
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2022-present Nathan Rockenbach <http://github.com/nathro>
+
+# @black_format
+
+"""The benchmark suite, timing Inputs, Filters, Batchers, Transformers and Repo operations
+against a generated repo. Results are JSON encodable so that runs can be saved and compared
+between releases."""
+
+import fnmatch
+import os
+import platform
+import subprocess
+import time
+from datetime import datetime, timezone
+from importlib.metadata import PackageNotFoundError, version
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple, TypedDict
+
+from autotransform.batcher.base import Batch, Batcher
+from autotransform.batcher.chunk import ChunkBatcher
+from autotransform.batcher.codeowners import CodeownersBatcher
+from autotransform.batcher.directory import DirectoryBatcher
+from autotransform.batcher.regex import FileRegexBatcher
+from autotransform.batcher.single import SingleBatcher
+from autotransform.filter.aggregate import AggregateFilter
+from autotransform.filter.base import Filter
+from autotransform.filter.codeowners import CodeownersFilter
+from autotransform.filter.file import FileExistsFilter
+from autotransform.filter.key_hash_shard import KeyHashShardFilter
+from autotransform.filter.regex import RegexFileContentFilter, RegexFilter
+from autotransform.input.directory import DirectoryInput
+from autotransform.input.gitgrep import GitGrepInput
+from autotransform.item.file import FileItem
+from autotransform.repo.git import GitRepo
+from autotransform.transformer.base import Transformer
+from autotransform.transformer.libcst import LibCSTTransformer
+from autotransform.transformer.regex import RegexTransformer
+from autotransform.util.cachedfile import FILE_CACHE, ORIGINAL_FILE_CACHE, WRITE_JOURNAL
+from autotransform.util.enums import AggregatorType
+
+from benchmarks.generator import BASE_BRANCH, CODEOWNERS_PATH, TOP_LEVEL_DIRS
+
+# The number of Python files transformed by Transformer and Repo benchmarks
+SAMPLE_SIZE = 1000
+LIBCST_SAMPLE_SIZE = 100
+
+
+class BenchmarkResult(TypedDict):
+    """The result of a benchmark, using the fastest repeat as the representative time."""
+
+    seconds: float
+    mean_seconds: float
+    repeats: int
+    items: int
+    items_per_second: float
+
+
+class BenchmarkContext(NamedTuple):
+    """The state shared by benchmarks.
+
+    Attributes:
+        items (List[FileItem]): All files in the repo.
+        python_items (List[FileItem]): All Python files in the repo.
+    """
+
+    items: List[FileItem]
+    python_items: List[FileItem]
+
+
+# A benchmark takes the shared context and returns the seconds taken and the Items handled
+BenchmarkFunction = Callable[[BenchmarkContext], Tuple[float, int]]
+BENCHMARKS: Dict[str, BenchmarkFunction] = {}
+
+
+def benchmark(name: str) -> Callable[[BenchmarkFunction], BenchmarkFunction]:
+    """Registers a benchmark.
+
+    Args:
+        name (str): The name of the benchmark.
+
+    Returns:
+        Callable[[BenchmarkFunction], BenchmarkFunction]: A decorator registering the function.
+    """
+
+    def register(func: BenchmarkFunction) -> BenchmarkFunction:
+        BENCHMARKS[name] = func
+        return func
+
+    return register
+
+
+def reset_file_cache() -> None:
+    """Clears cached file content so that each repeat reads files from disk."""
+
+    FILE_CACHE.clear()
+    ORIGINAL_FILE_CACHE.clear()
+
+
+def reset_repo() -> None:
+    """Discards any changes made to the repo by a benchmark."""
+
+    subprocess.run(["git", "checkout", "-q", BASE_BRANCH], check=True)
+    subprocess.run(["git", "reset", "-q", "--hard"], check=True)
+    reset_file_cache()
+
+
+def _time_filter(filt: Filter, items: Sequence[FileItem]) -> Tuple[float, int]:
+    start = time.perf_counter()
+    for item in items:
+        filt.is_valid(item)
+    return time.perf_counter() - start, len(items)
+
+
+def _time_batcher(batcher: Batcher, items: Sequence[FileItem]) -> Tuple[float, int]:
+    start = time.perf_counter()
+    batcher.batch(items)
+    return time.perf_counter() - start, len(items)
+
+
+def _time_transformer(transformer: Transformer, items: Sequence[FileItem]) -> Tuple[float, int]:
+    batch: Batch = {"items": items, "title": "benchmark"}
+    start = time.perf_counter()
+    try:
+        transformer.transform(batch)
+        return time.perf_counter() - start, len(items)
+    finally:
+        reset_repo()
+
+
+@benchmark("input.directory")
+def _input_directory(_context: BenchmarkContext) -> Tuple[float, int]:
+    start = time.perf_counter()
+    items = DirectoryInput(paths=list(TOP_LEVEL_DIRS)).get_items()
+    return time.perf_counter() - start, len(items)
+
+
+@benchmark("input.git_grep")
+def _input_git_grep(_context: BenchmarkContext) -> Tuple[float, int]:
+    start = time.perf_counter()
+    items = GitGrepInput(pattern="deprecated_call").get_items()
+    return time.perf_counter() - start, len(items)
+
+
+@benchmark("filter.regex")
+def _filter_regex(context: BenchmarkContext) -> Tuple[float, int]:
+    return _time_filter(RegexFilter(pattern=r"/api\d/.*\.py$"), context.items)
+
+
+@benchmark("filter.regex_file_content")
+def _filter_regex_file_content(context: BenchmarkContext) -> Tuple[float, int]:
+    return _time_filter(RegexFileContentFilter(pattern="deprecated_call"), context.items)
+
+
+@benchmark("filter.file_exists")
+def _filter_file_exists(context: BenchmarkContext) -> Tuple[float, int]:
+    return _time_filter(FileExistsFilter(), context.items)
+
+
+@benchmark("filter.codeowners")
+def _filter_codeowners(context: BenchmarkContext) -> Tuple[float, int]:
+    filt = CodeownersFilter(codeowners_file_path=CODEOWNERS_PATH, owner="@synthetic/platform")
+    return _time_filter(filt, context.items)
+
+
+@benchmark("filter.key_hash_shard")
+def _filter_key_hash_shard(context: BenchmarkContext) -> Tuple[float, int]:
+    return _time_filter(KeyHashShardFilter(num_shards=10, valid_shard=0), context.items)
+
+
+@benchmark("filter.aggregate")
+def _filter_aggregate(context: BenchmarkContext) -> Tuple[float, int]:
+    filt = AggregateFilter(
+        aggregator=AggregatorType.ALL,
+        filters=[
+            RegexFilter(pattern=r"\.py$"),
+            CodeownersFilter(codeowners_file_path=CODEOWNERS_PATH, owner="@synthetic/backend"),
+        ],
+    )
+    return _time_filter(filt, context.items)
+
+
+@benchmark("batcher.single")
+def _batcher_single(context: BenchmarkContext) -> Tuple[float, int]:
+    return _time_batcher(SingleBatcher(title="benchmark"), context.items)
+
+
+@benchmark("batcher.chunk")
+def _batcher_chunk(context: BenchmarkContext) -> Tuple[float, int]:
+    return _time_batcher(ChunkBatcher(chunk_size=100, title="benchmark"), context.items)
+
+
+@benchmark("batcher.directory")
+def _batcher_directory(context: BenchmarkContext) -> Tuple[float, int]:
+    return _time_batcher(DirectoryBatcher(prefix="benchmark"), context.items)
+
+
+@benchmark("batcher.codeowners")
+def _batcher_codeowners(context: BenchmarkContext) -> Tuple[float, int]:
+    batcher = CodeownersBatcher(codeowners_location=CODEOWNERS_PATH, prefix="benchmark")
+    return _time_batcher(batcher, context.items)
+
+
+@benchmark("batcher.file_regex")
+def _batcher_file_regex(context: BenchmarkContext) -> Tuple[float, int]:
+    return _time_batcher(FileRegexBatcher(group_by=r"# Module: ([a-z]+)_"), context.python_items)
+
+
+@benchmark("transformer.regex")
+def _transformer_regex(context: BenchmarkContext) -> Tuple[float, int]:
+    transformer = RegexTransformer(pattern=r"self\.name", replacement="self.label")
+    return _time_transformer(transformer, context.python_items[:SAMPLE_SIZE])
+
+
+@benchmark("transformer.libcst")
+def _transformer_libcst(context: BenchmarkContext) -> Tuple[float, int]:
+    transformer = LibCSTTransformer(
+        command_module="benchmarks.codemods", command_name="RenameNameAttributeCommand"
+    )
+    return _time_transformer(transformer, context.python_items[:LIBCST_SAMPLE_SIZE])
+
+
+@benchmark("repo.git.commit_rewind")
+def _repo_git_commit_rewind(context: BenchmarkContext) -> Tuple[float, int]:
+    items = context.python_items[:SAMPLE_SIZE]
+    batch: Batch = {"items": items, "title": "benchmark"}
+    # Track writes as a Schema would, so changed files come from the write journal
+    WRITE_JOURNAL.start()
+    RegexTransformer(pattern=r"self\.name", replacement="self.label").transform(batch)
+    repo = GitRepo(base_branch=BASE_BRANCH)
+    try:
+        start = time.perf_counter()
+        assert repo.has_changes(batch)
+        repo.submit(batch, None)
+        repo.rewind(batch)
+        return time.perf_counter() - start, len(items)
+    finally:
+        WRITE_JOURNAL.untrack()
+        reset_repo()
+        subprocess.run(
+            ["git", "branch", "-q", "-D", GitRepo.get_branch_name("benchmark")], check=False
+        )
+
+
+def get_context() -> BenchmarkContext:
+    """Gets the context for benchmarks within the current directory.
+
+    Returns:
+        BenchmarkContext: The shared state for benchmarks.
+    """
+
+    items = list(DirectoryInput(paths=list(TOP_LEVEL_DIRS)).get_items())
+    items.sort(key=lambda item: item.key)
+    return BenchmarkContext(
+        items=items, python_items=[item for item in items if item.key.endswith(".py")]
+    )
+
+
+def get_version() -> str:
+    """Gets the installed version of AutoTransform.
+
+    Returns:
+        str: The version, or unknown if AutoTransform is not installed.
+    """
+
+    try:
+        return version("AutoTransform")
+    except PackageNotFoundError:
+        return "unknown"
+
+
+def run_suite(
+    repo_path: str,
+    repeat: int = 3,
+    patterns: Optional[List[str]] = None,
+    log: Callable[[str], Any] = print,
+) -> Dict[str, Any]:
+    """Runs benchmarks against a generated repo.
+
+    Args:
+        repo_path (str): The path of the generated repo.
+        repeat (int, optional): The number of times to run each benchmark. Defaults to 3.
+        patterns (Optional[List[str]], optional): Glob patterns selecting the benchmarks to run.
+            If None, all benchmarks are run. Defaults to None.
+        log (Callable[[str], Any], optional): Used to report progress. Defaults to print.
+
+    Returns:
+        Dict[str, Any]: The JSON encodable results of the run.
+    """
+
+    names = [
+        name
+        for name in BENCHMARKS
+        if patterns is None or any(fnmatch.fnmatch(name, pattern) for pattern in patterns)
+    ]
+    cwd = os.getcwd()
+    os.chdir(repo_path)
+    try:
+        reset_repo()
+        context = get_context()
+        results: Dict[str, BenchmarkResult] = {}
+        for name in names:
+            times = []
+            num_items = 0
+            for _ in range(repeat):
+                reset_file_cache()
+                seconds, num_items = BENCHMARKS[name](context)
+                times.append(seconds)
+            best = min(times)
+            results[name] = {
+                "seconds": best,
+                "mean_seconds": sum(times) / len(times),
+                "repeats": repeat,
+                "items": num_items,
+                "items_per_second": num_items / best if best else 0.0,
+            }
+            log(f"{name}: {best:.4f}s ({num_items} items)")
+    finally:
+        os.chdir(cwd)
+
+    return {
+        "autotransform_version": get_version(),
+        "python_version": platform.python_version(),
+        "platform": platform.platform(),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "num_files": len(context.items),
+        "results": results,
+    }
+
+
+def compare(
+    baseline: Dict[str, Any], current: Dict[str, Any], threshold: float = 0.1
+) -> List[Tuple[str, float, float]]:
+    """Compares two runs of the suite to find regressions.
+
+    Args:
+        baseline (Dict[str, Any]): The results of the baseline run.
+        current (Dict[str, Any]): The results of the current run.
+        threshold (float, optional): The relative slowdown considered a regression.
+            Defaults to 0.1.
+
+    Returns:
+        List[Tuple[str, float, float]]: The name, baseline seconds and current seconds of each
+            benchmark that regressed.
+    """
+
+    regressions = []
+    for name, result in current["results"].items():
+        baseline_result = baseline["results"].get(name)
+        if baseline_result is None:
+            continue
+        if result["seconds"] > baseline_result["seconds"] * (1 + threshold):
+            regressions.append((name, baseline_result["seconds"], result["seconds"]))
+    return regressions
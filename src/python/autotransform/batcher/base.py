@@ -13,7 +13,7 @@ from __future__ import annotations
 
 from abc import abstractmethod
 from enum import Enum
-from typing import Any, ClassVar, List, Mapping, Sequence, TypedDict
+from typing import Any, ClassVar, Iterable, Iterator, List, Mapping, Sequence, TypedDict
 
 from typing_extensions import NotRequired
 
@@ -63,6 +63,21 @@ class Batcher(NamedComponent):
                 title.
         """
 
+    def iter_batches(self, items: Iterable[Item]) -> Iterator[Batch]:
+        """Lazily separate filtered Items in to logical groupings. Batchers that can produce a
+        Batch before every Item is known should override this. Defaults to collecting all Items
+        and batching them with batch.
+
+        Args:
+            items (Iterable[Item]): The filtered Items to separate.
+
+        Returns:
+            Iterator[Batch]: The logical groupings of Items with associated group metadata and
+                title.
+        """
+
+        yield from self.batch(list(items))
+
 
 FACTORY = ComponentFactory(
     {
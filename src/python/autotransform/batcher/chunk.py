@@ -13,10 +13,11 @@ from __future__ import annotations
 
 from copy import deepcopy
 from math import ceil
-from typing import Any, ClassVar, Dict, List, Optional, Sequence
+from typing import Any, ClassVar, Dict, Iterable, Iterator, List, Optional, Sequence, Type
 
 from autotransform.batcher.base import Batch, Batcher, BatcherName
 from autotransform.item.base import Item
+from pydantic import root_validator
 
 
 class ChunkBatcher(Batcher):
@@ -25,7 +26,8 @@ class ChunkBatcher(Batcher):
     the chunk size would result in more than the maximum number of chunks, the chunk size is
     increased to the minimum required to create only max_chunks. The title for a batch will
     have [X/N] prepended to it, where X represents the chunk number and N represents the
-    total number of chunks.
+    total number of chunks. When streaming, Batches are created as Items are produced and the
+    title will have [X] prepended to it instead, as the total is not yet known.
 
     Attributes:
         chunk_size (int): The size of chunks.
@@ -34,6 +36,8 @@ class ChunkBatcher(Batcher):
             to None.
         metadata (Optional[Dict[str, Any]], optional): The metadata to associate with
             Batches. Defaults to None.
+        stream (bool, optional): Whether to create Batches as Items are produced. Can not be
+            used with max_chunks. Defaults to False.
         name (ClassVar[BatcherName]): The name of the Component.
     """
 
@@ -41,9 +45,32 @@ class ChunkBatcher(Batcher):
     title: str
     max_chunks: Optional[int] = None
     metadata: Optional[Dict[str, Any]] = None
+    stream: bool = False
 
     name: ClassVar[BatcherName] = BatcherName.CHUNK
 
+    @root_validator
+    @classmethod
+    def stream_without_max_chunks(
+        cls: Type[ChunkBatcher], values: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Validates that max_chunks is not used when streaming, as it requires all Items.
+
+        Args:
+            cls (Type[ChunkBatcher]): The ChunkBatcher class.
+            values (Dict[str, Any]): The values used to configure the ChunkBatcher.
+
+        Raises:
+            ValueError: Raised if both stream and max_chunks are supplied.
+
+        Returns:
+            Dict[str, Any]: The unmodified values.
+        """
+
+        if values.get("stream") and values.get("max_chunks") is not None:
+            raise ValueError("Can not supply max_chunks for a streaming ChunkBatcher")
+        return values
+
     def batch(self, items: Sequence[Item]) -> List[Batch]:
         """Take filtered Items and chunk them into Batches.
 
@@ -64,10 +91,50 @@ class ChunkBatcher(Batcher):
         item_chunks = [items[i : i + chunk_size] for i in range(0, len(items), chunk_size)]
         item_batches: List[Batch] = []
         for idx, item_chunk in enumerate(item_chunks, start=1):
-            title = f"[{idx}/{len(item_chunks)}] {self.title}"
-            batch: Batch = {"items": item_chunk, "title": title}
-            if self.metadata is not None:
-                # Deepcopy metadata to ensure mutations don't apply to all Batches
-                batch["metadata"] = deepcopy(self.metadata)
-            item_batches.append(batch)
+            item_batches.append(
+                self._make_batch(item_chunk, f"[{idx}/{len(item_chunks)}] {self.title}")
+            )
         return item_batches
+
+    def iter_batches(self, items: Iterable[Item]) -> Iterator[Batch]:
+        """Lazily chunk filtered Items into Batches. Only streams when stream is set, otherwise
+        all Items are collected so that titles can include the total number of chunks.
+
+        Args:
+            items (Iterable[Item]): The filtered Items to separate.
+
+        Returns:
+            Iterator[Batch]: The Batches representing each chunk of the filtered Items.
+        """
+
+        if not self.stream:
+            yield from super().iter_batches(items)
+            return
+
+        item_chunk: List[Item] = []
+        idx = 0
+        for item in items:
+            item_chunk.append(item)
+            if len(item_chunk) == self.chunk_size:
+                idx += 1
+                yield self._make_batch(item_chunk, f"[{idx}] {self.title}")
+                item_chunk = []
+        if item_chunk:
+            yield self._make_batch(item_chunk, f"[{idx + 1}] {self.title}")
+
+    def _make_batch(self, items: Sequence[Item], title: str) -> Batch:
+        """Creates a Batch for a chunk of Items.
+
+        Args:
+            items (Sequence[Item]): The Items in the chunk.
+            title (str): The title of the Batch.
+
+        Returns:
+            Batch: The Batch for the chunk.
+        """
+
+        batch: Batch = {"items": items, "title": title}
+        if self.metadata is not None:
+            # Deepcopy metadata to ensure mutations don't apply to all Batches
+            batch["metadata"] = deepcopy(self.metadata)
+        return batch
@@ -18,7 +18,7 @@ from typing import Any, ClassVar, Dict, List, Optional, Sequence
 from autotransform.batcher.base import Batch, Batcher, BatcherName
 from autotransform.item.base import Item
 from autotransform.item.file import FileItem
-from codeowners import CodeOwners
+from autotransform.util.codeowners import CodeownersIndex
 
 
 class CodeownersBatcher(Batcher):
@@ -57,8 +57,7 @@ class CodeownersBatcher(Batcher):
         individual_owners: Dict[str, List[Item]] = {}
         no_owners: List[Item] = []
 
-        with open(self.codeowners_location, mode="r", encoding="UTF-8") as codeowners_file:
-            codeowners = CodeOwners(codeowners_file.read())
+        codeowners = CodeownersIndex.load(self.codeowners_location)
 
         # Build Owner Dictionaries
         for item in items:
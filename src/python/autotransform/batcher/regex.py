@@ -11,7 +11,6 @@
 
 from __future__ import annotations
 
-import re
 from collections import defaultdict
 from typing import Any, ClassVar, Dict, List, Sequence
 
@@ -23,7 +22,8 @@ from autotransform.item.file import FileItem
 
 
 class FileRegexBatcher(Batcher):
-    """A Batcher which uses matches from regex on file content to group Items.
+    """A Batcher which uses matches from regex on file content to group Items. Binary and large
+    files are matched without caching their content.
 
     Attributes:
         group_by (str): The regex which produces the group by value.
@@ -50,9 +50,10 @@ class FileRegexBatcher(Batcher):
         groups: Dict[str, List[FileItem]] = defaultdict(list)
         for item in items:
             assert isinstance(item, FileItem)
-            match = re.match(self.group_by, item.get_content())
-            assert match is not None, "Must have value to use for grouping"
-            group_by_val = match.group(1)
+            groups_match = item.search_content(self.group_by, from_start=True)
+            assert groups_match is not None, "Must have value to use for grouping"
+            group_by_val = groups_match[0]
+            assert group_by_val is not None, "Must have value to use for grouping"
             groups[group_by_val].append(item)
 
         batches: List[Batch] = []
@@ -61,11 +62,10 @@ class FileRegexBatcher(Batcher):
             if self.metadata_keys:
                 metadata: Dict[str, List[Any]] = defaultdict(list)
                 for item in group_items:
-                    file_content = item.get_content()
                     for key, regex in self.metadata_keys.items():
-                        match = re.match(regex, file_content)
-                        if match:
-                            metadata[key].append(match.group(1))
+                        groups_match = item.search_content(regex, from_start=True)
+                        if groups_match is not None:
+                            metadata[key].append(groups_match[0])
                 for key in metadata:
                     metadata[key] = list(set(metadata[key]))
                 batch["metadata"] = metadata
@@ -19,6 +19,7 @@ from autotransform.command.base import Command, CommandName
 from autotransform.item.base import Item
 from autotransform.item.file import FileItem
 from autotransform.util.functions import run_cmd_on_items
+from autotransform.util.worker import run_worker_on_items
 
 
 class ScriptCommand(Command):
@@ -48,6 +49,10 @@ class ScriptCommand(Command):
             FileItems for the changed files. Defaults to False.
         run_pre_validation (bool, optional): Whether to run the command before validation is done.
             Defaults to False.
+        persistent (bool, optional): Whether to send each run to a persistent worker that is
+            started once, rather than starting the script for every run. Sentinel arguments
+            are supplied as fields of each request, see autotransform.util.worker for the
+            protocol. Defaults to False.
         name (ClassVar[CommandName]): The name of the Component.
     """
 
@@ -56,6 +61,7 @@ class ScriptCommand(Command):
     per_item: bool = False
     run_on_changes: bool = False
     run_pre_validation: bool = False
+    persistent: bool = False
 
     name: ClassVar[CommandName] = CommandName.SCRIPT
 
@@ -126,5 +132,6 @@ class ScriptCommand(Command):
         cmd = [self.script]
         cmd.extend(self.args)
 
-        proc = run_cmd_on_items(cmd, items, metadata)
+        run = run_worker_on_items if self.persistent else run_cmd_on_items
+        proc = run(cmd, items, metadata)
         proc.check_returncode()
@@ -30,10 +30,31 @@ from autotransform.util.console import choose_yes_or_no, get_str
 from pydantic import Field
 
 
+def _get_setting(data: Dict[str, Any], setting: str, setting_type: type) -> Any:
+    """Gets an optional setting from decoded Config data, checking the type of its value.
+
+    Args:
+        data (Dict[str, Any]): The JSON decoded data.
+        setting (str): The name of the setting.
+        setting_type (type): The type of the setting's value.
+
+    Returns:
+        Any: The value of the setting, None if it is not present.
+    """
+
+    value = data.get(setting, None)
+    if value is not None:
+        assert isinstance(value, setting_type)
+    return value
+
+
 class Config(ComponentModel):
     """A collection of settings for configuring the functionality of AutoTransform.
 
     Attributes:
+        cache_directory (Optional[str], optional): The directory where AutoTransform stores cached
+            data, such as Filter statistics. If not provided, autotransform/ within the user's
+            cache directory will be used. Defaults to None.
         component_directory (Optional[str], optional): The directory where custom component
             JSON files are located. If not provided, autotransform/ will be used.
             Defaults to None.
@@ -57,8 +78,14 @@ class Config(ComponentModel):
             Defaults to None.
         event_notifiers (List[Dict[str, Any]], optional): The EventNotifiers to use. Defaults to
             a list containing just the ConsoleEventNotifier bundle.
+        file_cache_size (Optional[int], optional): The maximum bytes of file content cached in
+            memory. If not provided, 1GB will be used. Defaults to None.
+        file_mmap_threshold (Optional[int], optional): The size in bytes at or above which files
+            are searched using mmap rather than cached as text. If not provided, 8MB will be used.
+            Defaults to None.
     """
 
+    cache_directory: Optional[str] = None
     component_directory: Optional[str] = None
     github_token: Optional[str] = Field(default=None, redact=True)
     github_base_url: Optional[str] = None
@@ -70,6 +97,8 @@ class Config(ComponentModel):
     remote_runner: Optional[Runner] = None
     repo_override: Optional[Repo] = None
     event_notifiers: List[Dict[str, Any]] = Field(default=[ConsoleEventNotifier().bundle()])
+    file_cache_size: Optional[int] = None
+    file_mmap_threshold: Optional[int] = None
 
     def write(self, file_path: str) -> None:
         """Writes the Config to a file as JSON.
@@ -83,6 +112,19 @@ class Config(ComponentModel):
             schedule_file.write(json.dumps(self.bundle(), indent=4))
             schedule_file.flush()
 
+    def get_cache_directory(self) -> str:
+        """Gets the directory where cached data is stored. Uses XDG_CACHE_HOME when set to find
+        the user's cache directory, falling back to ~/.cache.
+
+        Returns:
+            str: The directory for cached data.
+        """
+
+        if self.cache_directory is not None:
+            return os.path.expanduser(self.cache_directory)
+        user_cache_dir = os.getenv("XDG_CACHE_HOME") or os.path.join("~", ".cache")
+        return os.path.join(os.path.expanduser(user_cache_dir), "autotransform")
+
     @staticmethod
     def read(file_path: str) -> Config:
         """Reads the Config from a JSON encoded file.
@@ -125,34 +167,6 @@ class Config(ComponentModel):
             Config: An instance of the Config.
         """
 
-        github_token = data.get("github_token", None)
-        if github_token is not None:
-            assert isinstance(github_token, str)
-
-        github_base_url = data.get("github_base_url", None)
-        if github_base_url is not None:
-            assert isinstance(github_base_url, str)
-
-        jenkins_user = data.get("jenkins_user", None)
-        if jenkins_user is not None:
-            assert isinstance(jenkins_user, str)
-
-        jenkins_token = data.get("jenkins_token", None)
-        if jenkins_token is not None:
-            assert isinstance(jenkins_token, str)
-
-        jenkins_base_url = data.get("jenkins_base_url", None)
-        if jenkins_base_url is not None:
-            assert isinstance(jenkins_base_url, str)
-
-        open_ai_api_key = data.get("open_ai_api_key", None)
-        if open_ai_api_key is not None:
-            assert isinstance(open_ai_api_key, str)
-
-        component_directory = data.get("component_directory", None)
-        if component_directory is not None:
-            assert isinstance(component_directory, str)
-
         local_runner = data.get("local_runner", None)
         if local_runner is not None:
             local_runner = runner_factory.get_instance(local_runner)
@@ -170,17 +184,20 @@ class Config(ComponentModel):
             event_notifiers = [ConsoleEventNotifier().bundle()]
 
         return Config(
-            github_token=github_token,
-            github_base_url=github_base_url,
-            jenkins_user=jenkins_user,
-            jenkins_token=jenkins_token,
-            jenkins_base_url=jenkins_base_url,
-            component_directory=component_directory,
+            github_token=_get_setting(data, "github_token", str),
+            github_base_url=_get_setting(data, "github_base_url", str),
+            jenkins_user=_get_setting(data, "jenkins_user", str),
+            jenkins_token=_get_setting(data, "jenkins_token", str),
+            jenkins_base_url=_get_setting(data, "jenkins_base_url", str),
+            cache_directory=_get_setting(data, "cache_directory", str),
+            component_directory=_get_setting(data, "component_directory", str),
             local_runner=local_runner,
-            open_ai_api_key=open_ai_api_key,
+            open_ai_api_key=_get_setting(data, "open_ai_api_key", str),
             remote_runner=remote_runner,
             repo_override=repo_override,
             event_notifiers=event_notifiers,
+            file_cache_size=_get_setting(data, "file_cache_size", int),
+            file_mmap_threshold=_get_setting(data, "file_mmap_threshold", int),
         )
 
     def get_event_notifiers(self) -> List[EventNotifier]:
@@ -414,6 +431,76 @@ class Config(ComponentModel):
             return None
         return component_directory
 
+    @staticmethod
+    def get_cache_directory_from_console(
+        prev_config: Optional[Config] = None,
+        simple: bool = False,
+    ) -> Optional[str]:
+        """Gets the cache directory using console inputs.
+
+        Args:
+            prev_config (Optional[Config], optional): Previously input Config. Defaults to None.
+            simple (bool, optional): Whether to use the simple setup. Defaults to False.
+
+        Returns:
+            Optional[str]: The cache directory.
+        """
+
+        # Potentially use previous information
+        if prev_config is not None and (
+            simple
+            or choose_yes_or_no(f"Use previous cache directory: {prev_config.cache_directory}?")
+        ):
+            return prev_config.cache_directory
+
+        # Simple setups use the default cache directory
+        if simple:
+            return None
+
+        cache_directory = get_str(
+            "Enter the directory to store cached data in(empty for default): "
+        )
+        if cache_directory in ["", "None"]:
+            return None
+        return cache_directory
+
+    @staticmethod
+    def get_byte_size_from_console(
+        setting: str,
+        prompt: str,
+        prev_config: Optional[Config] = None,
+        simple: bool = False,
+    ) -> Optional[int]:
+        """Gets a setting measured in bytes, such as the file cache size, using console inputs.
+
+        Args:
+            setting (str): The name of the setting.
+            prompt (str): The prompt for the number of bytes.
+            prev_config (Optional[Config], optional): Previously input Config. Defaults to None.
+            simple (bool, optional): Whether to use the simple setup. Defaults to False.
+
+        Returns:
+            Optional[int]: The number of bytes.
+        """
+
+        # Potentially use previous information
+        if prev_config is not None:
+            prev_value = getattr(prev_config, setting)
+            description = setting.replace("_", " ")
+            if simple or choose_yes_or_no(f"Use previous {description}: {prev_value}?"):
+                return prev_value
+
+        # Simple setups use the default value
+        if simple:
+            return None
+
+        while True:
+            num_bytes = get_str(f"{prompt}(empty for default): ")
+            if num_bytes in ["", "None"]:
+                return None
+            if num_bytes.isdigit():
+                return int(num_bytes)
+
     @staticmethod
     def get_local_runner_from_console(
         prev_config: Optional[Config] = None,
@@ -565,6 +652,9 @@ class Config(ComponentModel):
                 jenkins_user=jenkins_user,
                 jenkins_token=jenkins_token,
                 jenkins_base_url=jenkins_base_url,
+                cache_directory=Config.get_cache_directory_from_console(
+                    prev_config=prev_config, simple=simple
+                ),
                 component_directory=Config.get_component_directory_from_console(
                     prev_config=prev_config, simple=simple
                 ),
@@ -581,6 +671,18 @@ class Config(ComponentModel):
                 repo_override=Config.get_repo_override_from_console(
                     prev_config=prev_config, simple=simple
                 ),
+                file_cache_size=Config.get_byte_size_from_console(
+                    "file_cache_size",
+                    "Enter the maximum bytes of file content to cache in memory",
+                    prev_config=prev_config,
+                    simple=simple,
+                ),
+                file_mmap_threshold=Config.get_byte_size_from_console(
+                    "file_mmap_threshold",
+                    "Enter the size in bytes to search files using mmap at",
+                    prev_config=prev_config,
+                    simple=simple,
+                ),
             ),
             github,
             jenkins,
@@ -611,10 +713,13 @@ class Config(ComponentModel):
             jenkins_user=other.jenkins_user or self.jenkins_user,
             jenkins_token=other.jenkins_token or self.jenkins_token,
             jenkins_base_url=other.jenkins_base_url or self.jenkins_base_url,
+            cache_directory=other.cache_directory or self.cache_directory,
             component_directory=other.component_directory or self.component_directory,
             local_runner=other.local_runner or self.local_runner,
             open_ai_api_key=other.open_ai_api_key or self.open_ai_api_key,
             remote_runner=other.remote_runner or self.remote_runner,
             repo_override=other.repo_override or self.repo_override,
             event_notifiers=event_notifiers,
+            file_cache_size=other.file_cache_size or self.file_cache_size,
+            file_mmap_threshold=other.file_mmap_threshold or self.file_mmap_threshold,
         )
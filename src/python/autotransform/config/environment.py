@@ -60,18 +60,26 @@ class EnvironmentConfigFetcher(ConfigFetcher):  # pylint: disable=too-few-public
         else:
             event_notifiers = json.loads(event_notifiers_json)
 
+        file_cache_size = os.getenv("AUTO_TRANSFORM_FILE_CACHE_SIZE")
+        file_mmap_threshold = os.getenv("AUTO_TRANSFORM_FILE_MMAP_THRESHOLD")
+
         config = Config(
             github_token=os.getenv("AUTO_TRANSFORM_GITHUB_TOKEN"),
             github_base_url=os.getenv("AUTO_TRANSFORM_GITHUB_BASE_URL"),
             jenkins_user=os.getenv("AUTO_TRANSFORM_JENKINS_USER"),
             jenkins_token=os.getenv("AUTO_TRANSFORM_JENKINS_TOKEN"),
             jenkins_base_url=os.getenv("AUTO_TRANSFORM_JENKINS_BASE_URL"),
+            cache_directory=os.getenv("AUTO_TRANSFORM_CACHE_DIRECTORY"),
             component_directory=os.getenv("AUTO_TRANSFORM_COMPONENT_DIRECTORY"),
             local_runner=local_runner,
             open_ai_api_key=os.getenv("AUTO_TRANSFORM_OPEN_AI_API_KEY"),
             remote_runner=remote_runner,
             repo_override=repo_override,
             event_notifiers=event_notifiers,
+            file_cache_size=int(file_cache_size) if file_cache_size is not None else None,
+            file_mmap_threshold=(
+                int(file_mmap_threshold) if file_mmap_threshold is not None else None
+            ),
         )
 
         if os.getenv("AUTO_TRANSFORM_CONFIG_USE_FALLBACK", "true").lower() != "false":
@@ -14,13 +14,16 @@ messaging for similar events.
 
 import time
 from abc import ABC, abstractmethod
-from typing import Any, Generic, Mapping, Optional, TypeVar
+from typing import Any, Callable, Generic, Mapping, Optional, TypeVar, Union
 
 from autotransform.event.logginglevel import LoggingLevel
 from autotransform.event.type import EventType
 
 TData = TypeVar("TData", bound=Mapping[str, Any])
 
+# A message that may be deferred, only being built when the Event is actually logged
+DeferredMessage = Union[str, Callable[[], str]]
+
 
 class Event(Generic[TData], ABC):
     """The base for Events. Used to construct a loggable event that can be hooked in to
@@ -94,3 +97,21 @@ class Event(Generic[TData], ABC):
         if message.startswith("["):
             return f"[{type_str}]{message}"
         return f"[{type_str}] {message}"
+
+    def _resolve_message(self, key: str = "message") -> str:
+        """Resolves a DeferredMessage in the Event's data, building it if needed. The built
+        message replaces the deferred one so it is only built once.
+
+        Args:
+            key (str, optional): The key of the message in the Event's data. Defaults to
+                "message".
+
+        Returns:
+            str: The resolved message.
+        """
+
+        message = self.data[key]
+        if callable(message):
+            message = message()
+            self.data[key] = message  # type: ignore [index]
+        return message
@@ -15,16 +15,17 @@ for long term storage cases.
 
 from typing import TypedDict
 
-from autotransform.event.base import Event
+from autotransform.event.base import DeferredMessage, Event
 from autotransform.event.logginglevel import LoggingLevel
 from autotransform.event.type import EventType
 
 
 class DebugEventData(TypedDict):
     """The data for a DebugEvent. Contains the information that will be
-    logged when the event is triggered."""
+    logged when the event is triggered. The message may be a callable that builds it
+    so that expensive messages are only built when the event is logged."""
 
-    message: str
+    message: DeferredMessage
 
 
 class DebugEvent(Event[DebugEventData]):
@@ -57,4 +58,4 @@ class DebugEvent(Event[DebugEventData]):
             str: The message for the event.
         """
 
-        return self.data["message"]
+        return self._resolve_message()
@@ -70,6 +70,28 @@ class EventHandler:
 
         self._logging_level = logging_level
 
+    def get_logging_level(self) -> LoggingLevel:
+        """Gets the level of logs included in console outputs.
+
+        Returns:
+            LoggingLevel: The logging level output to console.
+        """
+
+        return self._logging_level
+
+    def is_enabled(self, logging_level: LoggingLevel) -> bool:
+        """Checks whether Events at the given level will be sent to any notifiers. Used to avoid
+        building expensive Event data that would be dropped.
+
+        Args:
+            logging_level (LoggingLevel): The logging level to check.
+
+        Returns:
+            bool: Whether Events at the logging level will be handled.
+        """
+
+        return bool(self._notifiers) and self._logging_level.value >= logging_level.value
+
     def handle(self, event: Event) -> None:
         """Handles the given Event, logging and executing any hooks needed.
 
@@ -77,6 +99,6 @@ class EventHandler:
             event (Event): The Event that was triggered.
         """
 
-        if self._logging_level.value >= event.get_logging_level().value:
+        if self.is_enabled(event.get_logging_level()):
             for notifier in self._notifiers:
                 notifier.notify(event)
@@ -107,6 +107,47 @@ class RunFailedEvent(Event[RunFailedEventData]):
         return f"{self.data['schema'].config.schema_name}: {self.data['error']}"
 
 
+class RunProfileEventData(TypedDict):
+    """The data for a RunProfileEvent. Contains the information that will be
+    logged when the event is triggered."""
+
+    schema: AutoTransformSchema
+    table: str
+
+
+class RunProfileEvent(Event[RunProfileEventData]):
+    """An Event triggered when a profiled schema run finishes."""
+
+    @staticmethod
+    def get_type() -> EventType:
+        """Used to represent the type of Event, output to logs.
+
+        Returns:
+            EventType: The unique type associated with this Event.
+        """
+
+        return EventType.RUN_PROFILE
+
+    @staticmethod
+    def get_logging_level() -> LoggingLevel:
+        """The logging level for events of this type.
+
+        Returns:
+            LoggingLevel: The logging detail required to log this event.
+        """
+
+        return LoggingLevel.INFO
+
+    def _get_message(self) -> str:
+        """Gets a message representing the details of the event.
+
+        Returns:
+            str: The message for the event.
+        """
+
+        return f"{self.data['schema'].config.schema_name}\n{self.data['table']}"
+
+
 class RunCommandFailedEventData(TypedDict):
     """The data for a RunCommandFailedEvent. Contains the information that will be
     logged when the event is triggered."""
@@ -38,6 +38,7 @@ class EventType(str, Enum):
     RUN = "run"
     RUN_FAILED = "run_failed"
     RUN_COMMAND_FAILED = "run_command_failed"
+    RUN_PROFILE = "run_profile"
     RUN_MANAGER = "run_manager"
     RUN_MANAGER_FAILED = "run_manager_failed"
     RUN_SCHEDULER = "run_scheduler"
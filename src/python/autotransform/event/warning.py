@@ -15,16 +15,17 @@ created for long term storage cases.
 
 from typing import TypedDict
 
-from autotransform.event.base import Event
+from autotransform.event.base import DeferredMessage, Event
 from autotransform.event.logginglevel import LoggingLevel
 from autotransform.event.type import EventType
 
 
 class WarningEventData(TypedDict):
     """The data for a WarningEvent. Contains the information that will be
-    logged when the event is triggered."""
+    logged when the event is triggered. The message may be a callable that builds it
+    so that expensive messages are only built when the event is logged."""
 
-    message: str
+    message: DeferredMessage
 
 
 class WarningEvent(Event[WarningEventData]):
@@ -57,4 +58,4 @@ class WarningEvent(Event[WarningEventData]):
             str: The message for the event
         """
 
-        return self.data["message"]
+        return self._resolve_message()
@@ -11,22 +11,52 @@
 
 from __future__ import annotations
 
-from typing import Any, ClassVar, Dict, Sequence, Type
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, ClassVar, Dict, List, NamedTuple, Optional, Sequence, Set, Type, Union
 
 from autotransform.filter.base import FACTORY as filter_factory
-from autotransform.filter.base import Filter, FilterName
+from autotransform.filter.base import BulkFilter, Filter, FilterCost, FilterName
+from autotransform.filter.regex import RegexFilter
 from autotransform.item.base import Item
 from autotransform.step.condition.aggregate import AggregatorType
+from autotransform.util.regex import PatternMatcher
+from pydantic import PrivateAttr
+
+
+class BulkKeySets(NamedTuple):
+    """The valid keys of pre processed BulkFilters, combined using the aggregator.
+
+    Attributes:
+        included (Optional[Set[str]]): The combined valid keys of the BulkFilters that are not
+            inverted, their union with any and their intersection with all. None if there are
+            no such BulkFilters.
+        excluded (Optional[Set[str]]): The combined valid keys of the inverted BulkFilters,
+            their intersection with any and their union with all. None if there are no such
+            BulkFilters.
+        filter_ids (Set[int]): The IDs of the combined BulkFilters.
+    """
+
+    included: Optional[Set[str]]
+    excluded: Optional[Set[str]]
+    filter_ids: Set[int]
 
 
 class AggregateFilter(Filter):
     """A Filter which aggregates a list of Filters using the supplied aggregator and
-    returns the result of the aggregation.
+    returns the result of the aggregation. RegexFilters whose results can be combined into a
+    single search of the Item's key, those that are not inverted when using any and those that
+    are inverted when using all, are checked together. Once pre processed, the valid keys of
+    BulkFilters are combined with set algebra, and the remaining Filters are only checked for
+    Items those keys do not decide.
 
     Attributes:
         aggregator (AggregatorType): How to aggregate the filters, using any or all.
         filters (Sequence[Filter]): The filters to be aggregated.
         name (ClassVar[FilterName]): The name of the Component.
+        _checks (Optional[List[Union[Filter, PatternMatcher]]]): The checks to aggregate,
+            created on first use. A PatternMatcher replaces a group of fused RegexFilters.
+        _key_sets (Optional[BulkKeySets]): The combined valid keys of BulkFilters, None until
+            pre processed.
     """
 
     aggregator: AggregatorType
@@ -34,6 +64,161 @@ class AggregateFilter(Filter):
 
     name: ClassVar[FilterName] = FilterName.AGGREGATE
 
+    _checks: Optional[List[Union[Filter, PatternMatcher]]] = PrivateAttr(default=None)
+    _key_sets: Optional[BulkKeySets] = PrivateAttr(default=None)
+
+    def get_cost(self) -> FilterCost:
+        """Gets the cost class of the aggregation, which is that of its most expensive Filter.
+
+        Returns:
+            FilterCost: The cost class of the Filter.
+        """
+
+        return max((filt.get_cost() for filt in self.filters), default=FilterCost.KEY)
+
+    def is_io_bound(self) -> bool:
+        """Checks whether all of the aggregated Filters are I/O bound. I/O bound checks may be
+        run concurrently, so every aggregated Filter must be thread safe.
+
+        Returns:
+            bool: Whether the Filter is I/O bound.
+        """
+
+        return bool(self.filters) and all(filt.is_io_bound() for filt in self.filters)
+
+    def supports_bulk_check(self) -> bool:
+        """Checks whether all of the aggregated Filters support bulk checks.
+
+        Returns:
+            bool: Whether the Filter supports bulk checks.
+        """
+
+        return all(filt.supports_bulk_check() for filt in self.filters)
+
+    def requires_pre_process(self) -> bool:
+        """Checks whether any of the aggregated Filters require pre processing.
+
+        Returns:
+            bool: Whether the Filter requires pre processing.
+        """
+
+        return any(filt.requires_pre_process() for filt in self.filters)
+
+    def pre_process(self, items: Sequence[Item]) -> None:
+        """Pre processes the aggregated Filters that require it, in parallel as they are
+        typically scripts, then combines the valid keys of the BulkFilters.
+
+        Args:
+            items (Sequence[Item]): The Items to validate.
+        """
+
+        filters = [filt for filt in self.filters if filt.requires_pre_process()]
+        if len(filters) > 1:
+            executor = ThreadPoolExecutor(
+                max_workers=len(filters), thread_name_prefix="autotransform_aggregate"
+            )
+            try:
+                list(executor.map(lambda filt: filt.pre_process(items), filters))
+            finally:
+                executor.shutdown(wait=True, cancel_futures=True)
+        elif filters:
+            filters[0].pre_process(items)
+
+        # Subclasses of BulkFilter may change how Items are checked
+        # pylint: disable=protected-access
+        bulk_filters = [
+            filt
+            for filt in filters
+            if isinstance(filt, BulkFilter)
+            and type(filt)._is_valid is BulkFilter._is_valid
+            and filt._valid_keys is not None
+        ]
+        if not bulk_filters:
+            return
+
+        included: List[Set[str]] = []
+        excluded: List[Set[str]] = []
+        for filt in bulk_filters:
+            assert filt._valid_keys is not None
+            (excluded if filt.inverted else included).append(filt._valid_keys)
+        if self.aggregator == AggregatorType.ALL:
+            included_keys = set.intersection(*included) if included else None
+            excluded_keys = set.union(*excluded) if excluded else None
+        else:
+            included_keys = set.union(*included) if included else None
+            excluded_keys = set.intersection(*excluded) if excluded else None
+        self._key_sets = BulkKeySets(
+            included_keys, excluded_keys, {id(filt) for filt in bulk_filters}
+        )
+        self._checks = None
+
+    def _passes_key_sets(self, key: str) -> bool:
+        """Checks the aggregation of the pre processed BulkFilters for a key.
+
+        Args:
+            key (str): The key of the Item.
+
+        Returns:
+            bool: Whether the key passes the aggregation of the BulkFilters.
+        """
+
+        assert self._key_sets is not None
+        included, excluded, _ = self._key_sets
+        if self.aggregator == AggregatorType.ALL:
+            return (included is None or key in included) and (
+                excluded is None or key not in excluded
+            )
+        return (included is not None and key in included) or (
+            excluded is not None and key not in excluded
+        )
+
+    def _get_checks(self) -> List[Union[Filter, PatternMatcher]]:
+        """Gets the checks to aggregate, fusing RegexFilters where possible. With any, an Item
+        passes if any RegexFilter that is not inverted matches its key. With all, an Item only
+        passes if no inverted RegexFilter matches its key. Either way, the group of RegexFilters
+        can be replaced by one search for all of their patterns.
+
+        Returns:
+            List[Union[Filter, PatternMatcher]]: The checks, in the order of the Filters.
+        """
+
+        if self._checks is not None:
+            return self._checks
+
+        # The combined BulkFilters are checked using the key sets
+        combined = set() if self._key_sets is None else self._key_sets.filter_ids
+        filters = [filt for filt in self.filters if id(filt) not in combined]
+
+        # Subclasses of RegexFilter may change how Items are checked
+        fused = [
+            filt
+            for filt in filters
+            if type(filt) is RegexFilter  # pylint: disable=unidiomatic-typecheck
+            and filt.inverted == self._fuses_inverted()
+        ]
+        if len(fused) < 2:
+            self._checks = list(filters)
+            return self._checks
+
+        checks: List[Union[Filter, PatternMatcher]] = []
+        fused_ids = {id(filt) for filt in fused}
+        for filt in filters:
+            if id(filt) not in fused_ids:
+                checks.append(filt)
+            elif filt is fused[0]:
+                checks.append(PatternMatcher([fused_filter.pattern for fused_filter in fused]))
+        self._checks = checks
+        return checks
+
+    def _fuses_inverted(self) -> bool:
+        """Whether inverted RegexFilters are fused, rather than RegexFilters that are not.
+
+        Returns:
+            bool: Whether inverted RegexFilters are fused.
+        """
+
+        return self.aggregator == AggregatorType.ALL
+
     def _is_valid(self, item: Item) -> bool:
         """Checks whether the aggregation of all filters passes.
 
@@ -44,13 +229,71 @@ class AggregateFilter(Filter):
             bool: Whether the Item passes the Filter.
         """
 
+        if self.aggregator not in (AggregatorType.ALL, AggregatorType.ANY):
+            raise ValueError(f"Unknown aggregator type {self.aggregator}")
+
+        if self._key_sets is not None:
+            passed = self._passes_key_sets(item.key)
+            # With any, passing decides the result, and with all, failing does
+            if passed == (self.aggregator == AggregatorType.ANY):
+                return passed
+
+        fuses_inverted = self._fuses_inverted()
+        results = (
+            check.is_valid(item)
+            if isinstance(check, Filter)
+            else fuses_inverted != check.search(item.key)
+            for check in self._get_checks()
+        )
         if self.aggregator == AggregatorType.ALL:
-            return all(filter.is_valid(item) for filter in self.filters)
+            return all(results)
+        return any(results)
+
+    def _get_valid_mask(self, items: Sequence[Item]) -> List[bool]:
+        """Checks whether the aggregation of all filters passes for several Items. Each check
+        only runs for the Items whose result is not yet decided.
+
+        Args:
+            items (Sequence[Item]): The Items the Filter is checking.
+
+        Returns:
+            List[bool]: Whether each Item passes the Filter, in order.
+        """
 
-        if self.aggregator == AggregatorType.ANY:
-            return any(filter.is_valid(item) for filter in self.filters)
+        if self.aggregator not in (AggregatorType.ALL, AggregatorType.ANY):
+            raise ValueError(f"Unknown aggregator type {self.aggregator}")
 
-        raise ValueError(f"Unknown aggregator type {self.aggregator}")
+        # With all, Items are undecided until they fail a check, and with any until they pass
+        undecided_result = self.aggregator == AggregatorType.ALL
+        fuses_inverted = self._fuses_inverted()
+        results = [undecided_result] * len(items)
+        undecided = list(range(len(items)))
+        if self._key_sets is not None:
+            remaining = []
+            for idx in undecided:
+                passed = self._passes_key_sets(items[idx].key)
+                if passed == undecided_result:
+                    remaining.append(idx)
+                else:
+                    results[idx] = passed
+            undecided = remaining
+        for check in self._get_checks():
+            if not undecided:
+                break
+            undecided_items = [items[idx] for idx in undecided]
+            if isinstance(check, Filter):
+                mask = check.get_valid_mask(undecided_items)
+            else:
+                found = check.search_all([item.key for item in undecided_items])
+                mask = [fuses_inverted != is_found for is_found in found]
+            remaining = []
+            for idx, is_valid in zip(undecided, mask):
+                if is_valid == undecided_result:
+                    remaining.append(idx)
+                else:
+                    results[idx] = is_valid
+            undecided = remaining
+        return results
 
     @classmethod
     def from_data(cls: Type[AggregateFilter], data: Dict[str, Any]) -> AggregateFilter:
@@ -12,11 +12,12 @@
 from __future__ import annotations
 
 from abc import abstractmethod
-from enum import Enum
-from typing import ClassVar, Optional, Sequence, Set
+from enum import Enum, IntEnum
+from typing import ClassVar, List, Optional, Sequence, Set
 
 from autotransform.item.base import Item
 from autotransform.util.component import ComponentFactory, ComponentImport, NamedComponent
+from pydantic import PrivateAttr
 
 
 class FilterName(str, Enum):
@@ -33,19 +34,89 @@ class FilterName(str, Enum):
     KEY_HASH_SHARD = "key_hash_shard"
 
 
+class FilterCost(IntEnum):
+    """The static cost class of a Filter's per Item check, from cheapest to most expensive. Used
+    to order Filters so that cheap Filters reject Items before expensive Filters run."""
+
+    KEY = 1
+    STAT = 2
+    CONTENT = 3
+    SCRIPT = 4
+
+
 class Filter(NamedComponent):
     """The base for Filter components. Used by AutoTransform to determine if an Item from an Input
     is eligible for transformation.
 
     Attributes:
         inverted (bool, optional): Whether to invert the results of the filter. Defaults to False.
+        cost (ClassVar[FilterCost]): The static cost class of the Filter's check. Defaults to
+            FilterCost.CONTENT.
+        io_bound (ClassVar[bool]): Whether the Filter's check is dominated by I/O, allowing it to
+            be run concurrently for several Items. Defaults to False.
+        bulk_check (ClassVar[bool]): Whether the Filter has an efficient way to check many Items
+            at once with get_valid_mask, such as Filters that only look at the Item's key.
+            Defaults to False.
+        pre_process_required (ClassVar[bool]): Whether the Filter must be given every Item with
+            pre_process before checking Items. Defaults to False.
         name (ClassVar[FilterName]): The name of the component.
     """
 
     inverted: bool = False
 
+    cost: ClassVar[FilterCost] = FilterCost.CONTENT
+    io_bound: ClassVar[bool] = False
+    bulk_check: ClassVar[bool] = False
+    pre_process_required: ClassVar[bool] = False
     name: ClassVar[FilterName]
 
+    def get_cost(self) -> FilterCost:
+        """Gets the static cost class of the Filter's check.
+
+        Returns:
+            FilterCost: The cost class of the Filter.
+        """
+
+        return self.cost
+
+    def is_io_bound(self) -> bool:
+        """Checks whether the Filter's check is dominated by I/O. Such checks must be thread
+        safe, as they may be run concurrently for several Items.
+
+        Returns:
+            bool: Whether the Filter is I/O bound.
+        """
+
+        return self.io_bound
+
+    def supports_bulk_check(self) -> bool:
+        """Checks whether the Filter has an efficient way to check many Items at once. Schemas
+        check Items in chunks with get_valid_mask when every Filter supports it.
+
+        Returns:
+            bool: Whether the Filter supports bulk checks.
+        """
+
+        return self.bulk_check
+
+    def requires_pre_process(self) -> bool:
+        """Checks whether the Filter must be given every Item with pre_process before checking
+        Items. Schemas fully consume their Input to pre process such Filters.
+
+        Returns:
+            bool: Whether the Filter requires pre processing.
+        """
+
+        return self.pre_process_required
+
+    def pre_process(self, items: Sequence[Item]) -> None:
+        """Prepares the Filter to check Items, given every Item that will be checked. Does
+        nothing by default.
+
+        Args:
+            items (Sequence[Item]): The Items to validate.
+        """
+
     def is_valid(self, item: Item) -> bool:
         """Check whether an Item is valid based on the Filter and handle inversion.
 
@@ -69,17 +140,49 @@ class Filter(NamedComponent):
             bool: Returns True if the Item is eligible for transformation.
         """
 
+    def get_valid_mask(self, items: Sequence[Item]) -> List[bool]:
+        """Checks whether each of several Items is valid based on the Filter and handle
+        inversion.
+
+        Args:
+            items (Sequence[Item]): The Items to check.
+
+        Returns:
+            List[bool]: Whether each Item is eligible for transformation, in order.
+        """
+
+        inverted = self.inverted
+        return [inverted != is_valid for is_valid in self._get_valid_mask(items)]
+
+    def _get_valid_mask(self, items: Sequence[Item]) -> List[bool]:
+        """Checks whether each of several Items is valid based on the Filter. Does not handle
+        inversion. Filters that support bulk checks should override this to check the Items
+        together. Defaults to checking each Item with _is_valid.
+
+        Args:
+            items (Sequence[Item]): The Items to check.
+
+        Returns:
+            List[bool]: Whether each Item is eligible for transformation, in order.
+        """
+
+        return [self._is_valid(item) for item in items]
+
 
 class BulkFilter(Filter):
     """The base for BulkFilter components. Handles validation in bulk to determine valid Items.
 
     Attributes:
-        _valid_keys (Optional[List[str]], optional): Whether to invert the results of the filter.
-            Defaults to an None.
+        _valid_keys (Optional[Set[str]]): The keys of the valid Items, None until pre processed.
+        bulk_check (ClassVar[bool]): Whether the Filter supports bulk checks.
+        pre_process_required (ClassVar[bool]): Whether the Filter requires pre processing.
         name (ClassVar[FilterName]): The name of the component.
     """
 
-    _valid_keys: Optional[Set[str]] = None
+    _valid_keys: Optional[Set[str]] = PrivateAttr(default=None)
+
+    bulk_check: ClassVar[bool] = True
+    pre_process_required: ClassVar[bool] = True
 
     @abstractmethod
     def _get_valid_keys(self, items: Sequence[Item]) -> Set[str]:
@@ -102,6 +205,16 @@ class BulkFilter(Filter):
         if self._valid_keys is None:
             self._valid_keys = self._get_valid_keys(items)
 
+    def supports_bulk_check(self) -> bool:
+        """Checks whether the Filter supports bulk checks, which is only the case when Items are
+        checked against the valid keys. Subclasses that override _is_valid are checked per Item.
+
+        Returns:
+            bool: Whether the Filter supports bulk checks.
+        """
+
+        return self.bulk_check and type(self)._is_valid is BulkFilter._is_valid
+
     def _is_valid(self, item: Item) -> bool:
         """Check whether an Item is valid based on the Filter. Does not handle inversion.
 
@@ -114,6 +227,24 @@ class BulkFilter(Filter):
 
         return self._valid_keys is not None and item.key in self._valid_keys
 
+    def _get_valid_mask(self, items: Sequence[Item]) -> List[bool]:
+        """Checks whether each of several Items is valid based on the Filter. Does not handle
+        inversion.
+
+        Args:
+            items (Sequence[Item]): The Items to check.
+
+        Returns:
+            List[bool]: Whether each Item is eligible for transformation, in order.
+        """
+
+        if type(self)._is_valid is not BulkFilter._is_valid:
+            return super()._get_valid_mask(items)
+        valid_keys = self._valid_keys
+        if valid_keys is None:
+            return [False] * len(items)
+        return [item.key in valid_keys for item in items]
+
 
 FACTORY = ComponentFactory(
     {
@@ -12,10 +12,10 @@
 from functools import cached_property
 from typing import Any, ClassVar, Dict, Optional
 
-from autotransform.filter.base import Filter, FilterName
+from autotransform.filter.base import Filter, FilterCost, FilterName
 from autotransform.item.base import Item
 from autotransform.item.file import FileItem
-from codeowners import CodeOwners
+from autotransform.util.codeowners import CodeownersIndex
 from pydantic import root_validator
 
 
@@ -27,12 +27,16 @@ class CodeownersFilter(Filter):
         codeowners_file_path (str): The path of the CODEOWNERS file.
         owner (Optional[str]): The owner to allow files for. If None is provided, checks
             for unowned.
+        cost (ClassVar[FilterCost]): The cost class of the Component.
+        bulk_check (ClassVar[bool]): Whether the Component supports bulk checks.
         name (ClassVar[FilterName]): The name of the Component.
     """
 
     codeowners_file_path: str
     owner: Optional[str]
 
+    cost: ClassVar[FilterCost] = FilterCost.KEY
+    bulk_check: ClassVar[bool] = True
     name: ClassVar[FilterName] = FilterName.CODEOWNERS
 
     @root_validator(pre=True)
@@ -63,15 +67,14 @@ class CodeownersFilter(Filter):
         return values
 
     @cached_property
-    def _owners(self) -> CodeOwners:
-        """Gets the parsed CodeOwners as a cached property.
+    def _owners(self) -> CodeownersIndex:
+        """Gets the compiled CodeownersIndex as a cached property.
 
         Returns:
-            CodeOwners: The parsed CodeOwners.
+            CodeownersIndex: The index of the CODEOWNERS file.
         """
 
-        with open(self.codeowners_file_path, mode="r", encoding="UTF-8") as codeowners_file:
-            return CodeOwners(codeowners_file.read())
+        return CodeownersIndex.load(self.codeowners_file_path)
 
     @cached_property
     def _formatted_owner(self) -> Optional[str]:
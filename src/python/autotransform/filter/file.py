@@ -12,7 +12,7 @@
 from pathlib import Path
 from typing import ClassVar
 
-from autotransform.filter.base import Filter, FilterName
+from autotransform.filter.base import Filter, FilterCost, FilterName
 from autotransform.item.base import Item
 from autotransform.item.file import FileItem
 
@@ -23,10 +23,14 @@ class FileExistsFilter(Filter):
     Attributes:
         check_target_path (bool, optional): Check the target_path, rather than the key
             of the FileItem. Defaults to False.
+        cost (ClassVar[FilterCost]): The cost class of the component.
+        io_bound (ClassVar[bool]): Whether the component is I/O bound.
         name (ClassVar[FilterName]): The name of the component.
     """
 
     check_target_path: bool = False
+    cost: ClassVar[FilterCost] = FilterCost.STAT
+    io_bound: ClassVar[bool] = True
     name: ClassVar[FilterName] = FilterName.FILE_EXISTS
 
     def _is_valid(self, item: Item) -> bool:
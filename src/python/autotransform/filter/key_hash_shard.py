@@ -10,7 +10,7 @@
 """The implementation for the KeyHashShardFilter."""
 
 from hashlib import md5
-from typing import ClassVar
+from typing import ClassVar, List, Sequence
 
 from autotransform.filter.base import FilterName
 from autotransform.filter.shard import ShardFilter
@@ -21,9 +21,12 @@ class KeyHashShardFilter(ShardFilter):
     """A Filter which produces a shard from the key of an Item using md5 hashing.
 
     Attributes:
+        bulk_check (ClassVar[bool]): Whether the component supports bulk checks.
         name (ClassVar[FilterName]): The name of the component.
     """
 
+    bulk_check: ClassVar[bool] = True
+
     name: ClassVar[FilterName] = FilterName.KEY_HASH_SHARD
 
     def _shard(self, item: Item) -> int:
@@ -42,3 +45,23 @@ class KeyHashShardFilter(ShardFilter):
 
         # Convert the hexadecimal hash to an integer and return the shard number
         return int(hashed_key, 16) % self.num_shards
+
+    def _get_valid_mask(self, items: Sequence[Item]) -> List[bool]:
+        """Check whether the shards of several Items match the current shard, hashing every key
+        in one pass.
+
+        Args:
+            items (Sequence[Item]): The Items to check.
+
+        Returns:
+            List[bool]: Whether each Item's shard matches the current valid shard, in order.
+        """
+
+        assert self.valid_shard >= 0, "Shard filter not initialized correctly"
+        num_shards, valid_shard = self.num_shards, self.valid_shard
+        # Equivalent to converting the hexadecimal hash to an integer, without formatting it
+        return [
+            int.from_bytes(md5(item.key.encode("UTF-8")).digest(), "big") % num_shards
+            == valid_shard
+            for item in items
+        ]
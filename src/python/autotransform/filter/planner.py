@@ -0,0 +1,288 @@
+# AutoTransform
+# Large scale, component based code modification library
+#
+# Licensed under the MIT License <http://opensource.org/licenses/MIT>
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2022-present Nathan Rockenbach <http://github.com/nathro>
+
+# @black_format
+
+"""The FilterPlanner orders a Schema's Filters so that cheap, selective Filters reject Items
+before expensive Filters run. Filters are combined with AND and do not depend on each other, so
+any order produces the same valid Items. Items are checked against a planned order of Filters
+with check_filters and check_filters_bulk, which time each check for the planner."""
+
+from __future__ import annotations
+
+import json
+import os
+import time
+from hashlib import sha1
+from tempfile import NamedTemporaryFile
+from typing import Dict, List, Optional, Sequence, Tuple, TypedDict
+
+from autotransform.filter.base import Filter, FilterCost
+from autotransform.item.base import Item
+
+# Estimated seconds per Item check for Filters without learned statistics
+DEFAULT_SECONDS_PER_ITEM: Dict[FilterCost, float] = {
+    FilterCost.KEY: 0.000001,
+    FilterCost.STAT: 0.00002,
+    FilterCost.CONTENT: 0.0002,
+    FilterCost.SCRIPT: 0.001,
+}
+DEFAULT_PASS_RATE = 0.5
+
+# The number of checks needed before learned statistics replace the defaults
+MIN_SAMPLES = 100
+
+# Older statistics are scaled down once a Filter has this many checks so recent runs dominate
+MAX_SAMPLES = 1000000
+
+STATS_FILE_NAME = "filter_stats.json"
+
+
+# The index of a Filter, whether an Item passed it, and the seconds the check took
+FilterCheck = Tuple[int, bool, float]
+
+
+class FilterStats(TypedDict):
+    """Statistics about the checks performed by a Filter."""
+
+    checked: int
+    passed: int
+    seconds: float
+
+
+class FilterPlanner:
+    """Plans the order Filters are applied in. Filters are ordered by cost class, so cheaper
+    Filters such as a FileExistsFilter always guard more expensive ones. Within a cost class,
+    each Filter is ranked by its expected cost to reject an Item, which is the time per check
+    divided by the rate of rejection. Times and rejection rates are learned from previous runs,
+    using estimates based on the Filter's cost class until enough checks have been recorded.
+
+    Attributes:
+        filters (List[Filter]): The Filters in the order they were supplied.
+        namespace (str): A namespace for statistics, usually the Schema name, as selectivity
+            depends on the Items a Schema works with.
+        stats_path (Optional[str]): The file that statistics are persisted to. If None,
+            statistics are not persisted.
+        _keys (List[str]): The keys used for statistics of each Filter.
+        _stats (Dict[str, FilterStats]): The statistics from previous runs.
+        _run_stats (List[FilterStats]): The statistics from the current run for each Filter.
+    """
+
+    filters: List[Filter]
+    namespace: str
+    stats_path: Optional[str]
+    _keys: List[str]
+    _stats: Dict[str, FilterStats]
+    _run_stats: List[FilterStats]
+
+    def __init__(self, filters: Sequence[Filter], namespace: str, stats_path: Optional[str] = None):
+        """A simple constructor.
+
+        Args:
+            filters (Sequence[Filter]): The Filters to plan.
+            namespace (str): A namespace for statistics, usually the Schema name.
+            stats_path (Optional[str], optional): The file that statistics are persisted to. If
+                None, statistics are not persisted. Defaults to None.
+        """
+
+        self.filters = list(filters)
+        self.namespace = namespace
+        self.stats_path = stats_path
+        self._keys = [self._get_key(filt) for filt in self.filters]
+        self._stats = self._read_stats()
+        self._run_stats = [{"checked": 0, "passed": 0, "seconds": 0.0} for _ in self.filters]
+
+    def _get_key(self, filt: Filter) -> str:
+        """Gets the key used to store statistics for a Filter.
+
+        Args:
+            filt (Filter): The Filter to get the key for.
+
+        Returns:
+            str: The key for the Filter's statistics.
+        """
+
+        encoded = json.dumps([self.namespace, filt.bundle()], sort_keys=True)
+        return sha1(encoded.encode("UTF-8")).hexdigest()
+
+    def _read_stats(self) -> Dict[str, FilterStats]:
+        """Reads persisted statistics, ignoring missing or malformed files.
+
+        Returns:
+            Dict[str, FilterStats]: The persisted statistics.
+        """
+
+        if self.stats_path is None:
+            return {}
+        try:
+            with open(self.stats_path, "r", encoding="UTF-8") as stats_file:
+                stats = json.load(stats_file)
+        except (OSError, ValueError):
+            return {}
+        return stats if isinstance(stats, dict) else {}
+
+    def estimate(self, idx: int) -> Tuple[float, float]:
+        """Estimates the time per check and the pass rate of a Filter.
+
+        Args:
+            idx (int): The index of the Filter in filters.
+
+        Returns:
+            Tuple[float, float]: The seconds per check and the rate at which Items pass.
+        """
+
+        filt = self.filters[idx]
+        stats = self._stats.get(self._keys[idx])
+        if stats is None or stats["checked"] < MIN_SAMPLES:
+            return DEFAULT_SECONDS_PER_ITEM[filt.get_cost()], DEFAULT_PASS_RATE
+        return stats["seconds"] / stats["checked"], stats["passed"] / stats["checked"]
+
+    def get_plan(self) -> List[int]:
+        """Gets the order to apply Filters in, by cost class and then with the cheapest expected
+        cost to reject an Item first. Ties keep the supplied order.
+
+        Returns:
+            List[int]: The indices of the Filters in the order they should be applied.
+        """
+
+        def rank(idx: int) -> Tuple[int, float, int]:
+            seconds, pass_rate = self.estimate(idx)
+            return self.filters[idx].get_cost(), seconds / max(1.0 - pass_rate, 0.000001), idx
+
+        return sorted(range(len(self.filters)), key=rank)
+
+    def describe(self, plan: Sequence[int]) -> str:
+        """Describes a plan for logging.
+
+        Args:
+            plan (Sequence[int]): The plan to describe.
+
+        Returns:
+            str: A description of the plan.
+        """
+
+        lines = []
+        for idx in plan:
+            seconds, pass_rate = self.estimate(idx)
+            filt = self.filters[idx]
+            lines.append(
+                f"{filt!r} [{filt.get_cost().name.lower()}, {seconds * 1000000:.1f}us/item, "
+                + f"{pass_rate:.1%} pass]"
+            )
+        return "\n".join(lines)
+
+    def record(self, idx: int, passed: bool, seconds: float) -> None:
+        """Records the result of a Filter check.
+
+        Args:
+            idx (int): The index of the Filter in filters.
+            passed (bool): Whether the Item passed the Filter.
+            seconds (float): The time taken by the check.
+        """
+
+        stats = self._run_stats[idx]
+        stats["checked"] += 1
+        stats["passed"] += passed
+        stats["seconds"] += seconds
+
+    def save(self) -> None:
+        """Merges the statistics from this run in to the persisted statistics. Failures to write
+        statistics are ignored as they only affect future planning.
+        """
+
+        if self.stats_path is None or not any(stats["checked"] for stats in self._run_stats):
+            return
+
+        # Re-read in case another run has saved statistics since this run started
+        stats = self._read_stats()
+        for key, run_stats in zip(self._keys, self._run_stats):
+            if not run_stats["checked"]:
+                continue
+            prev_stats = stats.get(key, {"checked": 0, "passed": 0, "seconds": 0.0})
+            if prev_stats["checked"] and prev_stats["checked"] + run_stats["checked"] > MAX_SAMPLES:
+                scale = max(MAX_SAMPLES - run_stats["checked"], 0) / prev_stats["checked"]
+                prev_stats = {
+                    "checked": int(prev_stats["checked"] * scale),
+                    "passed": int(prev_stats["passed"] * scale),
+                    "seconds": prev_stats["seconds"] * scale,
+                }
+            stats[key] = {
+                "checked": prev_stats["checked"] + run_stats["checked"],
+                "passed": prev_stats["passed"] + run_stats["passed"],
+                "seconds": prev_stats["seconds"] + run_stats["seconds"],
+            }
+
+        try:
+            stats_dir = os.path.dirname(self.stats_path)
+            os.makedirs(stats_dir, exist_ok=True)
+            with NamedTemporaryFile(
+                "w", encoding="UTF-8", dir=stats_dir, suffix=".tmp", delete=False
+            ) as stats_file:
+                json.dump(stats, stats_file)
+            os.replace(stats_file.name, self.stats_path)
+        except OSError:
+            pass
+
+
+def check_filters(
+    plan: List[Tuple[int, Filter]], item: Item
+) -> Tuple[Optional[Filter], List[FilterCheck]]:
+    """Checks an Item against Filters in order, stopping at the first Filter it fails.
+
+    Args:
+        plan (List[Tuple[int, Filter]]): The Filters, with their original indices, to check.
+        item (Item): The Item to check.
+
+    Returns:
+        Tuple[Optional[Filter], List[FilterCheck]]: The Filter the Item failed if any, and the
+            checks performed.
+    """
+
+    checks: List[FilterCheck] = []
+    for idx, cur_filter in plan:
+        start = time.perf_counter()
+        is_valid = cur_filter.is_valid(item)
+        checks.append((idx, is_valid, time.perf_counter() - start))
+        if not is_valid:
+            return cur_filter, checks
+    return None, checks
+
+
+def check_filters_bulk(
+    plan: List[Tuple[int, Filter]], items: Sequence[Item]
+) -> List[Tuple[Optional[Filter], List[FilterCheck]]]:
+    """Checks Items against Filters in order using bulk checks, only checking each Filter
+    against the Items that passed the previous Filters. The time taken by a bulk check is split
+    evenly between the Items checked.
+
+    Args:
+        plan (List[Tuple[int, Filter]]): The Filters, with their original indices, to check.
+        items (Sequence[Item]): The Items to check.
+
+    Returns:
+        List[Tuple[Optional[Filter], List[FilterCheck]]]: For each Item, the Filter it failed if
+            any, and the checks performed.
+    """
+
+    invalid_filters: List[Optional[Filter]] = [None] * len(items)
+    checks: List[List[FilterCheck]] = [[] for _ in items]
+    remaining = list(range(len(items)))
+    for idx, cur_filter in plan:
+        if not remaining:
+            break
+        start = time.perf_counter()
+        mask = cur_filter.get_valid_mask([items[pos] for pos in remaining])
+        seconds = (time.perf_counter() - start) / len(remaining)
+        passed = []
+        for pos, is_valid in zip(remaining, mask):
+            checks[pos].append((idx, is_valid, seconds))
+            if is_valid:
+                passed.append(pos)
+            else:
+                invalid_filters[pos] = cur_filter
+        remaining = passed
+    return list(zip(invalid_filters, checks))
@@ -9,12 +9,13 @@
 
 """The implementation for regex based filters, including RegexFilter and FileContentRegexFilter."""
 
-import re
-from typing import ClassVar
+from typing import ClassVar, List, Optional, Sequence
 
-from autotransform.filter.base import Filter, FilterName
+from autotransform.filter.base import Filter, FilterCost, FilterName
 from autotransform.item.base import Item
 from autotransform.item.file import FileItem
+from autotransform.util.regex import PatternMatcher
+from pydantic import PrivateAttr
 
 
 class RegexFilter(Filter):
@@ -23,12 +24,30 @@ class RegexFilter(Filter):
 
     Attributes:
         pattern (str): The pattern to use when checking the Item's key.
+        cost (ClassVar[FilterCost]): The cost class of the component.
+        bulk_check (ClassVar[bool]): Whether the component supports bulk checks.
         name (ClassVar[FilterName]): The name of the component.
+        _matcher (Optional[PatternMatcher]): The compiled pattern, created on first use.
     """
 
     pattern: str
+    cost: ClassVar[FilterCost] = FilterCost.KEY
+    bulk_check: ClassVar[bool] = True
     name: ClassVar[FilterName] = FilterName.REGEX
 
+    _matcher: Optional[PatternMatcher] = PrivateAttr(default=None)
+
+    def get_matcher(self) -> PatternMatcher:
+        """Gets the compiled pattern, compiling it once per Filter.
+
+        Returns:
+            PatternMatcher: The compiled pattern.
+        """
+
+        if self._matcher is None:
+            self._matcher = PatternMatcher([self.pattern])
+        return self._matcher
+
     def _is_valid(self, item: Item) -> bool:
         """Check whether the key contains the pattern.
 
@@ -39,19 +58,42 @@ class RegexFilter(Filter):
             bool: Returns True if the pattern is found within the key.
         """
 
-        return bool(re.search(self.pattern, item.key))
+        return self.get_matcher().search(item.key)
+
+    def _get_valid_mask(self, items: Sequence[Item]) -> List[bool]:
+        """Check whether the keys of several Items contain the pattern.
+
+        Args:
+            items (Sequence[Item]): The Items to check.
+
+        Returns:
+            List[bool]: Whether the pattern is found within each key, in order.
+        """
+
+        return self.get_matcher().search_all([item.key for item in items])
 
 
 class RegexFileContentFilter(Filter):
     """A Filter which only passes FileItems where the file's content contains a match to the
-    provided regex pattern. Uses re.search rather than re.match.
+    provided regex pattern. Uses re.search rather than re.match. Binary and large files are
+    searched without caching their content.
 
     Attributes:
         pattern (str): The pattern to use when checking the FileItem's content
+        cache_content (bool, optional): Whether to read the content of files in to the cache
+            to search it. If False, files are memory mapped and scanned without being cached,
+            with the same results. Patterns that match bytes the same way as text stop at the
+            first match. Useful when most files are rejected. Defaults to True.
+        cost (ClassVar[FilterCost]): The cost class of the component.
+        io_bound (ClassVar[bool]): Whether the component is I/O bound.
         name (ClassVar[FilterName]): The name of the component.
     """
 
     pattern: str
+    cache_content: bool = True
+
+    cost: ClassVar[FilterCost] = FilterCost.CONTENT
+    io_bound: ClassVar[bool] = True
     name: ClassVar[FilterName] = FilterName.REGEX_FILE_CONTENT
 
     def _is_valid(self, item: Item) -> bool:
@@ -66,4 +108,6 @@ class RegexFileContentFilter(Filter):
 
         if not isinstance(item, FileItem):
             return False
-        return bool(re.search(self.pattern, item.get_content()))
+        if not self.cache_content:
+            return item.scan_content(self.pattern)
+        return item.search_content(self.pattern) is not None
@@ -12,12 +12,20 @@
 from __future__ import annotations
 
 import json
+from concurrent.futures import FIRST_EXCEPTION, ThreadPoolExecutor, wait
 from tempfile import NamedTemporaryFile as TmpFile
 from typing import ClassVar, List, Optional, Sequence, Set
 
-from autotransform.filter.base import BulkFilter, FilterName
+from autotransform.filter.base import BulkFilter, FilterCost, FilterName
 from autotransform.item.base import Item
-from autotransform.util.functions import replace_script_args, run_cmd
+from autotransform.util.functions import (
+    read_ndjson,
+    replace_script_args,
+    run_cmd,
+    run_cmd_streaming,
+)
+from autotransform.util.worker import get_request, get_response, get_worker
+from pydantic import validator
 
 
 class ScriptFilter(BulkFilter):
@@ -29,6 +37,17 @@ class ScriptFilter(BulkFilter):
         timeout (int): The timeout to use for the script process.
         chunk_size (Optional[int], optional): The maximum number of items per run of the
             script. If None, then no chunking is used. Defaults to None.
+        ndjson (bool, optional): Whether the script outputs newline delimited JSON, with one
+            valid key per line, rather than a JSON encoded list. Keys output to STDOUT are then
+            read as the script outputs them. Defaults to False.
+        max_workers (Optional[int], optional): The number of chunks to run the script on
+            concurrently. If None, chunks are run one at a time. Defaults to None.
+        persistent (bool, optional): Whether to send each run to a persistent worker that is
+            started once, rather than starting the script for every run. Sentinel arguments
+            are supplied as fields of each request, see autotransform.util.worker for the
+            protocol. Chunks are sent to the worker without waiting for earlier
+            chunks, so max_workers is not used. Defaults to False.
+        cost (ClassVar[FilterCost]): The cost class of the component.
         name (ClassVar[FilterName]): The name of the component.
     """
 
@@ -37,17 +56,45 @@ class ScriptFilter(BulkFilter):
     timeout: int
 
     chunk_size: Optional[int] = None
+    ndjson: bool = False
+    max_workers: Optional[int] = None
+    persistent: bool = False
 
+    cost: ClassVar[FilterCost] = FilterCost.SCRIPT
     name: ClassVar[FilterName] = FilterName.SCRIPT
 
+    @validator("max_workers")
+    @classmethod
+    def max_workers_is_positive(cls, v: Optional[int]) -> Optional[int]:
+        """Validates that max workers is positive.
+
+        Args:
+            v (Optional[int]): The number of chunks to run concurrently.
+
+        Raises:
+            ValueError: Raised if the number of workers is not positive.
+
+        Returns:
+            Optional[int]: The unmodified number of workers.
+        """
+
+        if v is not None and v <= 0:
+            raise ValueError("Max workers must be positive")
+        return v
+
     def _get_valid_keys(self, items: Sequence[Item]) -> Set[str]:
         """Gets the valid keys from the Items using a script. If a <<RESULT_FILE>> arg is used
         it will be replaced with the path of a temporary file that can be used to store a JSON
         encoded list of keys for valid Items. If no such arg is used, the STDOUT of the script
-        will be interpreted as a JSON encoded list of keys for valid Items. Additionally, the
+        will be interpreted as a JSON encoded list of keys for valid Items. If ndjson is set, the
+        result file or STDOUT is instead read as one JSON encoded key per line. Additionally, the
         <<ITEM_FILE>> argument will be replaced with the path to a file containing a JSON
         encoded list of the items to validate.
 
+        If max_workers is set, chunks are run concurrently, each with its own item and result
+        files. Once a run of the script fails, chunks that have not started are cancelled and
+        the error from the earliest failed chunk is raised after running chunks finish.
+
         Args:
             items (Sequence[Item]): The Items to check for valid items.
 
@@ -62,26 +109,100 @@ class ScriptFilter(BulkFilter):
         chunk_size = self.chunk_size or len(items)
         item_chunks = [items[i : i + chunk_size] for i in range(0, len(items), chunk_size)]
 
+        if self.persistent:
+            return self._get_worker_valid_keys(cmd, item_chunks)
+
+        max_workers = min(self.max_workers or 1, len(item_chunks))
+        if max_workers <= 1:
+            valid_keys: Set[str] = set()
+            for chunk in item_chunks:
+                valid_keys.update(self._get_chunk_valid_keys(cmd, chunk))
+            return valid_keys
+
+        executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="autotransform_script_filter"
+        )
+        try:
+            futures = [
+                executor.submit(self._get_chunk_valid_keys, cmd, chunk) for chunk in item_chunks
+            ]
+            done, _ = wait(futures, return_when=FIRST_EXCEPTION)
+            if any(future.exception() is not None for future in done):
+                # Stop chunks that have not started before waiting on those that are running
+                for future in futures:
+                    future.cancel()
+                wait(futures)
+            # Merge in chunk order so that the first failed chunk raises its error
+            valid_keys = set()
+            for future in futures:
+                if not future.cancelled():
+                    valid_keys.update(future.result())
+            return valid_keys
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def _get_worker_valid_keys(self, cmd: List[str], chunks: Sequence[Sequence[Item]]) -> Set[str]:
+        """Gets the valid keys from chunks of Items using a persistent worker. Every chunk is
+        sent before waiting for responses, and the timeout applies to the time spent waiting for
+        each response in turn. The valid keys are read from the result of each response, falling
+        back to its output.
+
+        Args:
+            cmd (List[str]): The command to run, before replacing arguments.
+            chunks (Sequence[Sequence[Item]]): The chunks of Items to check.
+
+        Returns:
+            Set[str]: The keys of the valid Items.
+        """
+
+        worker = get_worker(cmd)
+        futures = [worker.submit(get_request(chunk, {})) for chunk in chunks]
         valid_keys: Set[str] = set()
-        for chunk in item_chunks:
-            with TmpFile(mode="r+b") as res_file, TmpFile(mode="w+") as item_file:
-                json.dump([item.bundle() for item in chunk], item_file)
-                item_file.flush()
-                arg_replacements = {
-                    "<<RESULT_FILE>>": [res_file.name],
-                    "<<ITEM_FILE>>": [item_file.name],
-                }
-                uses_result_file = "<<RESULT_FILE>>" in cmd
-                replaced_cmd = replace_script_args(cmd, arg_replacements)
-
-                # Run script
-                proc = run_cmd(replaced_cmd, self.timeout)
-                proc.check_returncode()
-
-                if uses_result_file:
-                    with open(res_file.name, encoding="utf-8") as results:
-                        key_data = json.loads(results.read())
-                else:
-                    key_data = json.loads(proc.stdout.strip())
-                valid_keys = valid_keys.union(set(key_data))
+        for future in futures:
+            proc, result = get_response(worker, future, self.timeout)
+            proc.check_returncode()
+            if result is not None:
+                valid_keys.update(result)
+            elif self.ndjson:
+                valid_keys.update(read_ndjson(proc.stdout.splitlines()))
+            else:
+                valid_keys.update(json.loads(proc.stdout.strip()))
         return valid_keys
+
+    def _get_chunk_valid_keys(self, cmd: List[str], chunk: Sequence[Item]) -> Set[str]:
+        """Runs the script on a chunk of Items, using temporary item and result files for the
+        chunk.
+
+        Args:
+            cmd (List[str]): The command to run, before replacing arguments.
+            chunk (Sequence[Item]): The Items to check.
+
+        Returns:
+            Set[str]: The keys of the valid Items in the chunk.
+        """
+
+        with TmpFile(mode="r+b") as res_file, TmpFile(mode="w+") as item_file:
+            json.dump([item.bundle() for item in chunk], item_file)
+            item_file.flush()
+            arg_replacements = {
+                "<<RESULT_FILE>>": [res_file.name],
+                "<<ITEM_FILE>>": [item_file.name],
+            }
+            uses_result_file = "<<RESULT_FILE>>" in cmd
+            replaced_cmd = replace_script_args(cmd, arg_replacements)
+
+            if self.ndjson and not uses_result_file:
+                return set(read_ndjson(run_cmd_streaming(replaced_cmd, self.timeout)))
+
+            # Run script
+            proc = run_cmd(replaced_cmd, self.timeout)
+            proc.check_returncode()
+
+            if uses_result_file:
+                with open(res_file.name, encoding="utf-8") as results:
+                    if self.ndjson:
+                        return set(read_ndjson(results))
+                    key_data = json.loads(results.read())
+            else:
+                key_data = json.loads(proc.stdout.strip())
+            return set(key_data)
@@ -12,8 +12,9 @@
 from __future__ import annotations
 
 from abc import abstractmethod
+from typing import ClassVar
 
-from autotransform.filter.base import Filter
+from autotransform.filter.base import Filter, FilterCost
 from autotransform.item.base import Item
 
 
@@ -23,11 +24,14 @@ class ShardFilter(Filter):
     Attributes:
         num_shards (int): The number of shards to split the items across.
         valid_shard (int): The current valid shard to use.
+        cost (ClassVar[FilterCost]): The cost class of the component.
     """
 
     num_shards: int
     valid_shard: int = -1
 
+    cost: ClassVar[FilterCost] = FilterCost.KEY
+
     @abstractmethod
     def _shard(self, item: Item) -> int:
         """Produces a shard from an item.
@@ -13,7 +13,7 @@ from __future__ import annotations
 
 from abc import abstractmethod
 from enum import Enum
-from typing import ClassVar, Sequence
+from typing import ClassVar, Iterator, Sequence
 
 from autotransform.item.base import Item
 from autotransform.util.component import ComponentFactory, ComponentImport, NamedComponent
@@ -22,9 +22,11 @@ from autotransform.util.component import ComponentFactory, ComponentImport, Name
 class InputName(str, Enum):
     """A simple enum for mapping."""
 
+    CONTENT_SEARCH = "content_search"
     DIRECTORY = "directory"
     EMPTY = "empty"
     GIT_GREP = "git_grep"
+    GIT_LS_FILES = "git_ls_files"
     INLINE = "inline"
     INLINE_FILE = "inline_file"
     INLINE_GENERIC = "inline_generic"
@@ -52,9 +54,39 @@ class Input(NamedComponent):
             Sequence[Item]: The eligible Items for transformation.
         """
 
+    def iter_items(self) -> Iterator[Item]:
+        """Lazily get the Items to be used by the transformation based on the Input criteria.
+        Inputs that can produce Items incrementally should override this so that a Schema can
+        stop enumerating once it has what it needs. Defaults to iterating over get_items.
+
+        Returns:
+            Iterator[Item]: The eligible Items for transformation.
+        """
+
+        yield from self.get_items()
+
+    def record_run(self) -> None:
+        """Called once a run of the Schema completes with every Batch executed successfully.
+        Inputs that only list Items changed since the previous run can override this to record
+        the state the run started from. Defaults to doing nothing."""
+
+    def is_cacheable(self) -> bool:
+        """Whether the Items of the Input can be cached by a Schema with caching enabled. Cached
+        Items are reused while the Input's bundle and the state of the repo are unchanged, so
+        Inputs whose Items depend on other state should override this.
+
+        Returns:
+            bool: Whether the Items can be cached. Defaults to True.
+        """
+
+        return True
+
 
 FACTORY = ComponentFactory(
     {
+        InputName.CONTENT_SEARCH: ComponentImport(
+            class_name="ContentSearchInput", module="autotransform.input.contentsearch"
+        ),
         InputName.DIRECTORY: ComponentImport(
             class_name="DirectoryInput", module="autotransform.input.directory"
         ),
@@ -64,6 +96,9 @@ FACTORY = ComponentFactory(
         InputName.GIT_GREP: ComponentImport(
             class_name="GitGrepInput", module="autotransform.input.gitgrep"
         ),
+        InputName.GIT_LS_FILES: ComponentImport(
+            class_name="GitLsFilesInput", module="autotransform.input.gitlsfiles"
+        ),
         InputName.INLINE: ComponentImport(
             class_name="InlineInput", module="autotransform.input.inline"
         ),
@@ -0,0 +1,275 @@
+# AutoTransform
+# Large scale, component based code modification library
+#
+# Licensed under the MIT License <http://opensource.org/licenses/MIT>
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2022-present Nathan Rockenbach <http://github.com/nathro>
+
+# @black_format
+
+"""The implementation for the ContentSearchInput."""
+
+from __future__ import annotations
+
+import mmap
+import os
+import re
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from itertools import islice
+from typing import (
+    Any,
+    ClassVar,
+    Deque,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Pattern,
+    Sequence,
+    Tuple,
+)
+
+from autotransform.input.base import Input, InputName
+from autotransform.input.gitgrep import MATCHES_KEY
+from autotransform.item.file import FileItem
+from autotransform.util.regex import compile_text_and_bytes, get_required_literal
+from autotransform.util.walk import FileWalker
+from pydantic import Field, validator
+
+# The number of files searched by each task sent to a worker process
+CHUNK_SIZE = 64
+
+# A file that matched, along with its matches when they are included
+SearchResult = Tuple[str, Optional[List[Dict[str, Any]]]]
+
+
+def search_files(
+    paths: Sequence[str], pattern: str, literal: Optional[str], include_matches: bool
+) -> List[SearchResult]:
+    """Searches files for a pattern, memory mapping each file so that the regex runs directly
+    over the file's pages when the pattern matches bytes the same way as text. Otherwise the
+    content is decoded as UTF-8, replacing invalid bytes, and searched as text, as with
+    CachedFile.scan. Files that do not contain the literal are skipped without running the
+    regex. Files that can not be read are skipped.
+
+    Args:
+        paths (Sequence[str]): The paths of the files to search.
+        pattern (str): The pattern to search for, with ^ and $ matching at each line.
+        literal (Optional[str]): A literal that every match contains, if there is one.
+        include_matches (bool): Whether to return the line number and text of each match.
+
+    Returns:
+        List[SearchResult]: The files that match, in order.
+    """
+
+    str_regex, bytes_regex = compile_text_and_bytes(pattern, re.MULTILINE)
+    # Invalid bytes are decoded as the replacement character, which a byte search can not find
+    literal_bytes = None if literal is None or "\ufffd" in literal else literal.encode("UTF-8")
+    results: List[SearchResult] = []
+    for path in paths:
+        try:
+            with open(path, "rb") as file:
+                if os.fstat(file.fileno()).st_size == 0:
+                    result = _search_content(
+                        b"", str_regex, bytes_regex, literal_bytes, include_matches
+                    )
+                else:
+                    with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as content:
+                        result = _search_content(
+                            content, str_regex, bytes_regex, literal_bytes, include_matches
+                        )
+        except (OSError, ValueError):
+            continue
+        if result is not None:
+            results.append((path, result if include_matches else None))
+    return results
+
+
+def _search_content(
+    content: Any,
+    str_regex: Pattern[str],
+    bytes_regex: Optional[Pattern[bytes]],
+    literal: Optional[bytes],
+    include_matches: bool,
+) -> Optional[List[Dict[str, Any]]]:
+    """Searches the content of a file for a pattern, searching the bytes with the bytes pattern
+    if there is one, otherwise searching the decoded content.
+
+    Args:
+        content (Any): The bytes or memory map of the content.
+        str_regex (Pattern[str]): The pattern for searching text.
+        bytes_regex (Optional[Pattern[bytes]]): The pattern for searching bytes, if it finds the
+            same matches as searching text.
+        literal (Optional[bytes]): A literal that every match contains, if there is one.
+        include_matches (bool): Whether to find every match, rather than only the first.
+
+    Returns:
+        Optional[List[Dict[str, Any]]]: The line number and text of each match if including
+            matches, otherwise an empty list, None if the content does not match.
+    """
+
+    if literal is not None and content.find(literal) == -1:
+        return None
+    regex: Pattern[Any]
+    if bytes_regex is None:
+        regex, searched = str_regex, content[:].decode("UTF-8", errors="replace")
+    else:
+        regex, searched = bytes_regex, content
+    if not include_matches:
+        return [] if regex.search(searched) is not None else None
+
+    newline = "\n" if bytes_regex is None else b"\n"
+    matches = []
+    line = 1
+    position = 0
+    for match in regex.finditer(searched):
+        line += searched[position : match.start()].count(newline)
+        position = match.start()
+        text = match.group()
+        if isinstance(text, bytes):
+            text = text.decode("UTF-8", errors="replace")
+        matches.append({"line": line, "text": text})
+    return matches or None
+
+
+class ContentSearchInput(Input):
+    """An Input that walks directories and returns all files with content that matches a
+    pattern, without needing git. Files are searched in a pool of worker processes, and a
+    literal that every match must contain is searched for before running the regex.
+
+    Attributes:
+        pattern (str): The pattern to search for. Content is decoded as UTF-8, replacing
+            invalid bytes, so matches are the same as with RegexFileContentFilter, except that
+            ^ and $ deliberately match at the start and end of each line, as with GitGrepInput.
+        paths (List[str]): The paths of the directories to search.
+        exclude (List[str], optional): Glob patterns for files and directories to skip, as with
+            DirectoryInput. Defaults to [].
+        respect_gitignore (bool, optional): Whether to skip files ignored by .gitignore files,
+            along with .git directories. Defaults to False.
+        max_workers (Optional[int], optional): The number of worker processes used to search
+            files. If None, the number of CPUs is used. A value of 1 searches files in the
+            current process. Defaults to None.
+        include_matches (bool, optional): Whether to store the line number and text of each
+            match in the extra_data of each FileItem, as a list under the matches key, in the
+            same format as GitGrepInput. Defaults to False.
+        name (ClassVar[InputName]): The name of the component.
+    """
+
+    pattern: str
+    paths: List[str]
+    exclude: List[str] = Field(default_factory=list)
+    respect_gitignore: bool = False
+    max_workers: Optional[int] = None
+    include_matches: bool = False
+
+    name: ClassVar[InputName] = InputName.CONTENT_SEARCH
+
+    @validator("pattern")
+    @classmethod
+    def pattern_is_valid(cls, v: str) -> str:
+        """Validates that the pattern compiles.
+
+        Args:
+            v (str): The pattern.
+
+        Raises:
+            ValueError: Raised if the pattern is not a valid regex.
+
+        Returns:
+            str: The unmodified pattern.
+        """
+
+        try:
+            re.compile(v)
+        except re.error as err:
+            raise ValueError(f"Invalid pattern {v!r}: {err}") from err
+        return v
+
+    @validator("max_workers")
+    @classmethod
+    def max_workers_is_positive(cls, v: Optional[int]) -> Optional[int]:
+        """Validates that max workers is positive.
+
+        Args:
+            v (Optional[int]): The number of worker processes.
+
+        Raises:
+            ValueError: Raised if the number of workers is not positive.
+
+        Returns:
+            Optional[int]: The unmodified number of workers.
+        """
+
+        if v is not None and v <= 0:
+            raise ValueError("Max workers must be positive")
+        return v
+
+    def get_items(self) -> Sequence[FileItem]:
+        """Gets a list of files within the directories that match the pattern.
+
+        Returns:
+            Sequence[FileItem]: The eligible files for transformation.
+        """
+
+        return list(self.iter_items())
+
+    def iter_items(self) -> Iterator[FileItem]:
+        """Lazily gets files within the directories that match the pattern, in the order the
+        directories are walked. Only a bounded number of chunks of files are searched ahead of
+        the Items consumed, and pending searches are cancelled if iteration stops early.
+
+        Returns:
+            Iterator[FileItem]: The eligible files for transformation.
+        """
+
+        literal = get_required_literal(self.pattern)
+        files = FileWalker(self.exclude, self.respect_gitignore).walk(self.paths)
+        chunks = iter(lambda: list(islice(files, CHUNK_SIZE)), [])
+        max_workers = self.max_workers or os.cpu_count() or 1
+        if max_workers == 1:
+            results: Iterable[List[SearchResult]] = (
+                search_files(chunk, self.pattern, literal, self.include_matches) for chunk in chunks
+            )
+        else:
+            results = self._search_parallel(chunks, literal, max_workers)
+
+        for chunk_results in results:
+            for path, matches in chunk_results:
+                if matches is None:
+                    yield FileItem(key=path)
+                else:
+                    yield FileItem(key=path, extra_data={MATCHES_KEY: matches})
+
+    def _search_parallel(
+        self, chunks: Iterator[List[str]], literal: Optional[str], max_workers: int
+    ) -> Iterator[List[SearchResult]]:
+        """Searches chunks of files in a pool of worker processes, preserving the order of the
+        chunks.
+
+        Args:
+            chunks (Iterator[List[str]]): The chunks of files to search.
+            literal (Optional[str]): A literal that every match contains, if there is one.
+            max_workers (int): The number of worker processes.
+
+        Returns:
+            Iterator[List[SearchResult]]: The files that match in each chunk.
+        """
+
+        executor = ProcessPoolExecutor(max_workers=max_workers)
+        pending: Deque[Future[List[SearchResult]]] = deque()
+        try:
+            for chunk in chunks:
+                pending.append(
+                    executor.submit(
+                        search_files, chunk, self.pattern, literal, self.include_matches
+                    )
+                )
+                # Keep every worker busy without searching too far ahead
+                if len(pending) >= max_workers * 2:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
@@ -11,28 +11,42 @@
 
 from __future__ import annotations
 
-import os
-from functools import cached_property
-from pathlib import Path
-from typing import Any, ClassVar, Dict, List, Sequence
+from typing import Any, ClassVar, Dict, Iterator, List, Optional, Sequence
 
 from autotransform.input.base import Input, InputName
 from autotransform.item.file import FileItem
-from pydantic import root_validator
+from autotransform.util.walk import FileWalker
+from pydantic import Field, PrivateAttr, root_validator, validator
 
 
 class DirectoryInput(Input):
-    """An Input that lists all files recursively within a provided directory.
+    """An Input that lists all files recursively within a provided directory. Excluded and
+    ignored directories are skipped without being descended into.
 
     Attributes:
         paths (List[str]): The paths of the directories to fetch all files within.
+        exclude (List[str], optional): Glob patterns for files and directories to skip, such as
+            node_modules or .git. Patterns without a slash are matched against names, while
+            patterns with a slash are matched against full paths. Defaults to [].
+        respect_gitignore (bool, optional): Whether to skip files ignored by .gitignore files,
+            along with .git directories. Defaults to False.
+        max_workers (Optional[int], optional): The number of threads used to walk subtrees of
+            the directories concurrently. If None, directories are walked sequentially.
+            Defaults to None.
         name (ClassVar[InputName]): The name of the component.
+        _files (Optional[List[str]]): The files within the directories, cached once they have
+            all been listed.
     """
 
     paths: List[str]
+    exclude: List[str] = Field(default_factory=list)
+    respect_gitignore: bool = False
+    max_workers: Optional[int] = None
 
     name: ClassVar[InputName] = InputName.DIRECTORY
 
+    _files: Optional[List[str]] = PrivateAttr(default=None)
+
     @root_validator(pre=True)
     @classmethod
     def path_legacy_setting_validator(cls, values: Dict[str, Any]) -> Dict[str, Any]:
@@ -55,17 +69,34 @@ class DirectoryInput(Input):
         values["paths"] = list(set(values["paths"]))
         return values
 
-    @cached_property
-    def _files(self) -> List[str]:
-        """A cached list of files within the directory."""
+    @validator("max_workers")
+    @classmethod
+    def max_workers_is_positive(cls, v: Optional[int]) -> Optional[int]:
+        """Validates that max workers is positive.
+
+        Args:
+            v (Optional[int]): The number of threads used to walk the directories.
+
+        Raises:
+            ValueError: Raised if the number of workers is not positive.
+
+        Returns:
+            Optional[int]: The unmodified number of workers.
+        """
+
+        if v is not None and v <= 0:
+            raise ValueError("Max workers must be positive")
+        return v
 
-        files = []
-        for directory in self.paths:
-            for path, _, dir_files in os.walk(Path(directory)):
-                files.extend([f"{path}/{file}" for file in dir_files])
-            # Clean up file paths for consistency of use
-            files = [file.replace("\\", "/").removeprefix("./") for file in files]
-        return files
+    def _iter_files(self) -> Iterator[str]:
+        """Lazily walks the directories, yielding files as they are found.
+
+        Returns:
+            Iterator[str]: The files within the directories.
+        """
+
+        walker = FileWalker(self.exclude, self.respect_gitignore, self.max_workers)
+        return walker.walk(self.paths)
 
     def get_items(self) -> Sequence[FileItem]:
         """Gets a list of files recursively contained within the path.
@@ -74,4 +105,18 @@ class DirectoryInput(Input):
             Sequence[FileItem]: The eligible files for transformation.
         """
 
+        if self._files is None:
+            self._files = list(self._iter_files())
         return [FileItem(key=file) for file in self._files]
+
+    def iter_items(self) -> Iterator[FileItem]:
+        """Lazily gets files recursively contained within the path, walking the directories only
+        as far as needed unless the files have already been cached.
+
+        Returns:
+            Iterator[FileItem]: The eligible files for transformation.
+        """
+
+        files = self._files if self._files is not None else self._iter_files()
+        for file in files:
+            yield FileItem(key=file)
@@ -11,45 +11,128 @@
 
 from __future__ import annotations
 
-import subprocess
-from typing import ClassVar, Sequence
+from typing import Any, ClassVar, Dict, Iterator, List, Optional, Sequence
 
 from autotransform.input.base import Input, InputName
 from autotransform.item.file import FileItem
+from autotransform.util.functions import stream_cmd
+from pydantic import Field, root_validator
+
+# The extra_data key storing matches when include_matches is set
+MATCHES_KEY = "matches"
 
 
 class GitGrepInput(Input):
-    """An Input that uses git grep to search a repository for a pattern and returns all files
-    that contain a match of the supplied pattern.
+    """An Input that uses git grep to search a repository for patterns and returns all files
+    that contain a match of any of the supplied patterns, or of all of them if match_all is set.
+    Matches can be stored in the extra_data of each FileItem so that later stages do not need
+    to search the file again.
 
     Attributes:
-        pattern (str): The pattern to search git grep for.
+        pattern (Optional[str], optional): The pattern to search git grep for. Defaults to None.
+        patterns (List[str], optional): Additional patterns to search git grep for.
+            Defaults to [].
+        match_all (bool, optional): Whether files must match every pattern, rather than any
+            pattern. Defaults to False.
+        paths (List[str], optional): Pathspecs for the files to search. If empty, all files are
+            searched. Defaults to [].
+        exclude (List[str], optional): Pathspecs for files not to search. Defaults to [].
+        include_matches (bool, optional): Whether to store the line number and text of each
+            match in the extra_data of each FileItem, as a list under the matches key. Binary
+            files are not searched when set. As git grep does not output empty matches, files
+            whose only matches are empty, such as matches of ^ or a lookahead, are not included
+            when set. Defaults to False.
         name (ClassVar[InputName]): The name of the component.
     """
 
-    pattern: str
+    pattern: Optional[str] = None
+    patterns: List[str] = Field(default_factory=list)
+    match_all: bool = False
+    paths: List[str] = Field(default_factory=list)
+    exclude: List[str] = Field(default_factory=list)
+    include_matches: bool = False
 
     name: ClassVar[InputName] = InputName.GIT_GREP
 
+    @root_validator
+    @classmethod
+    def pattern_is_supplied(cls, values: Dict[str, Any]) -> Dict[str, Any]:
+        """Validates that at least one pattern is supplied.
+
+        Args:
+            values (Dict[str, Any]): The values used to configure the GitGrepInput.
+
+        Raises:
+            ValueError: Raised if no pattern is supplied.
+
+        Returns:
+            Dict[str, Any]: The unmodified values.
+        """
+
+        if values.get("pattern") is None and not values.get("patterns"):
+            raise ValueError("GitGrepInput requires a pattern")
+        return values
+
     def get_items(self) -> Sequence[FileItem]:
-        """Gets a list of files using git grep that match the supplied pattern.
+        """Gets a list of files using git grep that match the supplied patterns.
 
         Returns:
             Sequence[FileItem]: The eligible files for transformation.
         """
 
-        git_grep_cmd = [
-            "git",
-            "grep",
-            "--full-name",
-            "-l",
-            "--untracked",
-            "-e",
-            self.pattern,
-        ]
-
-        try:
-            files = subprocess.check_output(git_grep_cmd, encoding="UTF-8").strip().splitlines()
-        except subprocess.CalledProcessError:
-            return []
-        return [FileItem(key=file.replace("\\", "/")) for file in files]
+        return list(self.iter_items())
+
+    def iter_items(self) -> Iterator[FileItem]:
+        """Lazily gets files using git grep that match the supplied patterns, yielding each file
+        as git grep outputs it. Output is NUL delimited so that any file name can be handled.
+        The git grep process is killed if iteration stops early.
+
+        Returns:
+            Iterator[FileItem]: The eligible files for transformation.
+        """
+
+        if not self.include_matches:
+            for file in stream_cmd(self._get_command(), separator=b"\0", check=False):
+                yield FileItem(key=file.replace("\\", "/"))
+            return
+
+        # Each match is output as <file>\0<line>\0<text>\n, so splitting on NUL gives records
+        # holding the text of one match followed by the file of the next
+        match_file: Optional[str] = None
+        line: Optional[int] = None
+        matches: List[Dict[str, Any]] = []
+        for record in stream_cmd(self._get_command(), separator=b"\0", check=False):
+            if match_file is None:
+                match_file = record
+            elif line is None:
+                line = int(record)
+            else:
+                text, _, next_file = record.partition("\n")
+                matches.append({"line": line, "text": text})
+                line = None
+                if next_file != match_file:
+                    yield FileItem(
+                        key=match_file.replace("\\", "/"), extra_data={MATCHES_KEY: matches}
+                    )
+                    matches = []
+                match_file = next_file or None
+        if match_file is not None and matches:
+            yield FileItem(key=match_file.replace("\\", "/"), extra_data={MATCHES_KEY: matches})
+
+    def _get_command(self) -> List[str]:
+        """Gets the git grep command to run.
+
+        Returns:
+            List[str]: The git grep command.
+        """
+
+        cmd = ["git", "grep", "--full-name", "-z", "--untracked"]
+        cmd.extend(["-I", "-n", "-o"] if self.include_matches else ["-l"])
+        if self.match_all:
+            cmd.append("--all-match")
+        for pattern in ([self.pattern] if self.pattern is not None else []) + self.patterns:
+            cmd.extend(["-e", pattern])
+        pathspecs = [*self.paths, *[f":(exclude){path}" for path in self.exclude]]
+        if pathspecs:
+            cmd.extend(["--", *pathspecs])
+        return cmd
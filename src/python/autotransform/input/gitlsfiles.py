@@ -0,0 +1,213 @@
+# AutoTransform
+# Large scale, component based code modification library
+#
+# Licensed under the MIT License <http://opensource.org/licenses/MIT>
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2022-present Nathan Rockenbach <http://github.com/nathro>
+
+# @black_format
+
+"""The implementation for the GitLsFilesInput."""
+
+from __future__ import annotations
+
+import json
+import os
+import subprocess
+from tempfile import NamedTemporaryFile
+from typing import ClassVar, Dict, Iterator, List, Optional, Sequence
+
+import autotransform.schema
+from autotransform.config import get_config
+from autotransform.event.handler import EventHandler
+from autotransform.event.warning import WarningEvent
+from autotransform.input.base import Input, InputName
+from autotransform.item.file import FileItem
+from autotransform.util.functions import stream_cmd
+from pydantic import Field, PrivateAttr
+
+# The changed_since value for files changed since the last successful run of the Schema
+LAST_RUN = "<<LAST_RUN>>"
+RUNS_FILE_NAME = "git_ls_files_runs.json"
+
+
+class GitLsFilesInput(Input):
+    """An Input that lists files tracked by git, reading the git index rather than walking the
+    file system. Paths are relative to the root of the repo, as with GitGrepInput. If
+    changed_since is set, only files changed between the ref and HEAD that still exist are listed.
+
+    Attributes:
+        paths (List[str], optional): Pathspecs for the files to include. If empty, all files in
+            the repo are included. Defaults to [].
+        exclude (List[str], optional): Pathspecs for the files to exclude. Defaults to [].
+        changed_since (Optional[str], optional): A ref to list files changed since. The value
+            <<LAST_RUN>> uses the commit that the last successful run of the Schema started
+            from, listing all files if there is no such run or the commit no longer exists, such
+            as after a rebase. If None, all files are listed. Defaults to None.
+        name (ClassVar[InputName]): The name of the component.
+        _head (Optional[str]): The commit files were listed from, recorded once a run of the
+            Schema completes.
+        _schema_name (Optional[str]): The name of the Schema files were listed for.
+    """
+
+    paths: List[str] = Field(default_factory=list)
+    exclude: List[str] = Field(default_factory=list)
+    changed_since: Optional[str] = None
+
+    name: ClassVar[InputName] = InputName.GIT_LS_FILES
+
+    _head: Optional[str] = PrivateAttr(default=None)
+    _schema_name: Optional[str] = PrivateAttr(default=None)
+
+    def get_items(self) -> Sequence[FileItem]:
+        """Gets a list of files tracked by git that match the pathspecs.
+
+        Returns:
+            Sequence[FileItem]: The eligible files for transformation.
+        """
+
+        return list(self.iter_items())
+
+    def iter_items(self) -> Iterator[FileItem]:
+        """Lazily gets files tracked by git that match the pathspecs, streaming the NUL
+        delimited output of git. The git process is killed if iteration stops early.
+
+        Returns:
+            Iterator[FileItem]: The eligible files for transformation.
+        """
+
+        ref = self.changed_since
+        if ref == LAST_RUN:
+            schema = autotransform.schema.current
+            self._schema_name = None if schema is None else schema.config.schema_name
+            self._head = GitLsFilesInput._get_head()
+            ref = (
+                None
+                if self._schema_name is None
+                else GitLsFilesInput._read_runs(GitLsFilesInput._get_runs_path()).get(
+                    self._schema_name
+                )
+            )
+            if ref is not None and not GitLsFilesInput._has_commit(ref):
+                EventHandler.get().handle(
+                    WarningEvent(
+                        {"message": f"Commit {ref} of the last run is missing, listing all files"}
+                    )
+                )
+                ref = None
+        for file in stream_cmd(self._get_command(ref), separator=b"\0"):
+            yield FileItem(key=file.replace("\\", "/"))
+
+    def record_run(self) -> None:
+        """Records the commit that files were listed from as the last successful run of the
+        Schema, for use with <<LAST_RUN>>. Failures to write are ignored, as they only cause the
+        next run to consider more files."""
+
+        if self._head is None or self._schema_name is None:
+            return
+
+        runs_path = GitLsFilesInput._get_runs_path()
+        runs = GitLsFilesInput._read_runs(runs_path)
+        runs[self._schema_name] = self._head
+        try:
+            runs_dir = os.path.dirname(runs_path)
+            os.makedirs(runs_dir, exist_ok=True)
+            with NamedTemporaryFile(
+                "w", encoding="UTF-8", dir=runs_dir, suffix=".tmp", delete=False
+            ) as runs_file:
+                json.dump(runs, runs_file)
+            os.replace(runs_file.name, runs_path)
+        except OSError:
+            pass
+
+    def is_cacheable(self) -> bool:
+        """Whether the Items of the Input can be cached. Listing changed files depends on where
+        changed_since points, which the cache key does not cover, such as a remote branch or
+        the recorded runs, so those Items are never cached.
+
+        Returns:
+            bool: Whether the Items can be cached.
+        """
+
+        return self.changed_since is None
+
+    def _get_command(self, ref: Optional[str]) -> List[str]:
+        """Gets the git command to run.
+
+        Args:
+            ref (Optional[str]): The ref to list changed files since, None to list all files.
+
+        Returns:
+            List[str]: The git command.
+        """
+
+        # With no paths, the whole repo is included even when run from a subdirectory
+        pathspecs = [*(self.paths or [":/"]), *[f":(exclude){path}" for path in self.exclude]]
+        if ref is None:
+            return ["git", "ls-files", "-z", "--full-name", "--", *pathspecs]
+        return [
+            "git",
+            "diff",
+            "--name-only",
+            "-z",
+            "--no-renames",
+            "--diff-filter=d",
+            ref,
+            "HEAD",
+            "--",
+            *pathspecs,
+        ]
+
+    @staticmethod
+    def _get_head() -> str:
+        """Gets the commit that HEAD points to.
+
+        Returns:
+            str: The hash of the commit.
+        """
+
+        return subprocess.check_output(["git", "rev-parse", "HEAD"], encoding="UTF-8").strip()
+
+    @staticmethod
+    def _has_commit(ref: str) -> bool:
+        """Checks whether a commit exists in the repo.
+
+        Args:
+            ref (str): The hash of the commit.
+
+        Returns:
+            bool: Whether the commit exists.
+        """
+
+        cmd = ["git", "cat-file", "-e", f"{ref}^{{commit}}"]
+        return subprocess.run(cmd, capture_output=True, check=False).returncode == 0
+
+    @staticmethod
+    def _get_runs_path() -> str:
+        """Gets the path of the file storing the commit of the last successful run of each
+        Schema.
+
+        Returns:
+            str: The path of the file.
+        """
+
+        return os.path.join(get_config().get_cache_directory(), RUNS_FILE_NAME)
+
+    @staticmethod
+    def _read_runs(runs_path: str) -> Dict[str, str]:
+        """Reads the commit of the last successful run of each Schema, ignoring missing or
+        malformed files.
+
+        Args:
+            runs_path (str): The path of the file.
+
+        Returns:
+            Dict[str, str]: A mapping from Schema name to commit.
+        """
+
+        try:
+            with open(runs_path, "r", encoding="UTF-8") as runs_file:
+                runs = json.load(runs_file)
+        except (OSError, ValueError):
+            return {}
+        return runs if isinstance(runs, dict) else {}
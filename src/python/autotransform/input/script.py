@@ -13,12 +13,17 @@ from __future__ import annotations
 
 import json
 from tempfile import NamedTemporaryFile
-from typing import ClassVar, List, Sequence
+from typing import ClassVar, Iterator, List, Sequence
 
 from autotransform.input.base import Input, InputName
 from autotransform.item.base import FACTORY as item_factory
 from autotransform.item.base import Item
-from autotransform.util.functions import replace_script_args, run_cmd
+from autotransform.util.functions import (
+    read_ndjson,
+    replace_script_args,
+    run_cmd,
+    run_cmd_streaming,
+)
 
 
 class ScriptInput(Input):
@@ -28,12 +33,16 @@ class ScriptInput(Input):
         args (List[str]): The arguments to supply to the script.
         script (str): The script to run.
         timeout (int): The timeout to use for the script process.
+        ndjson (bool, optional): Whether the script outputs newline delimited JSON, with one
+            Item per line, rather than a JSON encoded list. Items output to STDOUT are then
+            produced as the script outputs them. Defaults to False.
         name (ClassVar[InputName]): The name of the component.
     """
 
     args: List[str]
     script: str
     timeout: int
+    ndjson: bool = False
 
     name: ClassVar[InputName] = InputName.SCRIPT
 
@@ -47,6 +56,9 @@ class ScriptInput(Input):
             Sequence[Item]: The supplied Items.
         """
 
+        if self.ndjson:
+            return list(self.iter_items())
+
         # Get Command
         cmd = [self.script]
         cmd.extend(self.args)
@@ -66,3 +78,34 @@ class ScriptInput(Input):
             else:
                 item_data = json.loads(proc.stdout.strip())
         return [item_factory.get_instance(item) for item in item_data]
+
+    def iter_items(self) -> Iterator[Item]:
+        """Lazily gets the Items generated by the script. In NDJSON mode, Items output to STDOUT
+        are yielded as the script outputs them, while Items in a <<RESULT_FILE>> are read one
+        line at a time once the script completes.
+
+        Returns:
+            Iterator[Item]: The supplied Items.
+        """
+
+        if not self.ndjson:
+            yield from self.get_items()
+            return
+
+        # Get Command
+        cmd = [self.script]
+        cmd.extend(self.args)
+
+        with NamedTemporaryFile(mode="r+b") as result_file:
+            arg_replacements = {"<<RESULT_FILE>>": [result_file.name]}
+            uses_result_file = "<<RESULT_FILE>>" in cmd
+            replaced_cmd = replace_script_args(cmd, arg_replacements)
+
+            if uses_result_file:
+                run_cmd(replaced_cmd, self.timeout).check_returncode()
+                with open(result_file.name, encoding="utf-8") as results:
+                    for item in read_ndjson(results):
+                        yield item_factory.get_instance(item)
+            else:
+                for item in read_ndjson(run_cmd_streaming(replaced_cmd, self.timeout)):
+                    yield item_factory.get_instance(item)
@@ -9,7 +9,9 @@
 
 """The implementation for the FileItem."""
 
-from typing import ClassVar
+from contextlib import contextmanager
+from mmap import mmap
+from typing import ClassVar, Iterator, Optional, Sequence, Union
 
 from autotransform.item.base import Item, ItemName
 from autotransform.util.cachedfile import CachedFile
@@ -43,6 +45,65 @@ class FileItem(Item):
 
         return CachedFile(self.get_path()).get_content()
 
+    def get_bytes(self) -> bytes:
+        """Gets the raw bytes of the file, without caching them.
+
+        Returns:
+            bytes: The file's bytes.
+        """
+
+        return CachedFile(self.get_path()).get_bytes()
+
+    def is_binary(self) -> bool:
+        """Checks whether the file is binary.
+
+        Returns:
+            bool: Whether the file is binary.
+        """
+
+        return CachedFile(self.get_path()).is_binary()
+
+    @contextmanager
+    def get_buffer(self) -> Iterator[Union[bytes, mmap]]:
+        """Gets a read only buffer of the file's bytes, memory mapping large files.
+
+        Returns:
+            Iterator[Union[bytes, mmap]]: A context for the buffer.
+        """
+
+        with CachedFile(self.get_path()).get_buffer() as buffer:
+            yield buffer
+
+    def search_content(
+        self, pattern: str, from_start: bool = False
+    ) -> Optional[Sequence[Optional[str]]]:
+        """Searches the content of the file for a pattern. Binary and large files are searched
+        without caching their content, see CachedFile.search.
+
+        Args:
+            pattern (str): The regex pattern to search for.
+            from_start (bool, optional): Whether the pattern must match at the start of the
+                file. Defaults to False.
+
+        Returns:
+            Optional[Sequence[Optional[str]]]: The groups of the match, None if there is no match.
+        """
+
+        return CachedFile(self.get_path()).search(pattern, from_start)
+
+    def scan_content(self, pattern: str) -> bool:
+        """Checks whether the content of the file contains a match for a pattern without
+        caching the content. The file is memory mapped, see CachedFile.scan.
+
+        Args:
+            pattern (str): The regex pattern to search for.
+
+        Returns:
+            bool: Whether the file contains a match.
+        """
+
+        return CachedFile(self.get_path()).scan(pattern)
+
     def write_content(self, content: str) -> None:
         """Writes new content to the file.
 
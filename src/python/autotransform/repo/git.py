@@ -9,9 +9,11 @@
 
 """The implementation for the GitRepo."""
 
+import os
 import re
 import subprocess
 from functools import cached_property
+from pathlib import Path
 from typing import Any, ClassVar, List, Mapping, Optional, Sequence
 
 from git import Head
@@ -21,6 +23,7 @@ import autotransform.schema
 from autotransform.batcher.base import Batch
 from autotransform.change.base import Change
 from autotransform.repo.base import Repo, RepoName
+from autotransform.util.cachedfile import FILE_CACHE, WRITE_JOURNAL
 
 
 class GitRepo(Repo):
@@ -31,6 +34,7 @@ class GitRepo(Repo):
         name (ClassVar[str]): The name of the component.
         BRANCH_NAME_PREFIX (ClassVar[str]): The prefix to apply to branches that are created.
         COMMIT_MESSAGE_PREFIX (ClassVar[str]): The prefix to apply to commits that are created.
+        ADD_CHUNK_SIZE (ClassVar[int]): The number of paths to stage with each git add.
     """
 
     base_branch: str
@@ -39,6 +43,7 @@ class GitRepo(Repo):
 
     BRANCH_NAME_PREFIX: ClassVar[str] = "AUTO_TRANSFORM"
     COMMIT_MESSAGE_PREFIX: ClassVar[str] = "[AutoTransform]"
+    ADD_CHUNK_SIZE: ClassVar[int] = 1000
 
     @staticmethod
     def get_changed_files_from_status(status: str) -> List[str]:
@@ -139,8 +144,48 @@ class GitRepo(Repo):
                 return branch
         raise ValueError("Invalid base branch name, branch not found.")
 
+    @cached_property
+    def _is_linked_worktree(self) -> bool:
+        """Whether the local repo is a linked worktree rather than the main checkout. Linked
+        worktrees can not check out a branch that is checked out elsewhere.
+
+        Returns:
+            bool: Whether the local repo is a linked worktree.
+        """
+
+        git_dir = Path(self._local_repo.git_dir).resolve()
+        return git_dir != Path(self._local_repo.common_dir).resolve()
+
+    def get_root(self) -> str:
+        """Gets the root directory of the local repo.
+
+        Returns:
+            str: The root directory of the local repo.
+        """
+
+        return str(self._local_repo.working_tree_dir).replace("\\", "/")
+
+    def add_worktree(self, path: str) -> None:
+        """Creates a linked worktree with a detached checkout of the base branch.
+
+        Args:
+            path (str): The directory to create the worktree in.
+        """
+
+        self._local_repo.git.worktree("add", "--detach", path, self.base_branch)
+
+    def remove_worktree(self, path: str) -> None:
+        """Removes a linked worktree, discarding any changes present in it.
+
+        Args:
+            path (str): The directory of the worktree.
+        """
+
+        self._local_repo.git.worktree("remove", "--force", path)
+
     def get_changed_files(self, _batch: Batch) -> List[str]:
-        """Uses git status to get all changed files.
+        """Gets all changed files from the WRITE_JOURNAL. If the journal is not tracking writes,
+        such as when a script wrote files, uses git status instead.
 
         Args:
             _batch (Batch): Unused Batch object used to match signature to base.
@@ -149,6 +194,9 @@ class GitRepo(Repo):
             List[str]: All changed files, including untracked files.
         """
 
+        changed_files = WRITE_JOURNAL.get_changed_files()
+        if changed_files is not None:
+            return changed_files
         return GitRepo.get_changed_files_from_status(
             self._local_repo.git.status("-s", untracked_files=True),
         )
@@ -186,7 +234,8 @@ class GitRepo(Repo):
         self.commit(batch["title"], change is not None)
 
     def commit(self, title: str, update: bool) -> None:
-        """Creates a new branch for all changes, stages them, and commits them.
+        """Creates a new branch for all changes, stages them, and commits them. Only files in the
+        WRITE_JOURNAL are staged when it is tracking writes.
 
         Args:
             title (str): The title of the Batch being commited.
@@ -194,17 +243,26 @@ class GitRepo(Repo):
         """
 
         self._local_repo.git.checkout("-B" if update else "-b", GitRepo.get_branch_name(title))
-        self._local_repo.git.add(all=True)
+        changed_files = WRITE_JOURNAL.get_changed_files()
+        if changed_files is None:
+            self._local_repo.git.add(all=True)
+        else:
+            # Git runs from the root of the repo, so paths relative to the cwd must be resolved.
+            # Paths are staged in chunks to stay within command line length limits.
+            paths = [os.path.abspath(path) for path in changed_files]
+            for idx in range(0, len(paths), GitRepo.ADD_CHUNK_SIZE):
+                self._local_repo.git.add("--all", "--", *paths[idx : idx + GitRepo.ADD_CHUNK_SIZE])
         self._local_repo.index.commit(GitRepo.get_commit_message(title))
 
     def clean(self, _batch: Batch) -> None:
-        """Performs `git reset --hard` to remove any changes.
+        """Performs `git reset --hard` to remove any changes, invalidating cached file content.
 
         Args:
             _batch (Batch): Unused Batch object used to match signature to base
         """
 
         self._local_repo.git.reset("--hard")
+        FILE_CACHE.invalidate()
 
     def rewind(self, batch: Batch) -> None:
         """First eliminates any uncommitted changes using the clean function then checks out
@@ -215,7 +273,11 @@ class GitRepo(Repo):
         """
 
         self.clean(batch)
-        self._base_branch.checkout()
+        if self._is_linked_worktree:
+            self._local_repo.git.checkout("--detach", self.base_branch)
+        else:
+            self._base_branch.checkout()
+        FILE_CACHE.invalidate()
 
     def get_outstanding_changes(self) -> Sequence[Change]:
         """Gets all outstanding Changes for the Repo.
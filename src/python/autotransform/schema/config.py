@@ -21,6 +21,7 @@ from autotransform.util.console import (
     get_str,
     input_int,
 )
+from autotransform.util.inputcache import DEFAULT_TTL
 from autotransform.validator.base import ValidationResultLevel
 from pydantic import Field, validator
 
@@ -35,12 +36,33 @@ class SchemaConfig(ComponentModel):  # pylint: disable=too-few-public-methods
             Defaults to ValidationResultLevel.NONE.
         max_submissions (Optional[int], optional): The maximum number of submissions the schema can
             create per run. If None, there is no limit. Defaults to None.
+        max_workers (Optional[int], optional): The maximum number of worker processes used to
+            execute Batches in parallel. Each worker runs in its own git worktree, so Batches are
+            only executed in parallel when the Schema uses a GitRepo. If None, Batches are
+            executed sequentially. Defaults to None.
+        filter_workers (Optional[int], optional): The number of threads used to run I/O bound
+            Filters concurrently for several Items. If None, Filters are run one Item at a time.
+            Defaults to None.
+        incremental (bool, optional): Whether to skip FileItems that a previous run transformed
+            with no changes, as long as neither the file nor the Schema has changed since.
+            Requires a Repo to detect changes. Defaults to False.
+        cache (bool, optional): Whether to cache the Items produced by the Input, keyed by the
+            Input's bundle and the state of the git repo. Cached Items are reused by later runs
+            while neither has changed, and are not used while the repo has untracked files.
+            Defaults to False.
+        cache_ttl (int, optional): The number of seconds cached Items are valid for.
+            Defaults to DEFAULT_TTL.
         owners (List[str], optional): The owners for the schema. Defaults to [].
     """
 
     schema_name: str
     allowed_validation_level: ValidationResultLevel = ValidationResultLevel.NONE
     max_submissions: Optional[int] = None
+    max_workers: Optional[int] = None
+    filter_workers: Optional[int] = None
+    incremental: bool = False
+    cache: bool = False
+    cache_ttl: int = DEFAULT_TTL
     owners: List[str] = Field(default_factory=list)
 
     @validator("max_submissions")
@@ -63,6 +85,66 @@ class SchemaConfig(ComponentModel):  # pylint: disable=too-few-public-methods
             raise ValueError(f"Maximum number of submissions must be positive, {v} provided")
         return v
 
+    @validator("max_workers")
+    @classmethod
+    def max_workers_is_positive(cls: Type[SchemaConfig], v: Optional[int]) -> Optional[int]:
+        """Validates that max workers is positive.
+
+        Args:
+            cls (Type[SchemaConfig]): The Config class.
+            v (int): The maximum number of workers.
+
+        Raises:
+            ValueError: Raised if the maximum number of workers is not positive.
+
+        Returns:
+            Optional[int]: The unmodified maximum number of workers.
+        """
+
+        if v is not None and v < 1:
+            raise ValueError(f"Maximum number of workers must be positive, {v} provided")
+        return v
+
+    @validator("filter_workers")
+    @classmethod
+    def filter_workers_is_positive(cls: Type[SchemaConfig], v: Optional[int]) -> Optional[int]:
+        """Validates that filter workers is positive.
+
+        Args:
+            cls (Type[SchemaConfig]): The Config class.
+            v (int): The number of filter workers.
+
+        Raises:
+            ValueError: Raised if the number of filter workers is not positive.
+
+        Returns:
+            Optional[int]: The unmodified number of filter workers.
+        """
+
+        if v is not None and v < 1:
+            raise ValueError(f"Number of filter workers must be positive, {v} provided")
+        return v
+
+    @validator("cache_ttl")
+    @classmethod
+    def cache_ttl_is_positive(cls: Type[SchemaConfig], v: int) -> int:
+        """Validates that the cache TTL is positive.
+
+        Args:
+            cls (Type[SchemaConfig]): The Config class.
+            v (int): The cache TTL.
+
+        Raises:
+            ValueError: Raised if the cache TTL is not positive.
+
+        Returns:
+            int: The unmodified cache TTL.
+        """
+
+        if v < 1:
+            raise ValueError(f"Cache TTL must be positive, {v} provided")
+        return v
+
     @staticmethod
     def from_console(prev_config: Optional[SchemaConfig] = None) -> SchemaConfig:
         """Gets a SchemaConfig using console inputs.
@@ -122,4 +204,9 @@ class SchemaConfig(ComponentModel):  # pylint: disable=too-few-public-methods
             allowed_validation_level=allowed_validation_level,
             owners=list(set(owners)),
             max_submissions=max_submissions,
+            max_workers=prev_config.max_workers if prev_config is not None else None,
+            filter_workers=prev_config.filter_workers if prev_config is not None else None,
+            incremental=prev_config.incremental if prev_config is not None else False,
+            cache=prev_config.cache if prev_config is not None else False,
+            cache_ttl=prev_config.cache_ttl if prev_config is not None else DEFAULT_TTL,
         )
@@ -13,7 +13,21 @@ required to fully execute a change."""
 from __future__ import annotations
 
 import json
-from typing import Any, Dict, List, Optional
+import multiprocessing
+import os
+import pickle
+import shutil
+import tempfile
+from collections import deque
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+from itertools import islice
+from typing import Any, Deque, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple
 
 import autotransform.schema
 from autotransform.batcher.base import FACTORY as batcher_factory
@@ -21,6 +35,7 @@ from autotransform.batcher.base import Batch, Batcher
 from autotransform.change.base import Change
 from autotransform.command.base import FACTORY as command_factory
 from autotransform.command.base import Command
+from autotransform.config import get_config
 from autotransform.event.batch import (
     BatchExecutionFailedEvent,
     BatchNoChangesEvent,
@@ -30,23 +45,46 @@ from autotransform.event.batch import (
 )
 from autotransform.event.debug import DebugEvent
 from autotransform.event.handler import EventHandler
+from autotransform.event.logginglevel import LoggingLevel
 from autotransform.event.verbose import VerboseEvent
+from autotransform.event.warning import WarningEvent
 from autotransform.filter.base import FACTORY as filter_factory
-from autotransform.filter.base import BulkFilter, Filter
+from autotransform.filter.base import Filter, FilterCost
+from autotransform.filter.planner import STATS_FILE_NAME as FILTER_STATS_FILE_NAME
+from autotransform.filter.planner import (
+    FilterCheck,
+    FilterPlanner,
+    check_filters,
+    check_filters_bulk,
+)
 from autotransform.input.base import FACTORY as input_factory
 from autotransform.input.base import Input
 from autotransform.item.base import Item
+from autotransform.item.file import FileItem
 from autotransform.repo.base import FACTORY as repo_factory
 from autotransform.repo.base import Repo
+from autotransform.repo.git import GitRepo
 from autotransform.schema.config import SchemaConfig
 from autotransform.transformer.base import FACTORY as transformer_factory
 from autotransform.transformer.base import Transformer
+from autotransform.util.cachedfile import FILE_CACHE, WRITE_JOURNAL
 from autotransform.util.component import ComponentModel
 from autotransform.util.console import choose_options_from_list, choose_yes_or_no
+from autotransform.util.inputcache import CACHE_DIRECTORY_NAME as INPUT_CACHE_DIRECTORY_NAME
+from autotransform.util.inputcache import InputCache, get_repo_state
+from autotransform.util.itemstate import STORE_FILE_NAME as ITEM_STATE_FILE_NAME
+from autotransform.util.itemstate import ItemStateStore
+from autotransform.util.profiler import get_profiler, profile, profile_iter
+from autotransform.util.worker import shutdown_workers
 from autotransform.validator.base import FACTORY as validator_factory
 from autotransform.validator.base import ValidationError, Validator
 from pydantic import Field
 
+# The number of Items checked together when every Filter supports bulk checks. Bulk checks
+# have a fixed setup cost, so chunks with fewer than the minimum are checked one Item at a time
+BULK_CHECK_CHUNK_SIZE = 1024
+BULK_CHECK_MIN_ITEMS = 32
+
 
 class AutoTransformSchema(ComponentModel):
     """The heart of AutoTransform, pulls together all components required to execute
@@ -79,52 +117,242 @@ class AutoTransformSchema(ComponentModel):
     repo: Optional[Repo] = None
 
     def get_items(self) -> List[Item]:
-        """Runs the Input to get eligible Items and filters them.
-        Note: this function is not thread safe.
+        """Runs the Input to get eligible Items and filters them. Every Item is needed, so Items
+        are checked in bulk when every Filter supports it. Note: this function is not thread safe.
 
         Returns:
             List[Item]: The valid Items for the Schema.
         """
 
+        valid_items = list(self.iter_items(bulk_check=True))
+        if valid_items:
+            EventHandler.get().handle(
+                DebugEvent({"message": lambda: f"Valid items: [\n{_encode_items(valid_items)}\n]"})
+            )
+        return valid_items
+
+    def iter_items(self, bulk_check: bool = False) -> Iterator[Item]:
+        """Lazily runs the Input to get eligible Items and filters them as they are produced.
+        BulkFilters need every Item up front, so the Input is fully consumed before filtering
+        when any Filter, including an AggregateFilter of BulkFilters, requires pre processing.
+        Note: this function is not thread safe.
+
+        Args:
+            bulk_check (bool, optional): Whether to check chunks of Items together when every
+                Filter supports bulk checks, reading ahead of the Items consumed. Always done
+                when a Filter requires pre processing. Defaults to False.
+
+        Returns:
+            Iterator[Item]: The valid Items for the Schema.
+        """
+
+        previous_schema = autotransform.schema.current
         autotransform.schema.current = self
         event_handler = EventHandler.get()
 
         # Get Items
         event_handler.handle(VerboseEvent({"message": "Begin get_items"}))
-        all_items = self.input.get_items()
-        item_str = "\n".join([f"{item!r}," for item in all_items])
-        event_handler.handle(VerboseEvent({"message": f"Num Items: {len(all_items)}"}))
-        event_handler.handle(DebugEvent({"message": f"Items: [\n{item_str}\n]"}))
+        all_items: Iterable[Item] = profile_iter(
+            f"input {self.input.name.value}", self._iter_input_items()
+        )
+        bulk_filters = [filt for filt in self.filters if filt.requires_pre_process()]
+        if bulk_filters:
+            all_items = list(all_items)
+            for filt in bulk_filters:
+                with profile(f"filter {filt.name.value} pre_process", len(all_items)):
+                    filt.pre_process(all_items)
+
+        # Plan the order of Filters, cheap and selective Filters are applied first
+        event_handler.handle(VerboseEvent({"message": "Begin filters"}))
+        planner = FilterPlanner(
+            self.filters,
+            self.config.schema_name,
+            os.path.join(get_config().get_cache_directory(), FILTER_STATS_FILE_NAME),
+        )
+        plan_order = planner.get_plan()
+        plan = [(idx, self.filters[idx]) for idx in plan_order]
+        event_handler.handle(
+            VerboseEvent({"message": lambda: f"Filter plan: [\n{planner.describe(plan_order)}\n]"})
+        )
 
         # Filter Items
-        event_handler.handle(VerboseEvent({"message": "Begin filters"}))
-        valid_items: List[Item] = []
-        for filt in self.filters:
-            if isinstance(filt, BulkFilter):
-                filt.pre_process(all_items)
-        for item in all_items:
-            is_valid = True
-            for cur_filter in self.filters:
-                if not cur_filter.is_valid(item):
-                    is_valid = False
-                    event = DebugEvent({"message": f"[{cur_filter}] Invalid Item: {item!r}"})
-                    event_handler.handle(event)
-                    break
-            if is_valid:
-                valid_items.append(item)
-        if valid_items:
-            valid_item_str = "\n".join([f"{item!r}," for item in valid_items])
-            event_handler.handle(VerboseEvent({"message": f"Num Valid Items: {len(valid_items)}"}))
-            event_handler.handle(DebugEvent({"message": f"Valid items: [\n{valid_item_str}\n]"}))
+        num_items = 0
+        num_valid_items = 0
+        debug_enabled = event_handler.is_enabled(LoggingLevel.DEBUG)
+        profiler = get_profiler()
+        filter_stages = [
+            f"filter[{idx}] {filt.name.value}" for idx, filt in enumerate(self.filters)
+        ]
+        try:
+            checked_items = self._check_items(all_items, plan, bulk_check or bool(bulk_filters))
+            for item, invalid_filter, checks in checked_items:
+                num_items += 1
+                for idx, passed, seconds in checks:
+                    planner.record(idx, passed, seconds)
+                    if profiler is not None:
+                        profiler.add(filter_stages[idx], seconds, 1)
+                if invalid_filter is not None:
+                    if debug_enabled:
+                        event = DebugEvent(
+                            {"message": f"[{invalid_filter}] Invalid Item: {item!r}"}
+                        )
+                        event_handler.handle(event)
+                    continue
+                num_valid_items += 1
+                yield item
+        finally:
+            # Statistics from partial runs still improve future plans
+            planner.save()
+
+        event_handler.handle(VerboseEvent({"message": f"Num Items: {num_items}"}))
+        if num_valid_items:
+            event_handler.handle(VerboseEvent({"message": f"Num Valid Items: {num_valid_items}"}))
         else:
             event_handler.handle(VerboseEvent({"message": "No valid items."}))
+        autotransform.schema.current = previous_schema
 
-        autotransform.schema.current = None
-        return valid_items
+    def _iter_input_items(self) -> Iterator[Item]:
+        """Gets the Items from the Input. When the config enables caching, cached Items are used
+        if the Input and the state of the repo are unchanged. Otherwise Items are cached once the
+        Input is fully consumed.
+
+        Returns:
+            Iterator[Item]: The Items from the Input.
+        """
+
+        if not self.config.cache or not self.input.is_cacheable():
+            yield from self.input.iter_items()
+            return
+
+        event_handler = EventHandler.get()
+        repo_state = get_repo_state()
+        if repo_state is None:
+            event_handler.handle(
+                VerboseEvent({"message": "Input cache bypassed, repo state is unavailable"})
+            )
+            yield from self.input.iter_items()
+            return
+
+        cache = InputCache(
+            os.path.join(get_config().get_cache_directory(), INPUT_CACHE_DIRECTORY_NAME),
+            self.config.cache_ttl,
+        )
+        key = InputCache.get_key(self.input.bundle(), repo_state)
+        cached_items = cache.get(key)
+        if cached_items is not None:
+            event_handler.handle(VerboseEvent({"message": "Using cached Input Items"}))
+            yield from cached_items
+            return
+
+        items = []
+        for item in self.input.iter_items():
+            items.append(item)
+            yield item
+        cache.set(key, items)
+
+    def _check_items(
+        self, items: Iterable[Item], plan: List[Tuple[int, Filter]], bulk_check: bool = False
+    ) -> Iterator[Tuple[Item, Optional[Filter], List[FilterCheck]]]:
+        """Checks Items against planned Filters, preserving the order of Items. When bulk checks
+        are allowed and every Filter supports them, Items are checked in chunks with each
+        Filter's get_valid_mask. Otherwise, when the config sets filter_workers, the run of I/O
+        bound Filters starting at the first planned I/O bound Filter is checked by a pool of
+        threads. Other Filters are not assumed to be thread safe, so earlier Filters are checked
+        as Items are produced and later Filters once the threaded checks complete.
+
+        Args:
+            items (Iterable[Item]): The Items to check.
+            plan (List[Tuple[int, Filter]]): The Filters, with their original indices, in the
+                order they should be checked.
+            bulk_check (bool, optional): Whether Items may be checked in chunks. Defaults to
+                False.
+
+        Returns:
+            Iterator[Tuple[Item, Optional[Filter], List[FilterCheck]]]: Each Item, the Filter
+                it failed if any, and the checks performed for it.
+        """
+
+        if bulk_check and plan and all(filt.supports_bulk_check() for _, filt in plan):
+            item_iter = iter(items)
+            for chunk in iter(lambda: list(islice(item_iter, BULK_CHECK_CHUNK_SIZE)), []):
+                if len(chunk) < BULK_CHECK_MIN_ITEMS:
+                    for item in chunk:
+                        yield (item, *check_filters(plan, item))
+                    continue
+                for item, (invalid_filter, checks) in zip(chunk, check_filters_bulk(plan, chunk)):
+                    yield item, invalid_filter, checks
+            return
+
+        first_io_bound = next(
+            (pos for pos, (_, filt) in enumerate(plan) if filt.is_io_bound()), None
+        )
+        if self.config.filter_workers is None or first_io_bound is None:
+            for item in items:
+                yield (item, *check_filters(plan, item))
+            return
+        yield from self._check_items_threaded(
+            items, plan, first_io_bound, self.config.filter_workers
+        )
+
+    @staticmethod
+    def _check_items_threaded(
+        items: Iterable[Item], plan: List[Tuple[int, Filter]], first_io_bound: int, workers: int
+    ) -> Iterator[Tuple[Item, Optional[Filter], List[FilterCheck]]]:
+        """Checks Items against planned Filters, using a pool of threads for the run of I/O bound
+        Filters starting at the first I/O bound Filter, see _check_items.
+
+        Args:
+            items (Iterable[Item]): The Items to check.
+            plan (List[Tuple[int, Filter]]): The Filters, with their original indices, in the
+                order they should be checked.
+            first_io_bound (int): The position of the first I/O bound Filter in the plan.
+            workers (int): The number of threads to use.
+
+        Returns:
+            Iterator[Tuple[Item, Optional[Filter], List[FilterCheck]]]: Each Item, the Filter
+                it failed if any, and the checks performed for it.
+        """
+
+        end_io_bound = first_io_bound
+        while end_io_bound < len(plan) and plan[end_io_bound][1].is_io_bound():
+            end_io_bound += 1
+        head, threaded = plan[:first_io_bound], plan[first_io_bound:end_io_bound]
+        tail = plan[end_io_bound:]
+        window = workers * 4
+        pending: Deque[Tuple[Item, Optional[Filter], List[FilterCheck], Optional[Future]]] = deque()
+
+        def resolve() -> Tuple[Item, Optional[Filter], List[FilterCheck]]:
+            item, invalid_filter, checks, future = pending.popleft()
+            if future is None:
+                return item, invalid_filter, checks
+            invalid_filter, threaded_checks = future.result()
+            checks = checks + threaded_checks
+            if invalid_filter is None and tail:
+                invalid_filter, tail_checks = check_filters(tail, item)
+                checks.extend(tail_checks)
+            return item, invalid_filter, checks
+
+        executor = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="autotransform_filter"
+        )
+        try:
+            for item in items:
+                invalid_filter, checks = check_filters(head, item)
+                future = None
+                if invalid_filter is None:
+                    future = executor.submit(check_filters, threaded, item)
+                pending.append((item, invalid_filter, checks, future))
+                while pending and (
+                    len(pending) > window or pending[0][3] is None or pending[0][3].done()
+                ):
+                    yield resolve()
+            while pending:
+                yield resolve()
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
 
     def get_batches(self, items: List[Item]) -> List[Batch]:
-        """Runs the Input to get eligible Items, filters them, then batches them.
-        Note: this function is not thread safe.
+        """Batches the supplied Items. Note: this function is not thread safe.
 
         Args:
             items (List[Item]): The Items to batch.
@@ -133,27 +361,44 @@ class AutoTransformSchema(ComponentModel):
             List[Batch]: The Batches for the change
         """
 
+        return list(self.iter_batches(items))
+
+    def iter_batches(self, items: Iterable[Item]) -> Iterator[Batch]:
+        """Lazily batches Items as they are produced, only pulling as many Items as the Batcher
+        needs to create the next Batch. Note: this function is not thread safe.
+
+        Args:
+            items (Iterable[Item]): The Items to batch.
+
+        Returns:
+            Iterator[Batch]: The Batches for the change.
+        """
+
+        previous_schema = autotransform.schema.current
         autotransform.schema.current = self
         event_handler = EventHandler.get()
         event_handler.handle(VerboseEvent({"message": "Begin get_batches"}))
 
         # Batch Items
         event_handler.handle(VerboseEvent({"message": "Begin batching"}))
-        batches = self.batcher.batch(items)
-        encodable_batches = [
-            {"items": [item.bundle() for item in batch["items"]], "metadata": batch["metadata"]}
-            for batch in batches
-        ]
-        event_handler.handle(VerboseEvent({"message": f"Num Batches: {len(batches)}"}))
-        event_handler.handle(DebugEvent({"message": f"Batches: {json.dumps(encodable_batches)}"}))
-        autotransform.schema.current = None
-
-        return batches
+        num_batches = 0
+        batches = profile_iter(
+            f"batcher {self.batcher.name.value}", self.batcher.iter_batches(items)
+        )
+        for batch in batches:
+            num_batches += 1
+            if event_handler.is_enabled(LoggingLevel.DEBUG):
+                event_handler.handle(DebugEvent({"message": f"Batch: {_encode_batch(batch)}"}))
+            yield batch
+        event_handler.handle(VerboseEvent({"message": f"Num Batches: {num_batches}"}))
+        autotransform.schema.current = previous_schema
 
     def execute_batch(self, batch: Batch, change: Optional[Change] = None) -> bool:
         """Executes changes for a batch, including setting up the Repo, running the Transformer,
         checking all Validators, running Commands, submitting changes if present, and rewinding
-        the Repo if changes are submitted. Note: this function is not thread safe.
+        the Repo if changes are submitted. Files changed by the Transformer are recorded in the
+        WRITE_JOURNAL, and content cached for written files is released once the batch completes.
+        Note: this function is not thread safe.
 
         Args:
             batch (Batch): The Batch to execute.
@@ -166,29 +411,55 @@ class AutoTransformSchema(ComponentModel):
             bool: Whether the batch triggered a submission.
         """
 
+        previous_schema = autotransform.schema.current
         autotransform.schema.current = self
+        try:
+            return self._execute_batch(batch, change)
+        finally:
+            WRITE_JOURNAL.untrack()
+            FILE_CACHE.release_dirty()
+            autotransform.schema.current = previous_schema
+
+    def _execute_batch(self, batch: Batch, change: Optional[Change]) -> bool:
+        """Executes changes for a batch, see execute_batch.
+
+        Args:
+            batch (Batch): The Batch to execute.
+            change (Optional[Change]): An associated Change that is being updated.
+
+        Raises:
+            ValidationError: If one of the Schema's Validators fails raises an exception.
+
+        Returns:
+            bool: Whether the batch triggered a submission.
+        """
+
         event_handler = EventHandler.get()
-        encodable_batch = {
-            "items": [item.bundle() for item in batch["items"]],
-            "metadata": batch["metadata"],
-        }
         event_handler.handle(
             VerboseEvent(
                 {"message": f"Handling Batch: {batch['title']} with {len(batch['items'])} items"}
             )
         )
-        event_handler.handle(DebugEvent({"message": f"Full Batch: {json.dumps(encodable_batch)}"}))
+        event_handler.handle(DebugEvent({"message": lambda: f"Full Batch: {_encode_batch(batch)}"}))
 
         # Make sure repo is clean before executing
         if self.repo is not None:
             event_handler.handle(VerboseEvent({"message": "Clean repo"}))
-            self.repo.rewind(batch)
-            if change is None and self.repo.has_outstanding_change(batch):
-                event_handler.handle(BatchSkipEvent({"batch": batch}))
-                return False
+            with profile("repo rewind"):
+                self.repo.rewind(batch)
+            if change is None:
+                with profile("repo has_outstanding_change"):
+                    has_outstanding_change = self.repo.has_outstanding_change(batch)
+                if has_outstanding_change:
+                    event_handler.handle(BatchSkipEvent({"batch": batch}))
+                    return False
 
         # Execute transformation
-        result = self.transformer.transform(batch)
+        WRITE_JOURNAL.start()
+        with profile(f"transformer {self.transformer.name.value}", len(batch["items"])):
+            result = self.transformer.transform(batch)
+        if not self.transformer.tracks_writes:
+            WRITE_JOURNAL.untrack()
 
         # Run pre-validation commands
         pre_validation_commands = [
@@ -196,11 +467,15 @@ class AutoTransformSchema(ComponentModel):
         ]
         for command in pre_validation_commands:
             event_handler.handle(VerboseEvent({"message": f"Running command {command}"}))
-            command.run(batch, result)
+            with profile(f"command {command.name.value}", len(batch["items"])):
+                command.run(batch, result)
+            # Commands may write files directly
+            WRITE_JOURNAL.untrack()
 
         # Validate the changes
         for validator in self.validators:
-            validation_result = validator.check(batch, result)
+            with profile(f"validator {validator.name.value}", len(batch["items"])):
+                validation_result = validator.check(batch, result)
             event_handler.handle(
                 VerboseEvent({"message": f"Validation Result: {validation_result}"})
             )
@@ -217,41 +492,158 @@ class AutoTransformSchema(ComponentModel):
         ]
         for command in post_validation_commands:
             event_handler.handle(VerboseEvent({"message": f"Running command {command}"}))
-            command.run(batch, result)
+            with profile(f"command {command.name.value}", len(batch["items"])):
+                command.run(batch, result)
+            # Commands may write files directly
+            WRITE_JOURNAL.untrack()
 
-        submitted = False
         # Handle repo state, submitting changes if present and reseting the repo
-        if self.repo is not None:
-            event_handler.handle(VerboseEvent({"message": "Checking for changes"}))
-            if self.repo.has_changes(batch):
-                event_handler.handle(VerboseEvent({"message": "Changes found"}))
-                event_handler.handle(BatchSubmitEvent({"batch": batch}))
-                self.repo.submit(batch, result, change=change)
-                event_handler.handle(VerboseEvent({"message": "Rewinding repo"}))
-                self.repo.rewind(batch)
-                submitted = True
-            else:
-                if change is not None:
-                    event_handler.handle(
-                        VerboseEvent({"message": "No changes in update, abandoning"})
-                    )
-
-                    change.abandon()
-                event_handler.handle(BatchNoChangesEvent({"batch": batch}))
+        submitted = self.repo is not None and self._submit_changes(batch, result, change)
         event_handler.handle(VerboseEvent({"message": "Finish batch"}))
-        autotransform.schema.current = None
         return submitted
 
+    def _submit_changes(
+        self, batch: Batch, result: Optional[Mapping[str, Any]], change: Optional[Change]
+    ) -> bool:
+        """Submits the changes made for a Batch and rewinds the Repo. Without changes, abandons the
+        associated Change or records the Items for incremental runs.
+
+        Args:
+            batch (Batch): The executed Batch.
+            result (Optional[Mapping[str, Any]]): Data from the transformation.
+            change (Optional[Change]): An associated Change that is being updated.
+
+        Returns:
+            bool: Whether changes were submitted.
+        """
+
+        assert self.repo is not None
+        event_handler = EventHandler.get()
+        event_handler.handle(VerboseEvent({"message": "Checking for changes"}))
+        with profile("repo has_changes"):
+            has_changes = self.repo.has_changes(batch)
+        if has_changes:
+            event_handler.handle(VerboseEvent({"message": "Changes found"}))
+            event_handler.handle(BatchSubmitEvent({"batch": batch}))
+            with profile("repo submit"):
+                self.repo.submit(batch, result, change=change)
+            event_handler.handle(VerboseEvent({"message": "Rewinding repo"}))
+            with profile("repo rewind"):
+                self.repo.rewind(batch)
+            return True
+
+        if change is not None:
+            event_handler.handle(VerboseEvent({"message": "No changes in update, abandoning"}))
+            with profile("change abandon"):
+                change.abandon()
+        elif self.config.incremental:
+            with profile("incremental record", len(batch["items"])):
+                with self._get_item_state_store() as store:
+                    store.record(batch["items"])
+        event_handler.handle(BatchNoChangesEvent({"batch": batch}))
+        return False
+
     def run(self):
-        """Fully run a given Schema including getting and executing all Batches.
-        Note: this function is not thread safe."""
+        """Fully run a given Schema including getting and executing all Batches. With a Repo, or
+        a Filter that reads files, every Item is gathered and checked before any Batch changes
+        the tree. Otherwise Items are produced lazily. Batches are always produced lazily, so
+        Batchers that support streaming stop once the maximum number of submissions is reached.
+        If the config sets max_workers, Batches are executed in parallel worker processes. If the
+        config enables incremental runs, Items transformed with no changes by a previous run are
+        skipped. Once every Batch is executed successfully, the Input records the run.
+        Persistent workers started by script based components are stopped once the run ends,
+        even if it fails. Note: this function is not thread safe."""
 
         autotransform.schema.current = self
+        try:
+            items = self.iter_items()
+            if self.config.incremental:
+                items = self._skip_unchanged_items(items)
+            if self.repo is not None or any(
+                filt.get_cost() > FilterCost.KEY for filt in self.filters
+            ):
+                # Inputs and Filters must see the tree before Batches change it or switch branches
+                items = iter(list(items))
+            batches: Iterable[Batch] = self.iter_batches(items)
+            if self.config.max_workers is not None and self.config.max_workers > 1:
+                # Every Batch must be checked before workers can be used
+                batch_list = list(batches)
+                if self._can_run_parallel(batch_list):
+                    # Stages within worker processes are not profiled individually
+                    with profile("parallel batches", len(batch_list)):
+                        completed = self._run_parallel(batch_list)
+                else:
+                    completed = self._run_sequential(batch_list)
+            else:
+                completed = self._run_sequential(batches)
+            if completed:
+                self.input.record_run()
+        finally:
+            shutdown_workers()
+            autotransform.schema.current = None
+        EventHandler.get().handle(
+            VerboseEvent({"message": lambda: f"File cache: {FILE_CACHE.get_stats()}"})
+        )
+
+    def _get_item_state_store(self) -> ItemStateStore:
+        """Gets the store of Items transformed with no changes. The Schema's config only
+        controls how the Schema runs, so it is excluded from the Schema's fingerprint.
+
+        Returns:
+            ItemStateStore: The store for the Schema.
+        """
+
+        return ItemStateStore(
+            os.path.join(get_config().get_cache_directory(), ITEM_STATE_FILE_NAME),
+            self.config.schema_name,
+            {key: value for key, value in self.bundle().items() if key != "config"},
+        )
+
+    def _skip_unchanged_items(self, items: Iterable[Item]) -> Iterator[Item]:
+        """Skips FileItems that a previous run transformed with no changes, where neither the
+        file nor the Schema has changed since.
+
+        Args:
+            items (Iterable[Item]): The Items to check.
+
+        Returns:
+            Iterator[Item]: The Items that need to be transformed.
+        """
+
+        event_handler = EventHandler.get()
+        num_skipped = 0
+        with self._get_item_state_store() as store:
+            for item in items:
+                if isinstance(item, FileItem):
+                    with profile("incremental check", 1):
+                        is_unchanged = store.is_unchanged(item)
+                    if is_unchanged:
+                        num_skipped += 1
+                        continue
+                yield item
+        event_handler.handle(VerboseEvent({"message": f"Skipped unchanged Items: {num_skipped}"}))
+
+    def _run_sequential(self, batches: Iterable[Batch]) -> bool:
+        """Executes Batches one at a time until the maximum number of submissions is reached.
+        No further Batches are pulled once the maximum is reached.
+
+        Args:
+            batches (Iterable[Batch]): The Batches to execute.
+
+        Returns:
+            bool: Whether every Batch was executed successfully.
+        """
+
         event_handler = EventHandler.get()
-        items = self.get_items()
-        batches = self.get_batches(items)
         num_submissions = 0
+        completed = True
         for batch in batches:
+            try:
+                if self.execute_batch(batch):
+                    num_submissions += 1
+            except Exception as e:  # pylint: disable=broad-except
+                event_handler.handle(BatchExecutionFailedEvent({"batch": batch, "error": e}))
+                completed = False
             if (
                 self.config.max_submissions is not None
                 and num_submissions >= self.config.max_submissions
@@ -259,13 +651,102 @@ class AutoTransformSchema(ComponentModel):
                 event_handler.handle(
                     VerboseEvent({"message": f"Max submissions reached: {num_submissions}"})
                 )
-                break
-            try:
-                if self.execute_batch(batch):
-                    num_submissions += 1
-            except Exception as e:  # pylint: disable=broad-except
-                event_handler.handle(BatchExecutionFailedEvent({"batch": batch, "error": e}))
-        autotransform.schema.current = None
+                return False
+        return completed
+
+    def _can_run_parallel(self, batches: List[Batch]) -> bool:
+        """Checks whether Batches can be executed by parallel workers. Workers execute Batches
+        in separate git worktrees, so the Repo must be a GitRepo and Items with absolute paths
+        can not be used.
+
+        Args:
+            batches (List[Batch]): The Batches to execute.
+
+        Returns:
+            bool: Whether the Batches can be executed in parallel.
+        """
+
+        if self.config.max_workers is None or self.config.max_workers < 2 or len(batches) < 2:
+            return False
+
+        if not isinstance(self.repo, GitRepo):
+            message = "Parallel Batches require a GitRepo for worktrees, running serially"
+        elif any(
+            isinstance(item, FileItem) and os.path.isabs(item.get_path())
+            for batch in batches
+            for item in batch["items"]
+        ):
+            message = "Items with absolute paths can not use worktrees, running serially"
+        else:
+            return True
+        EventHandler.get().handle(WarningEvent({"message": message}))
+        return False
+
+    def _run_parallel(self, batches: List[Batch]) -> bool:
+        """Executes Batches using a pool of worker processes, each executing its Batches in a
+        separate git worktree of the GitRepo. Batches are only dispatched while
+        the number of submissions plus running Batches is below the maximum number of submissions.
+
+        Args:
+            batches (List[Batch]): The Batches to execute.
+
+        Returns:
+            bool: Whether every Batch was executed successfully.
+        """
+
+        assert self.config.max_workers is not None and isinstance(self.repo, GitRepo)
+        event_handler = EventHandler.get()
+        max_submissions = self.config.max_submissions
+        worktree_root = tempfile.mkdtemp(prefix="autotransform_worktrees_")
+        event_handler.handle(
+            VerboseEvent({"message": f"Running batches with {self.config.max_workers} workers"})
+        )
+
+        num_submissions = 0
+        num_executed = 0
+        completed = True
+        remaining_batches = iter(batches)
+        pending: Dict[Future, Batch] = {}
+        try:
+            with ProcessPoolExecutor(
+                max_workers=self.config.max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_initialize_worker,
+                initargs=(self.bundle(), event_handler.get_logging_level(), worktree_root),
+            ) as executor:
+                while True:
+                    while len(pending) < self.config.max_workers and (
+                        max_submissions is None or num_submissions + len(pending) < max_submissions
+                    ):
+                        batch = next(remaining_batches, None)
+                        if batch is None:
+                            break
+                        pending[executor.submit(_execute_worker_batch, batch)] = batch
+                    if not pending:
+                        break
+
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        batch = pending.pop(future)
+                        num_executed += 1
+                        try:
+                            if future.result():
+                                num_submissions += 1
+                        except Exception as e:  # pylint: disable=broad-except
+                            event_handler.handle(
+                                BatchExecutionFailedEvent({"batch": batch, "error": e})
+                            )
+                            completed = False
+
+                if max_submissions is not None and num_submissions >= max_submissions:
+                    event_handler.handle(
+                        VerboseEvent({"message": f"Max submissions reached: {num_submissions}"})
+                    )
+        finally:
+            for worktree in os.listdir(worktree_root):
+                self.repo.remove_worktree(os.path.join(worktree_root, worktree))
+            shutil.rmtree(worktree_root, ignore_errors=True)
+        return completed and num_executed == len(batches)
 
     @staticmethod
     def from_data(data: Dict[str, Any]) -> AutoTransformSchema:
@@ -401,3 +882,92 @@ class AutoTransformSchema(ComponentModel):
             commands=commands,
             repo=repo,
         )
+
+
+def _encode_items(items: Sequence[Item]) -> str:
+    """Builds a readable representation of Items for logging.
+
+    Args:
+        items (Sequence[Item]): The Items to represent.
+
+    Returns:
+        str: The representation of the Items.
+    """
+
+    return "\n".join([f"{item!r}," for item in items])
+
+
+def _encode_batch(batch: Batch) -> str:
+    """Builds a JSON representation of a Batch for logging.
+
+    Args:
+        batch (Batch): The Batch to represent.
+
+    Returns:
+        str: The JSON encoded Batch.
+    """
+
+    return json.dumps(
+        {"items": [item.bundle() for item in batch["items"]], "metadata": batch.get("metadata")}
+    )
+
+
+_WORKER_SCHEMA: Optional[AutoTransformSchema] = None
+
+
+def _initialize_worker(
+    schema_data: Dict[str, Any], logging_level: LoggingLevel, worktree_root: str
+) -> None:
+    """Sets up a worker process for parallel Batch execution. The worker creates its own
+    worktree within the worktree root and executes all Batches from the directory in the
+    worktree matching the current directory, so that relative keys refer to the same files.
+
+    Args:
+        schema_data (Dict[str, Any]): The bundled Schema the worker executes Batches for.
+        logging_level (LoggingLevel): The logging level to use for the worker's events.
+        worktree_root (str): The directory to create the worker's worktree in.
+    """
+
+    # pylint: disable=global-statement
+
+    global _WORKER_SCHEMA
+    EventHandler.get().set_logging_level(logging_level)
+    schema = AutoTransformSchema.from_data(schema_data)
+    assert isinstance(schema.repo, GitRepo)
+    subpath = os.path.relpath(
+        os.path.realpath(os.getcwd()), os.path.realpath(schema.repo.get_root())
+    )
+    worktree = os.path.join(worktree_root, f"worker_{os.getpid()}")
+    schema.repo.add_worktree(worktree)
+    worktree_cwd = os.path.normpath(os.path.join(worktree, subpath))
+    # Directories without tracked files are not present in the worktree
+    os.makedirs(worktree_cwd, exist_ok=True)
+    os.chdir(worktree_cwd)
+    # Rebuild the Schema so that cached repo state points to the worktree
+    schema = AutoTransformSchema.from_data(schema_data)
+    _WORKER_SCHEMA = schema
+
+
+def _execute_worker_batch(batch: Batch) -> bool:
+    """Executes a Batch within a worker process.
+
+    Args:
+        batch (Batch): The Batch to execute.
+
+    Raises:
+        Exception: Raised if execution fails. The original error is raised when it can be
+            pickled to return it to the parent process, otherwise a RuntimeError describing it.
+
+    Returns:
+        bool: Whether the Batch triggered a submission.
+    """
+
+    assert _WORKER_SCHEMA is not None
+    try:
+        return _WORKER_SCHEMA.execute_batch(batch)
+    except Exception as err:  # pylint: disable=broad-except
+        try:
+            pickle.loads(pickle.dumps(err))
+        except Exception:  # pylint: disable=broad-except
+            raise RuntimeError(f"{type(err).__name__}: {err}") from None
+        raise
@@ -18,7 +18,7 @@ from autotransform.config import get_config
 from autotransform.event.debug import DebugEvent
 from autotransform.event.handler import EventHandler
 from autotransform.event.logginglevel import LoggingLevel
-from autotransform.event.run import RunEvent, RunFailedEvent
+from autotransform.event.run import RunEvent, RunFailedEvent, RunProfileEvent
 from autotransform.event.runner import RunnerFailedEvent
 from autotransform.event.verbose import VerboseEvent
 from autotransform.filter.base import FACTORY as filter_factory
@@ -26,8 +26,11 @@ from autotransform.runner.base import Runner
 from autotransform.runner.local import LocalRunner
 from autotransform.schema.builder import FACTORY as schema_builder_factory
 from autotransform.schema.schema import AutoTransformSchema
+from autotransform.util.profiler import Profiler, set_profiler
 from autotransform.util.schema_map import SchemaMap
 
+DEFAULT_PROFILE_PATH = "autotransform_profile.json"
+
 
 def add_args(parser: ArgumentParser) -> None:
     """Adds the args to a subparser that are required to run a schema.
@@ -58,6 +61,23 @@ def add_args(parser: ArgumentParser) -> None:
         help="An override to the maximum submissions a schema can produce.",
     )
 
+    parser.add_argument(
+        "--max-workers",
+        metavar="max_workers",
+        type=int,
+        help="An override to the maximum number of worker processes used to execute batches.",
+    )
+
+    parser.add_argument(
+        "--profile",
+        metavar="profile",
+        type=str,
+        nargs="?",
+        const=DEFAULT_PROFILE_PATH,
+        help="Profiles each stage of a local run, logging a summary and writing a JSON report to "
+        + f"the supplied path. Defaults to {DEFAULT_PROFILE_PATH}.",
+    )
+
     logging_level = parser.add_mutually_exclusive_group()
     logging_level.add_argument(
         "-v",
@@ -190,6 +210,9 @@ def run_command_main(args: Namespace) -> None:
     if args.max_submissions:
         schema.config.max_submissions = args.max_submissions
 
+    if args.max_workers:
+        schema.config.max_workers = args.max_workers
+
     event_handler.handle(VerboseEvent({"message": f"Decoded Schema: {schema!r}"}))
 
     event_handler.handle(RunEvent({"schema": schema}))
@@ -208,6 +231,8 @@ def run_command_main(args: Namespace) -> None:
             assert config_runner is not None
             runner = config_runner
 
+        profiler = Profiler() if args.profile else None
+        set_profiler(profiler)
         try:
             runner.run(schema)
         except Exception as e:  # pylint: disable=broad-except
@@ -215,6 +240,13 @@ def run_command_main(args: Namespace) -> None:
                 RunnerFailedEvent({"message": f"Failed run: {e}", "runner": runner})
             )
             raise e
+        finally:
+            if profiler is not None:
+                set_profiler(None)
+                event_handler.handle(
+                    RunProfileEvent({"schema": schema, "table": profiler.get_table()})
+                )
+                profiler.write_report(args.profile)
     except Exception as e:  # pylint: disable=broad-except
         event_handler.handle(RunFailedEvent({"schema": schema, "error": e}))
         raise e
@@ -37,9 +37,13 @@ class Transformer(Generic[TResult], NamedComponent):
 
     Attributes:
         name (ClassVar[TransformerName]): The name of the component.
+        tracks_writes (ClassVar[bool]): Whether all files are written through CachedFile, so
+            that changed files can be found using the WRITE_JOURNAL. Transformers opt in, as
+            files written any other way would not be found. Defaults to False.
     """
 
     name: ClassVar[TransformerName]
+    tracks_writes: ClassVar[bool] = False
 
     @abstractmethod
     def transform(self, batch: Batch) -> TResult:
@@ -20,6 +20,7 @@ from autotransform.item.base import Item
 from autotransform.item.file import FileItem
 from autotransform.transformer.base import TransformerName
 from autotransform.transformer.single import SingleTransformer
+from autotransform.util.cachedfile import FILE_CACHE, WRITE_JOURNAL
 
 
 class JSCodeshiftTransformer(SingleTransformer):
@@ -51,13 +52,18 @@ class JSCodeshiftTransformer(SingleTransformer):
 
         # Run JSCodeshift
         event_handler.handle(VerboseEvent({"message": f"Running command: {cmd}"}))
-        proc = subprocess.run(
-            cmd,
-            capture_output=True,
-            encoding="utf-8",
-            check=False,
-            timeout=self.timeout,
-        )
+        try:
+            proc = subprocess.run(
+                cmd,
+                capture_output=True,
+                encoding="utf-8",
+                check=False,
+                timeout=self.timeout,
+            )
+        finally:
+            # JSCodeshift writes the file directly, bypassing the file cache
+            FILE_CACHE.invalidate()
+            WRITE_JOURNAL.untrack()
 
         stdout = proc.stdout.strip()
         stderr = proc.stderr.strip()
@@ -42,12 +42,15 @@ class LibCSTTransformer(SingleTransformer):
         command_name (str): The name of the class for the CodemodCommand.
         command_args (optional, Dict[str, Any]): Arguments for the CodemodCommand. Defaults to {}.
         name (ClassVar[TransformerName]): The name of the component.
+        tracks_writes (ClassVar[bool]): Whether all files are written through CachedFile. True,
+            as files are written with FileItem.write_content.
     """
 
     command_module: str
     command_name: str
     command_args: Dict[str, Any] = Field(default_factory=dict)
     name: ClassVar[TransformerName] = TransformerName.LIBCST
+    tracks_writes: ClassVar[bool] = True
 
     def _transform_item(self, item: Item) -> None:
         """Run the supplied CodemodCommand against a FileItem.
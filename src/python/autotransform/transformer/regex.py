@@ -27,12 +27,15 @@ class RegexTransformer(SingleTransformer):
         pattern (str): The pattern to search for.
         replacement (str): The value to replace the pattern with.
         name (ClassVar[TransformerName]): The name of the component.
+        tracks_writes (ClassVar[bool]): Whether all files are written through CachedFile. True,
+            as files are written with FileItem.write_content.
     """
 
     pattern: str
     replacement: str
 
     name: ClassVar[TransformerName] = TransformerName.REGEX
+    tracks_writes: ClassVar[bool] = True
 
     def _transform_item(self, item: Item) -> None:
         """Replaces all instances of a pattern in the file with the replacement string.
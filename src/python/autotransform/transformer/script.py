@@ -16,6 +16,7 @@ from typing import Any, ClassVar, Dict, List, Optional
 from autotransform.batcher.base import Batch
 from autotransform.transformer.base import Transformer, TransformerName
 from autotransform.util.functions import run_cmd_on_items
+from autotransform.util.worker import run_worker_on_items
 from pydantic import root_validator, validator
 
 
@@ -44,6 +45,10 @@ class ScriptTransformer(Transformer[None]):
         timeout (int): The timeout to use for the script process.
         chunk_size (Optional[int], optional): The size of chunks to operate on. None indicates no
             chunking. Defaults to None.
+        persistent (bool, optional): Whether to send each run to a persistent worker that is
+            started once, rather than starting the script for every run. Sentinel arguments
+            are supplied as fields of each request, see autotransform.util.worker for the
+            protocol. Defaults to False.
         name (ClassVar[TransformerName]): The name of the Component.
     """
 
@@ -51,6 +56,7 @@ class ScriptTransformer(Transformer[None]):
     script: str
     timeout: int
     chunk_size: Optional[int] = None
+    persistent: bool = False
 
     name: ClassVar[TransformerName] = TransformerName.SCRIPT
 
@@ -120,5 +126,6 @@ class ScriptTransformer(Transformer[None]):
             cmd = [self.script]
             cmd.extend(self.args)
 
-            proc = run_cmd_on_items(cmd, chunk_items, metadata, timeout=self.timeout)
+            run = run_worker_on_items if self.persistent else run_cmd_on_items
+            proc = run(cmd, chunk_items, metadata, timeout=self.timeout)
             proc.check_returncode()
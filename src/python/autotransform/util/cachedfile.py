@@ -10,23 +10,528 @@
 """CachedFile is a utility class used by AutoTransform to cache file content on read/write to
 reduce excessive file reads and speed up processing. The FILE_CACHE variable stores cached
 file contents, while a CachedFile object is used to interact with the cache. All writes
-should go through the CachedFile object to ensure the cache is properly updated."""
+should go through the CachedFile object to ensure the cache is properly updated. The cache is
+bounded by the file_cache_size setting of the Config and is safe to fill from multiple
+threads. Cached content is validated against the stat metadata of the file after
+FILE_CACHE.invalidate is called, which is done after subprocesses and Repo resets. Binary files
+and files at or above the file_mmap_threshold setting of the Config can be searched as bytes
+without being cached, as can any file using CachedFile.scan. The WRITE_JOURNAL records which
+files were changed during a Batch."""
 
+import mmap
+import os
+import sys
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from functools import lru_cache
+from hashlib import sha256
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Dict, Iterator, List, Optional, Pattern, Sequence, Tuple, TypedDict, Union
 
+from autotransform.config import get_config
 from autotransform.event.handler import EventHandler
 from autotransform.event.util import RevertFileEvent
+from autotransform.util.regex import compile_text_and_bytes, get_required_literal
 
-FILE_CACHE: Dict[str, str] = {}
+DEFAULT_FILE_CACHE_SIZE = 1024 * 1024 * 1024
+DEFAULT_FILE_MMAP_THRESHOLD = 8 * 1024 * 1024
+
+# Files with a NUL byte in this many leading bytes are treated as binary, matching git
+BINARY_SNIFF_SIZE = 8000
+
+
+# Files are identified by their modification time, size and inode when validating cached content
+StatTag = Tuple[int, int, int]
+
+
+def get_stat_tag(path: str) -> Optional[StatTag]:
+    """Gets the stat metadata used to check whether a file has changed since it was cached.
+
+    Args:
+        path (str): The path of the file.
+
+    Returns:
+        Optional[StatTag]: The modification time in nanoseconds, size and inode of the file,
+            None if the file can not be stat'd.
+    """
+
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size, stat.st_ino
+
+
+class FileCacheStats(TypedDict):
+    """Statistics about the usage of a FileCache."""
+
+    hits: int
+    misses: int
+    evictions: int
+    invalidations: int
+    entries: int
+    dirty_entries: int
+    size: int
+    max_size: int
+
+
+class _CacheEntry:  # pylint: disable=too-few-public-methods
+    """Cached content of a file along with the metadata used to validate it.
+
+    Attributes:
+        content (str): The content of the file.
+        epoch (int): The epoch of the cache when the entry was last validated.
+        size (int): The bytes of memory used by the content.
+        tag (Optional[StatTag]): The stat metadata of the file when the content was cached.
+    """
+
+    __slots__ = ("content", "epoch", "size", "tag")
+
+    content: str
+    epoch: int
+    size: int
+    tag: Optional[StatTag]
+
+    def __init__(self, content: str, tag: Optional[StatTag], epoch: int):
+        """A simple constructor.
+
+        Args:
+            content (str): The content of the file.
+            tag (Optional[StatTag]): The stat metadata of the file when the content was cached.
+            epoch (int): The epoch of the cache when the content was cached.
+        """
+
+        self.content = content
+        self.epoch = epoch
+        self.size = sys.getsizeof(content)
+        self.tag = tag
+
+
+class FileCache:
+    """A least recently used cache of file contents, bounded by the memory used by the cached
+    content. Dirty entries, which hold content written by a Transformer, are pinned in the cache
+    until released once their Batch completes. Safe to use from multiple threads.
+
+    Entries are tagged with the stat metadata of their file. Calling invalidate, which is done
+    after anything that may write files without going through the cache such as subprocesses
+    and Repo resets, starts a new epoch. The first lookup of an entry in a new epoch checks the
+    metadata of the file and drops the entry if the file has changed.
+
+    Attributes:
+        evictions (int): The number of entries evicted to stay within the maximum size.
+        hits (int): The number of lookups that found cached content.
+        invalidations (int): The number of entries dropped because their file changed.
+        misses (int): The number of lookups that did not find cached content.
+        _dirty (Dict[str, _CacheEntry]): The pinned content of written files.
+        _entries (OrderedDict[str, _CacheEntry]): The content of read files, least recently
+            used first.
+        _epoch (int): Incremented when files may have changed outside of the cache.
+        _lock (threading.Lock): A lock guarding the cache.
+        _max_size (Optional[int]): The maximum bytes of content to cache. If None, the
+            file_cache_size setting of the Config is used.
+        _size (int): The bytes of content currently cached.
+    """
+
+    # pylint: disable=too-many-instance-attributes
+
+    evictions: int
+    hits: int
+    invalidations: int
+    misses: int
+    _dirty: Dict[str, _CacheEntry]
+    _entries: OrderedDict[str, _CacheEntry]
+    _epoch: int
+    _lock: threading.Lock
+    _max_size: Optional[int]
+    _size: int
+
+    def __init__(self, max_size: Optional[int] = None):
+        """A simple constructor.
+
+        Args:
+            max_size (Optional[int], optional): The maximum bytes of content to cache. If None,
+                the file_cache_size setting of the Config is used. Defaults to None.
+        """
+
+        self.evictions = 0
+        self.hits = 0
+        self.invalidations = 0
+        self.misses = 0
+        self._dirty = {}
+        self._entries = OrderedDict()
+        self._epoch = 0
+        self._lock = threading.Lock()
+        self._max_size = max_size
+        self._size = 0
+
+    def __contains__(self, path: str) -> bool:
+        with self._lock:
+            return path in self._dirty or path in self._entries
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._dirty) + len(self._entries)
+
+    def get_max_size(self) -> int:
+        """Gets the maximum bytes of content to cache, resolving it from the Config on first use.
+
+        Returns:
+            int: The maximum bytes of content to cache.
+        """
+
+        if self._max_size is None:
+            self._max_size = get_config().file_cache_size or DEFAULT_FILE_CACHE_SIZE
+        return self._max_size
+
+    def set_max_size(self, max_size: Optional[int]) -> None:
+        """Sets the maximum bytes of content to cache, evicting entries if needed.
+
+        Args:
+            max_size (Optional[int]): The maximum bytes of content to cache. If None, the
+                file_cache_size setting of the Config is used.
+        """
+
+        with self._lock:
+            self._max_size = max_size
+            self._evict()
+
+    def invalidate(self) -> None:
+        """Marks all entries as needing validation against the metadata of their file before
+        they are next used. Called after files may have been changed outside of the cache."""
+
+        with self._lock:
+            self._epoch += 1
+
+    def get(self, path: str) -> Optional[str]:
+        """Gets the cached content of a file, marking it as recently used. Entries not validated
+        since the last call to invalidate are checked against the metadata of the file.
+
+        Args:
+            path (str): The path of the file.
+
+        Returns:
+            Optional[str]: The cached content, None if the file is not cached or has changed.
+        """
+
+        with self._lock:
+            entry = self._get_entry(path)
+            if entry is None or entry.epoch == self._epoch:
+                return self._record_lookup(entry)
+            epoch = self._epoch
+
+        # Stat outside the lock so lookups of other files are not blocked on the file system
+        tag = get_stat_tag(path)
+        with self._lock:
+            if self._get_entry(path) is not entry:
+                entry = self._get_entry(path)
+                return self._record_lookup(entry)
+            if entry.tag != tag:
+                self._remove(path)
+                self.invalidations += 1
+                return self._record_lookup(None)
+            entry.epoch = max(entry.epoch, epoch)
+            return self._record_lookup(entry)
+
+    def add(self, path: str, content: str, tag: Optional[StatTag] = None) -> str:
+        """Caches content read from a file. If the file was cached concurrently, the cached
+        content is kept. Content larger than the maximum size is not cached.
+
+        Args:
+            path (str): The path of the file.
+            content (str): The content of the file.
+            tag (Optional[StatTag], optional): The stat metadata of the file, taken before the
+                content was read. Defaults to None.
+
+        Returns:
+            str: The cached content of the file.
+        """
+
+        with self._lock:
+            cached = self._get_entry(path)
+            if cached is not None:
+                return cached.content
+            entry = _CacheEntry(content, tag, self._epoch)
+            if entry.size > self.get_max_size():
+                return content
+            self._entries[path] = entry
+            self._size += entry.size
+            self._evict()
+            return content
+
+    def add_dirty(self, path: str, content: str, tag: Optional[StatTag] = None) -> None:
+        """Caches content written to a file, pinning it until release_dirty is called.
+
+        Args:
+            path (str): The path of the file.
+            content (str): The new content of the file.
+            tag (Optional[StatTag], optional): The stat metadata of the file, taken after the
+                content was written. Defaults to None.
+        """
+
+        with self._lock:
+            self._remove(path)
+            entry = _CacheEntry(content, tag, self._epoch)
+            self._dirty[path] = entry
+            self._size += entry.size
+            self._evict()
+
+    def release_dirty(self) -> None:
+        """Drops all dirty entries. Called once a Batch completes, as written files may have
+        been reset by the Repo and later reads should see the files on disk."""
+
+        with self._lock:
+            for entry in self._dirty.values():
+                self._size -= entry.size
+            self._dirty.clear()
+
+    def pop(self, path: str, default: Optional[str] = None) -> Optional[str]:
+        """Removes a file from the cache.
+
+        Args:
+            path (str): The path of the file.
+            default (Optional[str], optional): The value to return if the file is not cached.
+                Defaults to None.
+
+        Returns:
+            Optional[str]: The removed content of the file.
+        """
+
+        with self._lock:
+            entry = self._remove(path)
+            return default if entry is None else entry.content
+
+    def clear(self) -> None:
+        """Removes all files from the cache, including dirty entries."""
+
+        with self._lock:
+            self._dirty.clear()
+            self._entries.clear()
+            self._size = 0
+
+    def get_stats(self) -> FileCacheStats:
+        """Gets statistics about the usage of the cache, for use in tuning its size.
+
+        Returns:
+            FileCacheStats: The statistics for the cache.
+        """
+
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "entries": len(self._dirty) + len(self._entries),
+                "dirty_entries": len(self._dirty),
+                "size": self._size,
+                "max_size": self.get_max_size(),
+            }
+
+    def _get_entry(self, path: str) -> Optional[_CacheEntry]:
+        """Gets the entry for a file, marking it as recently used. The lock must be held.
+
+        Args:
+            path (str): The path of the file.
+
+        Returns:
+            Optional[_CacheEntry]: The entry for the file, None if the file is not cached.
+        """
+
+        entry = self._dirty.get(path)
+        if entry is None:
+            entry = self._entries.get(path)
+            if entry is not None:
+                self._entries.move_to_end(path)
+        return entry
+
+    def _record_lookup(self, entry: Optional[_CacheEntry]) -> Optional[str]:
+        """Records a lookup in the statistics of the cache. The lock must be held.
+
+        Args:
+            entry (Optional[_CacheEntry]): The entry found by the lookup, if any.
+
+        Returns:
+            Optional[str]: The content of the entry, None if no entry was found.
+        """
+
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return entry.content
+
+    def _remove(self, path: str) -> Optional[_CacheEntry]:
+        """Removes a file from the cache. The lock must be held.
+
+        Args:
+            path (str): The path of the file.
+
+        Returns:
+            Optional[_CacheEntry]: The removed entry for the file.
+        """
+
+        entry = self._dirty.pop(path, None)
+        if entry is None:
+            entry = self._entries.pop(path, None)
+        if entry is not None:
+            self._size -= entry.size
+        return entry
+
+    def _evict(self) -> None:
+        """Evicts the least recently used clean entries until the cache is within its maximum
+        size. The lock must be held."""
+
+        max_size = self.get_max_size()
+        while self._size > max_size and self._entries:
+            _, entry = self._entries.popitem(last=False)
+            self._size -= entry.size
+            self.evictions += 1
+
+
+class WriteJournal:
+    """Records the files whose content was changed through CachedFile during a Batch, so that
+    changed files can be found without scanning the working tree. Files written back to their
+    original content are dropped from the journal. Once anything writes files outside of
+    CachedFile, such as a script, the journal is untracked until the next Batch starts and
+    callers must fall back to asking the Repo. Safe to use from multiple threads.
+
+    Attributes:
+        _changed (Dict[str, None]): The changed files, in the order they were first changed.
+        _lock (threading.Lock): A lock guarding the journal.
+        _tracked (bool): Whether all writes since the journal started went through CachedFile.
+    """
+
+    _changed: Dict[str, None]
+    _lock: threading.Lock
+    _tracked: bool
+
+    def __init__(self):
+        """A simple constructor."""
+
+        self._changed = {}
+        self._lock = threading.Lock()
+        self._tracked = False
+
+    def start(self) -> None:
+        """Clears the journal and starts tracking writes. Called when a Batch starts."""
+
+        with self._lock:
+            self._changed.clear()
+            self._tracked = True
+
+    def untrack(self) -> None:
+        """Marks the journal as incomplete, as files may have been written outside of
+        CachedFile."""
+
+        with self._lock:
+            self._tracked = False
+
+    def record(self, path: str, changed: bool) -> None:
+        """Records a write to a file.
+
+        Args:
+            path (str): The path of the file.
+            changed (bool): Whether the content of the file now differs from its original
+                content.
+        """
+
+        with self._lock:
+            if changed:
+                self._changed[path] = None
+            else:
+                self._changed.pop(path, None)
+
+    def get_changed_files(self) -> Optional[List[str]]:
+        """Gets the files changed since the journal started.
+
+        Returns:
+            Optional[List[str]]: The changed files, None if the journal is not tracking writes.
+        """
+
+        with self._lock:
+            return list(self._changed) if self._tracked else None
+
+
+FILE_CACHE = FileCache()
 ORIGINAL_FILE_CACHE: Dict[str, Optional[str]] = {}
+CACHE_LOCK = threading.Lock()
+WRITE_JOURNAL = WriteJournal()
+
+
+def get_mmap_threshold() -> int:
+    """Gets the size in bytes at or above which files are searched using mmap rather than
+    cached as text.
+
+    Returns:
+        int: The file_mmap_threshold setting of the Config, or the default if not set.
+    """
+
+    return get_config().file_mmap_threshold or DEFAULT_FILE_MMAP_THRESHOLD
+
+
+def _decode(buffer: Union[bytes, mmap.mmap]) -> str:
+    """Decodes a buffer of UTF-8 encoded bytes, replacing invalid bytes.
+
+    Args:
+        buffer (Union[bytes, mmap.mmap]): The buffer to decode.
+
+    Returns:
+        str: The decoded text.
+    """
+
+    return buffer[:].decode("UTF-8", errors="replace")
+
+
+@lru_cache(maxsize=256)
+def _get_required_bytes(pattern: str) -> Optional[bytes]:
+    """Gets a literal that every match of a pattern contains, encoded for searching bytes.
+
+    Args:
+        pattern (str): The regex pattern.
+
+    Returns:
+        Optional[bytes]: The UTF-8 encoded literal, None if the pattern has none or it contains
+            the replacement character, which invalid bytes are decoded as.
+    """
+
+    literal = get_required_literal(pattern) or ""
+    return literal.encode("UTF-8") if literal and "\ufffd" not in literal else None
+
+
+def _scan_buffer(
+    buffer: Union[bytes, mmap.mmap],
+    str_pattern: Pattern[str],
+    bytes_pattern: Optional[Pattern[bytes]],
+    literal: Optional[bytes],
+) -> bool:
+    """Checks whether a buffer of bytes contains a match for a pattern. Buffers without the
+    required literal are rejected first. The buffer is then searched with the bytes pattern if
+    there is one, otherwise it is decoded and searched as text.
+
+    Args:
+        buffer (Union[bytes, mmap.mmap]): The buffer to search.
+        str_pattern (Pattern[str]): The pattern for searching text.
+        bytes_pattern (Optional[Pattern[bytes]]): The pattern for searching bytes, if it finds
+            the same matches as searching text.
+        literal (Optional[bytes]): A literal that every match contains, if there is one.
+
+    Returns:
+        bool: Whether the buffer contains a match.
+    """
+
+    if literal is not None and buffer.find(literal) == -1:
+        return False
+    if bytes_pattern is not None:
+        return bytes_pattern.search(buffer) is not None
+    return str_pattern.search(_decode(buffer)) is not None
 
 
 class CachedFile:
 
     """A wrapper that allows accessing cached file contents. Content is stored in the
-    FILE_CACHE variable. Writing files outside the CachedFile write method can lead to
-    invalid cache data.
+    FILE_CACHE variable, which evicts the least recently used content. Files written outside
+    the CachedFile write method are only detected once FILE_CACHE.invalidate is called.
 
     Attributes:
         path (str): The path of the file being cached.
@@ -45,8 +550,8 @@ class CachedFile:
 
     @staticmethod
     def _read(path: str) -> str:
-        """A simple method to read the content of a file. Used as a hook for testing
-        purposes. Simply handles reading and does not interact with the cache.
+        """A simple method to read the UTF-8 encoded content of a file. Used as a hook for
+        testing purposes. Simply handles reading and does not interact with the cache.
 
         Args:
             path (str): The path to read from.
@@ -55,9 +560,7 @@ class CachedFile:
             str: The content of the file.
         """
 
-        # pylint: disable=unspecified-encoding
-
-        with open(path, "r") as file:
+        with open(path, "r", encoding="UTF-8") as file:
             content = file.read()
         return content
 
@@ -69,43 +572,171 @@ class CachedFile:
             str: The contents of the file represented by this object.
         """
 
-        if self.path not in FILE_CACHE:
-            FILE_CACHE[self.path] = self._read(self.path)
-        return FILE_CACHE[self.path]
+        content = FILE_CACHE.get(self.path)
+        if content is None:
+            # Stat before reading so a write racing the read is caught by later validation, and
+            # read outside the lock so reads of different files can happen concurrently
+            tag = get_stat_tag(self.path)
+            content = FILE_CACHE.add(self.path, self._read(self.path), tag)
+        return content
+
+    def get_bytes(self) -> bytes:
+        """Gets the raw bytes of the file. Cached content, such as content written by a
+        Transformer, is encoded as UTF-8. Bytes read from disk are not cached.
+
+        Returns:
+            bytes: The bytes of the file.
+        """
+
+        content = FILE_CACHE.get(self.path)
+        if content is not None:
+            return content.encode("UTF-8")
+        with open(self.path, "rb") as file:
+            return file.read()
+
+    def is_binary(self) -> bool:
+        """Checks whether the file is binary by looking for a NUL byte at the start of the file.
+
+        Returns:
+            bool: Whether the file is binary.
+        """
+
+        if self.path in FILE_CACHE:
+            return False
+        with open(self.path, "rb") as file:
+            return b"\0" in file.read(BINARY_SNIFF_SIZE)
+
+    @contextmanager
+    def get_buffer(self) -> Iterator[Union[bytes, mmap.mmap]]:
+        """Gets a read only buffer of the file's bytes. Files at or above the file_mmap_threshold
+        setting of the Config that are not cached are memory mapped rather than read.
+
+        Returns:
+            Iterator[Union[bytes, mmap.mmap]]: A context for the buffer.
+        """
+
+        if self.path not in FILE_CACHE and os.path.getsize(self.path) >= get_mmap_threshold():
+            with open(self.path, "rb") as file, mmap.mmap(
+                file.fileno(), 0, access=mmap.ACCESS_READ
+            ) as buffer:
+                yield buffer
+        else:
+            yield self.get_bytes()
+
+    def search(self, pattern: str, from_start: bool = False) -> Optional[Sequence[Optional[str]]]:
+        """Searches the content of the file for a pattern. Text files below the
+        file_mmap_threshold setting of the Config are searched using cached content. Binary files
+        and larger files are searched as bytes when the pattern matches bytes the same way as
+        text, with matched groups decoded as UTF-8. Otherwise their content is decoded without
+        being cached, replacing invalid bytes, and searched as text.
+
+        Args:
+            pattern (str): The regex pattern to search for.
+            from_start (bool, optional): Whether the pattern must match at the start of the
+                file, as with re.match. Defaults to False.
+
+        Returns:
+            Optional[Sequence[Optional[str]]]: The groups of the match, None if there is no match.
+        """
+
+        str_pattern, bytes_pattern = compile_text_and_bytes(pattern)
+        content = None
+        if self.path in FILE_CACHE or os.path.getsize(self.path) < get_mmap_threshold():
+            try:
+                content = self.get_content()
+            except UnicodeDecodeError:
+                pass
+
+        if content is None:
+            with self.get_buffer() as buffer:
+                if bytes_pattern is None:
+                    content = _decode(buffer)
+                else:
+                    search = bytes_pattern.match if from_start else bytes_pattern.search
+                    bytes_match = search(buffer)
+                    if bytes_match is None:
+                        return None
+                    return tuple(
+                        None if group is None else group.decode("UTF-8", errors="replace")
+                        for group in bytes_match.groups()
+                    )
+
+        str_match = (str_pattern.match if from_start else str_pattern.search)(content)
+        return None if str_match is None else str_match.groups()
+
+    def scan(self, pattern: str) -> bool:
+        """Checks whether the content of the file contains a match for a pattern without reading
+        the content in to the cache. The file is memory mapped, and files without a literal that
+        every match requires are rejected before the regex runs. Patterns that match bytes the
+        same way as text search the bytes, stopping at the first match. Other patterns search
+        the decoded content, replacing invalid bytes, so results match CachedFile.search. Cached
+        content, such as content written by a Transformer, is searched as text.
+
+        Args:
+            pattern (str): The regex pattern to search for.
+
+        Returns:
+            bool: Whether the file contains a match.
+        """
+
+        str_pattern, bytes_pattern = compile_text_and_bytes(pattern)
+        content = FILE_CACHE.get(self.path)
+        if content is not None:
+            return str_pattern.search(content) is not None
+
+        literal = _get_required_bytes(pattern)
+        with open(self.path, "rb") as file:
+            try:
+                buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            except (OSError, ValueError):
+                # Empty files and some special files can not be memory mapped
+                return _scan_buffer(file.read(), str_pattern, bytes_pattern, literal)
+            with buffer:
+                return _scan_buffer(buffer, str_pattern, bytes_pattern, literal)
+
+    def get_hash(self) -> str:
+        """Gets a hash of the file contents, using the cache if the contents are present.
+
+        Returns:
+            str: The SHA-256 hex digest of the contents of the file.
+        """
+
+        return sha256(self.get_content().encode("UTF-8")).hexdigest()
 
     @staticmethod
     def _write(path: str, content: str) -> None:
-        """A simple private method to write new content to a file. Used as a hook for testing
-        purposes. Simply handles writing and does not interact with the cache.
+        """A simple private method to write new content to a file, encoded as UTF-8. Used as a
+        hook for testing purposes. Simply handles writing and does not interact with the cache.
 
         Args:
             path (str): The path to write the file content to.
             content (str): The content to write to the file.
         """
 
-        # pylint: disable=unspecified-encoding
         directory = Path(path).parent
         if not directory.exists():
             directory.mkdir(parents=True)
-        with open(path, "w") as file:
+        with open(path, "w", encoding="UTF-8") as file:
             file.write(content)
             file.flush()
 
     def write_content(self, new_content: str) -> None:
-        """Updates the content of a cached file, including writing the file.
+        """Updates the content of a cached file, including writing the file. Writes that would
+        not change the content of the file are skipped. Written files are recorded in the
+        WRITE_JOURNAL.
 
         Args:
             new_content (str): The content to put in the file.
         """
 
-        # pylint: disable=unspecified-encoding
-
-        if self.path not in ORIGINAL_FILE_CACHE:
-            ORIGINAL_FILE_CACHE[self.path] = (
-                self._read(self.path) if Path(self.path).exists() else None
-            )
-        self._write(self.path, new_content)
-        FILE_CACHE[self.path] = new_content
+        with CACHE_LOCK:
+            current_content = self.get_content() if Path(self.path).exists() else None
+            if current_content == new_content:
+                return
+            original_content = ORIGINAL_FILE_CACHE.setdefault(self.path, current_content)
+            self._write(self.path, new_content)
+            FILE_CACHE.add_dirty(self.path, new_content, get_stat_tag(self.path))
+            WRITE_JOURNAL.record(self.path, new_content != original_content)
 
     def revert(self) -> None:
         """Reverts the content of a file to its original content."""
@@ -115,5 +746,7 @@ class CachedFile:
             original_content = ORIGINAL_FILE_CACHE[self.path]
             if original_content is None:
                 Path(self.path).unlink(missing_ok=True)
+                FILE_CACHE.pop(self.path)
+                WRITE_JOURNAL.record(self.path, False)
             else:
                 self.write_content(original_content)
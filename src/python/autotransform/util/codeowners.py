@@ -0,0 +1,315 @@
+# AutoTransform
+# Large scale, component based code modification library
+#
+# Licensed under the MIT License <http://opensource.org/licenses/MIT>
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2022-present Nathan Rockenbach <http://github.com/nathro>
+
+# @black_format
+
+"""A compiled index of the rules in a CODEOWNERS file, giving the same owners as the codeowners
+library without checking every rule against every path. Indexes are shared within a process and
+cached on disk, keyed by the modification time of the CODEOWNERS file."""
+
+from __future__ import annotations
+
+import json
+import os
+import re
+from hashlib import sha256
+from tempfile import NamedTemporaryFile
+from typing import Dict, List, NamedTuple, Optional, Pattern, Sequence, Tuple
+
+from autotransform.config import get_config
+from autotransform.util.regex import get_literal_suffix
+from codeowners import MASK, CodeOwners, OwnerTuple
+
+CACHE_DIRECTORY_NAME = "codeowners"
+INDEX_VERSION = 1
+
+# The anchors added around each pattern by the codeowners library
+_ANCHORED_PREFIX = r"\A"
+_UNANCHORED_PREFIX = r"(?:\A|/)"
+_DIRECTORY_SUFFIX = "/"
+_PATH_SUFFIX = r"(?:\Z|/)"
+# Matches any prefix of a path ending in a slash, allowing unanchored rules to use fullmatch
+_ANY_DIRECTORY = r"(?:[\s\S]*/)?"
+
+# A modification time and size, used to detect changes to a CODEOWNERS file
+FileStamp = Tuple[int, int]
+
+_INDEXES: Dict[str, Tuple[FileStamp, CodeownersIndex]] = {}
+
+
+class CodeownersRule(NamedTuple):
+    """A rule from a CODEOWNERS file.
+
+    Attributes:
+        body (str): The regex the codeowners library uses for the rule's pattern, without the
+            anchors around it.
+        anchored (bool): Whether the pattern must match from the start of the path.
+        matches_dir (bool): Whether the pattern only matches the contents of directories.
+        key (str): The literal text that ends every match of the body, after its last slash.
+        owners (List[OwnerTuple]): The owners of paths matching the rule.
+    """
+
+    body: str
+    anchored: bool
+    matches_dir: bool
+    key: str
+    owners: List[OwnerTuple]
+
+
+class CodeownersIndex:
+    """An index of the rules in a CODEOWNERS file. As with the codeowners library, the owners of
+    a path come from the last rule that matches it.
+
+    A rule matches a path if its pattern matches the whole path or a prefix of it that ends
+    just before a slash. Matches against the prefixes are memoized for each directory, so each
+    rule is only checked against the final name of a directory or file. Rules are bucketed by
+    the literal text their patterns end with, and the rules in a bucket are fused into a single
+    regex, so only rules that could match a name are checked.
+
+    Attributes:
+        _rules (List[CodeownersRule]): The rules, ordered from last to first in the file.
+        _buckets (Dict[str, List[int]]): The indices of the rules ending with each key.
+        _max_key_length (int): The length of the longest key.
+        _fused (Dict[Tuple[str, bool], Tuple[Optional[Pattern[str]], List[int]]]): The fused
+            regex for each bucket, with the rules for each of its groups, both for all rules
+            and for only rules that match files.
+        _directories (Dict[str, int]): The index of the first rule matching each directory,
+            the number of rules if none match.
+    """
+
+    _rules: List[CodeownersRule]
+    _buckets: Dict[str, List[int]]
+    _max_key_length: int
+    _fused: Dict[Tuple[str, bool], Tuple[Optional[Pattern[str]], List[int]]]
+    _directories: Dict[str, int]
+
+    def __init__(self, rules: Sequence[CodeownersRule]):
+        """A simple constructor.
+
+        Args:
+            rules (Sequence[CodeownersRule]): The rules, ordered from last to first in the file.
+        """
+
+        self._rules = list(rules)
+        self._buckets = {}
+        for idx, rule in enumerate(self._rules):
+            self._buckets.setdefault(rule.key, []).append(idx)
+        self._max_key_length = max((len(key) for key in self._buckets), default=0)
+        self._fused = {}
+        self._directories = {}
+
+    @staticmethod
+    def from_text(text: str) -> CodeownersIndex:
+        """Parses a CODEOWNERS file using the codeowners library and indexes its rules.
+
+        Args:
+            text (str): The content of the CODEOWNERS file.
+
+        Raises:
+            ValueError: Raised if a pattern is invalid.
+            re.error: Raised if a pattern can not be compiled.
+
+        Returns:
+            CodeownersIndex: The index of the rules.
+        """
+
+        rules = []
+        for regex, _path, owners, _line_num, _section_name in CodeOwners(text).paths:
+            pattern = regex.pattern
+            anchored = pattern.startswith(_ANCHORED_PREFIX)
+            matches_dir = not pattern.endswith(_PATH_SUFFIX)
+            prefix = _ANCHORED_PREFIX if anchored else _UNANCHORED_PREFIX
+            suffix = _DIRECTORY_SUFFIX if matches_dir else _PATH_SUFFIX
+            body = pattern[len(prefix) : len(pattern) - len(suffix)]
+            key = get_literal_suffix(body).rpartition("/")[2]
+            rules.append(CodeownersRule(body, anchored, matches_dir, key, owners))
+        return CodeownersIndex(rules)
+
+    @staticmethod
+    def load(codeowners_file_path: str, cache_directory: Optional[str] = None) -> CodeownersIndex:
+        """Gets the index for a CODEOWNERS file. Indexes are reused within a process and read
+        from the cache on disk until the file changes.
+
+        Args:
+            codeowners_file_path (str): The path of the CODEOWNERS file.
+            cache_directory (Optional[str], optional): The directory where indexes are cached.
+                If None, a directory within the cache directory of the Config is used.
+                Defaults to None.
+
+        Raises:
+            OSError: Raised if the CODEOWNERS file can not be read.
+
+        Returns:
+            CodeownersIndex: The index of the rules.
+        """
+
+        path = os.path.abspath(codeowners_file_path)
+        stat = os.stat(path)
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        loaded = _INDEXES.get(path)
+        if loaded is not None and loaded[0] == stamp:
+            return loaded[1]
+
+        if cache_directory is None:
+            cache_directory = os.path.join(get_config().get_cache_directory(), CACHE_DIRECTORY_NAME)
+        cache_path = os.path.join(
+            cache_directory, f"{sha256(path.encode('UTF-8')).hexdigest()}.json"
+        )
+        index = CodeownersIndex.read_cache(cache_path, stamp)
+        if index is None:
+            with open(path, mode="r", encoding="UTF-8") as codeowners_file:
+                index = CodeownersIndex.from_text(codeowners_file.read())
+            index.write_cache(cache_path, stamp)
+        _INDEXES[path] = (stamp, index)
+        return index
+
+    @staticmethod
+    def read_cache(cache_path: str, stamp: FileStamp) -> Optional[CodeownersIndex]:
+        """Reads a cached index, ignoring missing, malformed, or outdated files.
+
+        Args:
+            cache_path (str): The path of the cached index.
+            stamp (FileStamp): The current modification time and size of the CODEOWNERS file.
+
+        Returns:
+            Optional[CodeownersIndex]: The cached index, None if there is no valid index.
+        """
+
+        try:
+            with open(cache_path, "r", encoding="UTF-8") as cache_file:
+                data = json.load(cache_file)
+            if data["version"] != INDEX_VERSION or tuple(data["stamp"]) != stamp:
+                return None
+            return CodeownersIndex(
+                [
+                    CodeownersRule(
+                        body, anchored, matches_dir, key, [(owner[0], owner[1]) for owner in owners]
+                    )
+                    for body, anchored, matches_dir, key, owners in data["rules"]
+                ]
+            )
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def write_cache(self, cache_path: str, stamp: FileStamp) -> None:
+        """Writes the index to the cache. Failures to write are ignored, as they only cause the
+        CODEOWNERS file to be parsed again.
+
+        Args:
+            cache_path (str): The path of the cached index.
+            stamp (FileStamp): The modification time and size of the CODEOWNERS file.
+        """
+
+        data = {"version": INDEX_VERSION, "stamp": stamp, "rules": self._rules}
+        try:
+            cache_dir = os.path.dirname(cache_path)
+            os.makedirs(cache_dir, exist_ok=True)
+            with NamedTemporaryFile(
+                "w", encoding="UTF-8", dir=cache_dir, suffix=".tmp", delete=False
+            ) as cache_file:
+                json.dump(data, cache_file, separators=(",", ":"))
+            os.replace(cache_file.name, cache_path)
+        except OSError:
+            pass
+
+    def of(self, path: str) -> List[OwnerTuple]:
+        """Gets the owners of a path, matching CodeOwners.of.
+
+        Args:
+            path (str): The path.
+
+        Returns:
+            List[OwnerTuple]: The owners of the path, empty if no rule matches it.
+        """
+
+        # The codeowners library replaces spaces with a run of slashes before matching
+        path = path.replace(" ", MASK)
+        directory, separator, _ = path.rpartition("/")
+        bound = self._get_directory_rule(directory) if separator else len(self._rules)
+        idx = self._find_rule(path, bound, files_only=True)
+        return self._rules[idx].owners if idx < len(self._rules) else []
+
+    def _get_directory_rule(self, directory: str) -> int:
+        """Gets the first rule with a match ending at a slash within a directory, including the
+        slash following it, memoizing the result for the directory and its parents.
+
+        Args:
+            directory (str): The path of the directory, without a trailing slash.
+
+        Returns:
+            int: The index of the rule, the number of rules if none match.
+        """
+
+        pending_directories = []
+        idx = len(self._rules)
+        while True:
+            memoized = self._directories.get(directory)
+            if memoized is not None:
+                idx = memoized
+                break
+            pending_directories.append(directory)
+            directory, separator, _ = directory.rpartition("/")
+            if not separator:
+                break
+
+        for pending_directory in reversed(pending_directories):
+            idx = self._find_rule(pending_directory, idx, files_only=False)
+            self._directories[pending_directory] = idx
+        return idx
+
+    def _find_rule(self, path: str, bound: int, files_only: bool) -> int:
+        """Finds the first rule before a bound with a match ending at the end of a path.
+
+        Args:
+            path (str): The path.
+            bound (int): The index of the best rule found so far.
+            files_only (bool): Whether to skip rules that only match the contents of directories.
+
+        Returns:
+            int: The index of the first matching rule, the bound if none come before it.
+        """
+
+        name = path[path.rfind("/") + 1 :]
+        for start in range(max(0, len(name) - self._max_key_length), len(name) + 1):
+            bucket = self._buckets.get(name[start:])
+            if bucket is None or bucket[0] >= bound:
+                continue
+            regex, rules = self._get_fused(name[start:], files_only)
+            match = None if regex is None else regex.fullmatch(path)
+            if match is not None and match.lastindex is not None:
+                bound = min(bound, rules[match.lastindex - 1])
+        return bound
+
+    def _get_fused(self, key: str, files_only: bool) -> Tuple[Optional[Pattern[str]], List[int]]:
+        """Gets a regex that fully matches paths that the rules in a bucket match up to the end
+        of the path. Each rule is a group, in order, so the last group matched is the first
+        matching rule.
+
+        Args:
+            key (str): The key of the bucket.
+            files_only (bool): Whether to skip rules that only match the contents of directories.
+
+        Returns:
+            Tuple[Optional[Pattern[str]], List[int]]: The regex, None if there are no rules, and
+                the rules for each group.
+        """
+
+        fused = self._fused.get((key, files_only))
+        if fused is None:
+            rules = [
+                idx
+                for idx in self._buckets[key]
+                if not (files_only and self._rules[idx].matches_dir)
+            ]
+            alternatives = [
+                f"({'' if self._rules[idx].anchored else _ANY_DIRECTORY}{self._rules[idx].body})"
+                for idx in rules
+            ]
+            regex = re.compile("|".join(alternatives)) if alternatives else None
+            fused = (regex, rules)
+            self._fused[(key, files_only)] = fused
+        return fused
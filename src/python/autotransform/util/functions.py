@@ -11,14 +11,21 @@
 
 import json
 import os
+import queue
 import re
 import subprocess
+import threading
+import time
 from tempfile import NamedTemporaryFile as TmpFile
-from typing import Any, Dict, List, Mapping, Optional, Sequence
+from typing import IO, Any, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence
 
 from autotransform.event.handler import EventHandler
 from autotransform.event.script import ScriptErrEvent, ScriptOutEvent, ScriptRunEvent
 from autotransform.item.base import Item
+from autotransform.util.cachedfile import FILE_CACHE, WRITE_JOURNAL
+
+# The maximum number of lines of script output read ahead of the consumer when streaming
+STREAM_BUFFER_LINES = 1024
 
 
 def run_cmd_on_items(
@@ -107,7 +114,8 @@ def replace_script_args(args: List[str], replacements: Dict[str, List[str]]) ->
 
 
 def run_cmd(cmd: List[str], timeout: Optional[int] = None) -> subprocess.CompletedProcess:
-    """Run a script
+    """Run a script. As the script may modify files, cached file content is invalidated and
+    the WRITE_JOURNAL is untracked once the script completes.
 
     Args:
         cmd (List[str]): The command to run.
@@ -120,7 +128,13 @@ def run_cmd(cmd: List[str], timeout: Optional[int] = None) -> subprocess.Complet
     event_handler = EventHandler.get()
 
     event_handler.handle(ScriptRunEvent({"command": cmd}))
-    proc = subprocess.run(cmd, capture_output=True, encoding="utf-8", check=False, timeout=timeout)
+    try:
+        proc = subprocess.run(
+            cmd, capture_output=True, encoding="utf-8", check=False, timeout=timeout
+        )
+    finally:
+        FILE_CACHE.invalidate()
+        WRITE_JOURNAL.untrack()
 
     stdout = proc.stdout.strip()
     if stdout:
@@ -131,3 +145,199 @@ def run_cmd(cmd: List[str], timeout: Optional[int] = None) -> subprocess.Complet
         event_handler.handle(ScriptErrEvent({"proc": proc}))
 
     return proc
+
+
+def _enqueue_lines(stream: IO[str], lines: queue.Queue[Optional[str]]) -> None:
+    """Reads lines from a stream in to a queue, followed by None once the stream ends.
+
+    Args:
+        stream (IO[str]): The stream to read.
+        lines (queue.Queue[Optional[str]]): The queue to put lines in.
+    """
+
+    for line in stream:
+        lines.put(line)
+    lines.put(None)
+
+
+def _dequeue_lines(
+    cmd: List[str], lines: queue.Queue[Optional[str]], timeout: Optional[int]
+) -> Iterator[str]:
+    """Yields each non-empty line from a queue until None is reached.
+
+    Args:
+        cmd (List[str]): The command producing the lines.
+        lines (queue.Queue[Optional[str]]): The queue to get lines from.
+        timeout (Optional[int]): The total time to wait for lines, not counting time spent by
+            the consumer processing them.
+
+    Raises:
+        subprocess.TimeoutExpired: Raised if the timeout expires.
+
+    Returns:
+        Iterator[str]: The lines.
+    """
+
+    waited = 0.0
+    while True:
+        start = time.monotonic()
+        if timeout is None:
+            line = lines.get()
+        else:
+            try:
+                line = lines.get(timeout=max(timeout - waited, 0.0))
+            except queue.Empty:
+                raise subprocess.TimeoutExpired(cmd, timeout) from None
+        waited += time.monotonic() - start
+        if line is None:
+            return
+        line = line.strip()
+        if line:
+            yield line
+
+
+def _kill_script(
+    proc: subprocess.Popen, stdout_reader: threading.Thread, lines: queue.Queue[Optional[str]]
+) -> None:
+    """Kills a script whose output is no longer needed, then drains its remaining lines so that
+    the reader blocked on a full queue sees the end of the output.
+
+    Args:
+        proc (subprocess.Popen): The script.
+        stdout_reader (threading.Thread): The thread putting the script's lines in the queue.
+        lines (queue.Queue[Optional[str]]): The queue of lines.
+    """
+
+    if proc.poll() is None:
+        proc.kill()
+    while stdout_reader.is_alive():
+        try:
+            lines.get(timeout=0.1)
+        except queue.Empty:
+            pass
+
+
+def run_cmd_streaming(
+    cmd: List[str], timeout: Optional[int] = None, buffer_size: int = STREAM_BUFFER_LINES
+) -> Iterator[str]:
+    """Run a script, lazily yielding each non-empty line of its STDOUT as it is produced. At most
+    buffer_size lines are read ahead of the consumer, after which the script blocks until more
+    lines are consumed. The timeout applies to the time spent waiting for the script to output
+    lines, so time spent processing lines does not count against it. The script is killed if
+    iteration stops early. As the script may modify files, cached file content is invalidated
+    and the WRITE_JOURNAL is untracked once the script completes.
+
+    Args:
+        cmd (List[str]): The command to run.
+        timeout (optional, Optional[int]): A timeout for the subprocess run. Defaults to None.
+        buffer_size (int, optional): The maximum number of lines to read ahead of the consumer.
+            Defaults to STREAM_BUFFER_LINES.
+
+    Raises:
+        subprocess.TimeoutExpired: Raised if the timeout expires.
+        subprocess.CalledProcessError: Raised if the script exits with a non-zero code.
+
+    Returns:
+        Iterator[str]: The lines of the script's STDOUT.
+    """
+
+    event_handler = EventHandler.get()
+    event_handler.handle(ScriptRunEvent({"command": cmd}))
+
+    lines: queue.Queue[Optional[str]] = queue.Queue(maxsize=buffer_size)
+    stderr: List[str] = []
+    try:
+        with subprocess.Popen(
+            cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, encoding="utf-8"
+        ) as proc:
+            assert proc.stdout is not None and proc.stderr is not None
+            # STDERR is drained separately so that a chatty script can not block on it
+            stderr_reader = threading.Thread(target=stderr.extend, args=(proc.stderr,), daemon=True)
+            stdout_reader = threading.Thread(
+                target=_enqueue_lines, args=(proc.stdout, lines), daemon=True
+            )
+            stderr_reader.start()
+            stdout_reader.start()
+
+            finished = False
+            try:
+                yield from _dequeue_lines(cmd, lines, timeout)
+                finished = True
+            finally:
+                if not finished:
+                    _kill_script(proc, stdout_reader, lines)
+                stdout_reader.join()
+                stderr_reader.join()
+    finally:
+        FILE_CACHE.invalidate()
+        WRITE_JOURNAL.untrack()
+
+    stderr_output = "".join(stderr).strip()
+    if stderr_output:
+        event_handler.handle(
+            ScriptErrEvent(
+                {"proc": subprocess.CompletedProcess(cmd, proc.returncode, None, stderr_output)}
+            )
+        )
+    if proc.returncode:
+        raise subprocess.CalledProcessError(proc.returncode, cmd, stderr=stderr_output)
+
+
+def read_ndjson(lines: Iterable[str]) -> Iterator[Any]:
+    """Lazily decodes newline delimited JSON, skipping blank lines.
+
+    Args:
+        lines (Iterable[str]): The lines to decode.
+
+    Returns:
+        Iterator[Any]: The decoded value of each line.
+    """
+
+    for line in lines:
+        line = line.strip()
+        if line:
+            yield json.loads(line)
+
+
+def stream_cmd(
+    cmd: List[str], separator: bytes = b"\n", check: bool = True, chunk_size: int = 65536
+) -> Iterator[str]:
+    """Runs a command, lazily yielding records from its output as they are produced. Output is
+    read in chunks and split on the separator, so large outputs are never held in memory at
+    once. Empty records are skipped. The process is killed if iteration stops early.
+
+    Args:
+        cmd (List[str]): The command to run.
+        separator (bytes, optional): The separator between records, such as b"\0" for NUL
+            delimited output. Defaults to b"\n".
+        check (bool, optional): Whether to raise an error if the command fails. Defaults to True.
+        chunk_size (int, optional): The maximum number of bytes to read at once.
+            Defaults to 65536.
+
+    Raises:
+        subprocess.CalledProcessError: Raised if check is set and the command fails.
+
+    Returns:
+        Iterator[str]: The records from the output of the command.
+    """
+
+    with subprocess.Popen(cmd, stdout=subprocess.PIPE) as proc:
+        assert proc.stdout is not None
+        finished = False
+        try:
+            remainder = b""
+            while chunk := proc.stdout.read1(chunk_size):  # type: ignore [attr-defined]
+                records = (remainder + chunk).split(separator)
+                remainder = records.pop()
+                for record in records:
+                    if record:
+                        yield record.decode("UTF-8", errors="surrogateescape")
+            if remainder:
+                yield remainder.decode("UTF-8", errors="surrogateescape")
+            finished = True
+        finally:
+            # Only kill the process if iteration stopped before all output was read
+            if not finished and proc.poll() is None:
+                proc.kill()
+    if check and proc.returncode:
+        raise subprocess.CalledProcessError(proc.returncode, cmd)
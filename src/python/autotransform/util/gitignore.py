@@ -0,0 +1,272 @@
+# AutoTransform
+# Large scale, component based code modification library
+#
+# Licensed under the MIT License <http://opensource.org/licenses/MIT>
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2022-present Nathan Rockenbach <http://github.com/nathro>
+
+# @black_format
+
+"""A matcher for .gitignore files, used to skip ignored files without invoking git. Supports the
+pattern format described in the gitignore documentation, including negation, directory only
+patterns, anchoring and ** wildcards."""
+
+from __future__ import annotations
+
+import os
+import re
+from typing import List, NamedTuple, Optional, Pattern, Tuple
+
+GITIGNORE_FILE_NAME = ".gitignore"
+
+
+class GitIgnoreRule(NamedTuple):
+    """A single pattern from a .gitignore file.
+
+    Attributes:
+        regex (Pattern[str]): Matches paths relative to the directory of the .gitignore file.
+        negated (bool): Whether the pattern re-includes matching paths.
+        dir_only (bool): Whether the pattern only matches directories.
+    """
+
+    regex: Pattern[str]
+    negated: bool
+    dir_only: bool
+
+
+def translate(pattern: str) -> str:
+    """Translates a gitignore glob, without anchoring, into a regex.
+
+    Args:
+        pattern (str): The glob to translate.
+
+    Returns:
+        str: The regex equivalent of the glob.
+    """
+
+    # pylint: disable=too-many-branches
+
+    parts = []
+    idx = 0
+    while idx < len(pattern):
+        char = pattern[idx]
+        idx += 1
+        if char == "*":
+            if pattern.startswith("*", idx):
+                idx += 1
+                if pattern.startswith("/", idx):
+                    # A leading or middle **/ matches zero or more directories
+                    idx += 1
+                    parts.append("(?:.*/)?")
+                else:
+                    parts.append(".*")
+            else:
+                parts.append("[^/]*")
+        elif char == "?":
+            parts.append("[^/]")
+        elif char == "\\" and idx < len(pattern):
+            parts.append(re.escape(pattern[idx]))
+            idx += 1
+        elif char == "[":
+            end = pattern.find("]", idx + 1 if pattern.startswith(("!", "]"), idx) else idx)
+            if end == -1:
+                parts.append(re.escape(char))
+                continue
+            char_class = pattern[idx:end].replace("\\", "\\\\")
+            if char_class.startswith("!"):
+                char_class = "^" + char_class[1:]
+            parts.append(f"[{char_class}]")
+            idx = end + 1
+        else:
+            parts.append(re.escape(char))
+    return "".join(parts)
+
+
+def parse_rule(line: str) -> Optional[GitIgnoreRule]:
+    """Parses a line of a .gitignore file.
+
+    Args:
+        line (str): The line to parse.
+
+    Returns:
+        Optional[GitIgnoreRule]: The rule for the line, None if the line is blank or a comment.
+    """
+
+    line = line.rstrip("\n")
+    # Trailing spaces are ignored unless escaped
+    stripped = line.rstrip(" ")
+    if stripped.endswith("\\") and len(stripped) < len(line):
+        stripped += " "
+    line = stripped
+    if not line or line.startswith("#"):
+        return None
+
+    negated = line.startswith("!")
+    if negated:
+        line = line[1:]
+    elif line.startswith("\\"):
+        line = line[1:]
+
+    dir_only = line.endswith("/")
+    line = line.rstrip("/")
+    if not line:
+        return None
+
+    # Patterns with a slash at the start or in the middle are relative to the .gitignore
+    anchored = "/" in line
+    line = line.lstrip("/")
+    prefix = "" if anchored else "(?:.*/)?"
+    return GitIgnoreRule(re.compile(f"{prefix}{translate(line)}\\Z"), negated, dir_only)
+
+
+class GitIgnore:
+    """The rules of a single .gitignore file. Within a file, the last matching rule wins.
+
+    Attributes:
+        rules (List[GitIgnoreRule]): The rules of the file, in order.
+    """
+
+    rules: List[GitIgnoreRule]
+
+    def __init__(self, lines: List[str]):
+        """A simple constructor.
+
+        Args:
+            lines (List[str]): The lines of the .gitignore file.
+        """
+
+        self.rules = [rule for rule in map(parse_rule, lines) if rule is not None]
+
+    @staticmethod
+    def load(path: str) -> Optional[GitIgnore]:
+        """Loads a .gitignore file.
+
+        Args:
+            path (str): The path of the file.
+
+        Returns:
+            Optional[GitIgnore]: The rules of the file, None if the file does not exist or has
+                no rules.
+        """
+
+        try:
+            with open(path, "r", encoding="UTF-8", errors="replace") as file:
+                gitignore = GitIgnore(file.readlines())
+        except OSError:
+            return None
+        return gitignore if gitignore.rules else None
+
+    def match(self, path: str, is_dir: bool) -> Optional[bool]:
+        """Checks whether a path is ignored by the rules of the file.
+
+        Args:
+            path (str): The path, relative to the directory of the .gitignore file.
+            is_dir (bool): Whether the path is a directory.
+
+        Returns:
+            Optional[bool]: Whether the path is ignored, None if no rule matches it.
+        """
+
+        for rule in reversed(self.rules):
+            if (is_dir or not rule.dir_only) and rule.regex.match(path):
+                return not rule.negated
+        return None
+
+
+class GitIgnoreMatcher:
+    """Matches paths against the .gitignore files that apply to a directory, where files in
+    deeper directories take precedence. Immutable, so matchers can be shared across threads.
+
+    Attributes:
+        _gitignores (List[Tuple[GitIgnore, str]]): Each applicable .gitignore file, deepest
+            first, along with the path of the directory relative to the .gitignore file.
+    """
+
+    _gitignores: List[Tuple[GitIgnore, str]]
+
+    def __init__(self, gitignores: Optional[List[Tuple[GitIgnore, str]]] = None):
+        """A simple constructor.
+
+        Args:
+            gitignores (Optional[List[Tuple[GitIgnore, str]]], optional): Each applicable
+                .gitignore file, deepest first, along with the path of the directory relative to
+                the .gitignore file, ending in a slash unless empty. Defaults to None.
+        """
+
+        self._gitignores = gitignores or []
+
+    @staticmethod
+    def for_directory(directory: str) -> GitIgnoreMatcher:
+        """Gets the matcher for a directory, including .gitignore files in parent directories
+        up to the root of the git repo and the repo's info/exclude file. Outside of a git repo,
+        only the .gitignore file of the directory itself is used.
+
+        Args:
+            directory (str): The directory.
+
+        Returns:
+            GitIgnoreMatcher: The matcher for the directory.
+        """
+
+        gitignores: List[Tuple[GitIgnore, str]] = []
+        current = os.path.abspath(directory)
+        relative = ""
+        while True:
+            gitignore = GitIgnore.load(os.path.join(current, GITIGNORE_FILE_NAME))
+            if gitignore is not None:
+                gitignores.append((gitignore, relative))
+            if os.path.exists(os.path.join(current, ".git")):
+                exclude = GitIgnore.load(os.path.join(current, ".git", "info", "exclude"))
+                if exclude is not None:
+                    gitignores.append((exclude, relative))
+                return GitIgnoreMatcher(gitignores)
+            parent = os.path.dirname(current)
+            if parent == current:
+                return GitIgnoreMatcher([entry for entry in gitignores if not entry[1]])
+            relative = f"{os.path.basename(current)}/{relative}"
+            current = parent
+
+    def descend(self, name: str) -> GitIgnoreMatcher:
+        """Gets the matcher for a subdirectory, without the subdirectory's own .gitignore file.
+
+        Args:
+            name (str): The name of the subdirectory.
+
+        Returns:
+            GitIgnoreMatcher: The matcher for the subdirectory.
+        """
+
+        return GitIgnoreMatcher(
+            [(gitignore, f"{relative}{name}/") for gitignore, relative in self._gitignores]
+        )
+
+    def with_gitignore(self, gitignore: Optional[GitIgnore]) -> GitIgnoreMatcher:
+        """Adds the .gitignore file of the directory to the matcher.
+
+        Args:
+            gitignore (Optional[GitIgnore]): The .gitignore file of the directory.
+
+        Returns:
+            GitIgnoreMatcher: The matcher including the .gitignore file.
+        """
+
+        if gitignore is None:
+            return self
+        return GitIgnoreMatcher([(gitignore, "")] + self._gitignores)
+
+    def is_ignored(self, name: str, is_dir: bool) -> bool:
+        """Checks whether an entry of the directory is ignored.
+
+        Args:
+            name (str): The name of the entry.
+            is_dir (bool): Whether the entry is a directory.
+
+        Returns:
+            bool: Whether the entry is ignored.
+        """
+
+        for gitignore, relative in self._gitignores:
+            ignored = gitignore.match(f"{relative}{name}", is_dir)
+            if ignored is not None:
+                return ignored
+        return False
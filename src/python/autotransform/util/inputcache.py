@@ -0,0 +1,194 @@
+# AutoTransform
+# Large scale, component based code modification library
+#
+# Licensed under the MIT License <http://opensource.org/licenses/MIT>
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2022-present Nathan Rockenbach <http://github.com/nathro>
+
+# @black_format
+
+"""The InputCache persists the Items produced by an Input so that repeated runs against the same
+state of a repo, such as sharded scheduled runs, do not need to rerun expensive Inputs."""
+
+from __future__ import annotations
+
+import gzip
+import json
+import os
+import subprocess
+import time
+from hashlib import sha256
+from tempfile import NamedTemporaryFile
+from typing import Any, List, Mapping, Optional, Sequence
+
+from autotransform.item.base import FACTORY as item_factory
+from autotransform.item.base import Item
+
+CACHE_DIRECTORY_NAME = "input_cache"
+CACHE_FILE_SUFFIX = ".json.gz"
+DEFAULT_TTL = 3600
+DEFAULT_MAX_SIZE = 128 * 1024 * 1024
+
+
+def get_repo_state() -> Optional[str]:
+    """Gets a marker for the state of the git repo in the current directory, made up of the
+    commit of HEAD and a hash of any uncommitted changes to tracked files. Untracked files can
+    not be captured cheaply, so there is no state when any are present.
+
+    Returns:
+        Optional[str]: The state of the repo, None if it can not be determined.
+    """
+
+    try:
+        head = subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, check=True, encoding="UTF-8"
+        ).stdout.strip()
+        status = subprocess.run(
+            ["git", "status", "--porcelain", "-z"], capture_output=True, check=True
+        ).stdout
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+    if not status:
+        return head
+    if any(entry.startswith(b"?? ") for entry in status.split(b"\0")):
+        return None
+    try:
+        diff = subprocess.run(
+            ["git", "diff", "HEAD", "--binary"], capture_output=True, check=True
+        ).stdout
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return f"{head}-{sha256(diff).hexdigest()}"
+
+
+class InputCache:
+    """A cache of the Items produced by Inputs, stored as a gzip compressed JSON file per entry.
+    Entries expire once they are older than the TTL, and the oldest entries are evicted once the
+    total size of the cache exceeds the maximum size.
+
+    Attributes:
+        directory (str): The directory where entries are stored.
+        ttl (int): The number of seconds an entry is valid for.
+        max_size (int): The maximum total size of the entries, in bytes.
+    """
+
+    directory: str
+    ttl: int
+    max_size: int
+
+    def __init__(self, directory: str, ttl: int = DEFAULT_TTL, max_size: int = DEFAULT_MAX_SIZE):
+        """A simple constructor.
+
+        Args:
+            directory (str): The directory where entries are stored.
+            ttl (int, optional): The number of seconds an entry is valid for.
+                Defaults to DEFAULT_TTL.
+            max_size (int, optional): The maximum total size of the entries, in bytes.
+                Defaults to DEFAULT_MAX_SIZE.
+        """
+
+        self.directory = directory
+        self.ttl = ttl
+        self.max_size = max_size
+
+    @staticmethod
+    def get_key(input_bundle: Mapping[str, Any], repo_state: str) -> str:
+        """Gets the key of the entry for an Input. Inputs often use relative paths, so the
+        current directory is part of the key.
+
+        Args:
+            input_bundle (Mapping[str, Any]): The bundle of the Input.
+            repo_state (str): The state of the repo, from get_repo_state.
+
+        Returns:
+            str: The key of the entry.
+        """
+
+        key_data = {"input": input_bundle, "repo_state": repo_state, "cwd": os.getcwd()}
+        return sha256(json.dumps(key_data, sort_keys=True).encode("UTF-8")).hexdigest()
+
+    def _get_path(self, key: str) -> str:
+        """Gets the path of the file for an entry.
+
+        Args:
+            key (str): The key of the entry.
+
+        Returns:
+            str: The path of the file.
+        """
+
+        return os.path.join(self.directory, f"{key}{CACHE_FILE_SUFFIX}")
+
+    def get(self, key: str) -> Optional[List[Item]]:
+        """Gets the Items of an entry. Expired entries are removed.
+
+        Args:
+            key (str): The key of the entry.
+
+        Returns:
+            Optional[List[Item]]: The cached Items, None if there is no valid entry.
+        """
+
+        path = self._get_path(key)
+        try:
+            if time.time() - os.stat(path).st_mtime > self.ttl:
+                os.remove(path)
+                return None
+            with gzip.open(path, "rt", encoding="UTF-8") as cache_file:
+                data = json.load(cache_file)
+            return [item_factory.get_instance(item_data) for item_data in data]
+        except (OSError, EOFError, ValueError, KeyError, TypeError):
+            return None
+
+    def set(self, key: str, items: Sequence[Item]) -> None:
+        """Stores the Items of an entry, then evicts entries to keep the cache within its
+        limits. Failures to write are ignored, as they only cause the Input to be run again.
+
+        Args:
+            key (str): The key of the entry.
+            items (Sequence[Item]): The Items to store.
+        """
+
+        data = json.dumps([item.bundle() for item in items], separators=(",", ":"))
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            with NamedTemporaryFile(dir=self.directory, suffix=".tmp", delete=False) as tmp_file:
+                with gzip.GzipFile(fileobj=tmp_file, mode="wb", mtime=0) as cache_file:
+                    cache_file.write(data.encode("UTF-8"))
+            os.replace(tmp_file.name, self._get_path(key))
+        except OSError:
+            return
+        self.evict()
+
+    def evict(self) -> None:
+        """Removes expired entries, then removes the oldest entries until the total size of the
+        cache is within the maximum size."""
+
+        entries = []
+        now = time.time()
+        try:
+            with os.scandir(self.directory) as scanner:
+                for entry in scanner:
+                    if not entry.name.endswith(CACHE_FILE_SUFFIX):
+                        continue
+                    try:
+                        stat = entry.stat()
+                        if now - stat.st_mtime > self.ttl:
+                            os.remove(entry.path)
+                        else:
+                            entries.append((stat.st_mtime, stat.st_size, entry.path))
+                    except OSError:
+                        continue
+        except OSError:
+            return
+
+        total_size = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total_size <= self.max_size:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total_size -= size
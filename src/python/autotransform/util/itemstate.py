@@ -0,0 +1,204 @@
+# AutoTransform
+# Large scale, component based code modification library
+#
+# Licensed under the MIT License <http://opensource.org/licenses/MIT>
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2022-present Nathan Rockenbach <http://github.com/nathro>
+
+# @black_format
+
+"""The ItemStateStore persists which FileItems a Schema has transformed without producing any
+changes. Incremental runs use it to skip Items whose content and Schema are unchanged since."""
+
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+from hashlib import sha256
+from types import TracebackType
+from typing import Any, Iterable, Mapping, Optional, Tuple, Type
+
+from autotransform.item.base import Item
+from autotransform.item.file import FileItem
+
+STORE_FILE_NAME = "item_state.sqlite"
+
+# The number of bytes read at a time when hashing a file
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+class ItemStateStore:
+    """A sqlite backed store of FileItems that a Schema transformed with no changes. Each Item's
+    state is keyed by the Schema's name and the Item's key, and stores the fingerprint of the
+    Schema along with the hash of the file's bytes, so that binary files are supported too. The
+    file's mtime and size are also stored so that unchanged files do not need to be read to check
+    their hash.
+
+    Attributes:
+        path (str): The path of the sqlite database.
+        schema_name (str): The name of the Schema.
+        fingerprint (str): The fingerprint of the Schema's bundle.
+        _connection (sqlite3.Connection): The connection to the database.
+    """
+
+    path: str
+    schema_name: str
+    fingerprint: str
+    _connection: sqlite3.Connection
+
+    def __init__(self, path: str, schema_name: str, schema_bundle: Mapping[str, Any]):
+        """A simple constructor.
+
+        Args:
+            path (str): The path of the sqlite database.
+            schema_name (str): The name of the Schema.
+            schema_bundle (Mapping[str, Any]): The bundle of the Schema, used as a fingerprint.
+        """
+
+        self.path = path
+        self.schema_name = schema_name
+        self.fingerprint = ItemStateStore.get_fingerprint(schema_bundle)
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._connection = sqlite3.connect(path, timeout=30)
+        # Parallel runs record states from several processes
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS item_state ("
+            + "schema_name TEXT NOT NULL, "
+            + "item_key TEXT NOT NULL, "
+            + "fingerprint TEXT NOT NULL, "
+            + "content_hash TEXT NOT NULL, "
+            + "mtime_ns INTEGER NOT NULL, "
+            + "size INTEGER NOT NULL, "
+            + "PRIMARY KEY (schema_name, item_key))"
+        )
+        self._connection.commit()
+
+    def __enter__(self) -> ItemStateStore:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        self.close()
+
+    @staticmethod
+    def get_fingerprint(schema_bundle: Mapping[str, Any]) -> str:
+        """Gets a fingerprint of a Schema's bundle.
+
+        Args:
+            schema_bundle (Mapping[str, Any]): The bundle of the Schema.
+
+        Returns:
+            str: The fingerprint of the Schema.
+        """
+
+        return sha256(json.dumps(schema_bundle, sort_keys=True).encode("UTF-8")).hexdigest()
+
+    @staticmethod
+    def _stat(path: str) -> Optional[Tuple[int, int]]:
+        """Gets the mtime and size of a file.
+
+        Args:
+            path (str): The path of the file.
+
+        Returns:
+            Optional[Tuple[int, int]]: The mtime in nanoseconds and size of the file, None if the
+                file does not exist.
+        """
+
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    @staticmethod
+    def _hash(path: str) -> Optional[str]:
+        """Gets a hash of the bytes of a file, reading the file in chunks.
+
+        Args:
+            path (str): The path of the file.
+
+        Returns:
+            Optional[str]: The SHA-256 hex digest of the file, None if the file can not be read.
+        """
+
+        digest = sha256()
+        try:
+            with open(path, "rb") as file:
+                for chunk in iter(lambda: file.read(HASH_CHUNK_SIZE), b""):
+                    digest.update(chunk)
+        except OSError:
+            return None
+        return digest.hexdigest()
+
+    def is_unchanged(self, item: FileItem) -> bool:
+        """Checks whether an Item was transformed with no changes by the same Schema and the
+        file's content has not changed since.
+
+        Args:
+            item (FileItem): The Item to check.
+
+        Returns:
+            bool: Whether the Item can be skipped.
+        """
+
+        row = self._connection.execute(
+            "SELECT fingerprint, content_hash, mtime_ns, size FROM item_state "
+            + "WHERE schema_name = ? AND item_key = ?",
+            (self.schema_name, item.key),
+        ).fetchone()
+        if row is None or row[0] != self.fingerprint:
+            return False
+
+        stat = ItemStateStore._stat(item.get_path())
+        if stat is None:
+            return False
+        if stat == (row[2], row[3]):
+            return True
+
+        # The file was touched, compare content and refresh the stat if it is unchanged
+        if ItemStateStore._hash(item.get_path()) != row[1]:
+            return False
+        self._connection.execute(
+            "UPDATE item_state SET mtime_ns = ?, size = ? WHERE schema_name = ? AND item_key = ?",
+            (*stat, self.schema_name, item.key),
+        )
+        self._connection.commit()
+        return True
+
+    def record(self, items: Iterable[Item]) -> None:
+        """Records that Items were transformed with no changes. Items that are not FileItems or
+        whose files do not exist are ignored.
+
+        Args:
+            items (Iterable[Item]): The Items to record.
+        """
+
+        rows = []
+        for item in items:
+            if not isinstance(item, FileItem):
+                continue
+            stat = ItemStateStore._stat(item.get_path())
+            content_hash = ItemStateStore._hash(item.get_path())
+            if stat is None or content_hash is None:
+                continue
+            rows.append((self.schema_name, item.key, self.fingerprint, content_hash, *stat))
+
+        self._connection.executemany(
+            "INSERT OR REPLACE INTO item_state "
+            + "(schema_name, item_key, fingerprint, content_hash, mtime_ns, size) "
+            + "VALUES (?, ?, ?, ?, ?, ?)",
+            rows,
+        )
+        self._connection.commit()
+
+    def close(self) -> None:
+        """Closes the connection to the database."""
+
+        self._connection.close()
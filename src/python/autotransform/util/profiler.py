@@ -0,0 +1,286 @@
+# AutoTransform
+# Large scale, component based code modification library
+#
+# Licensed under the MIT License <http://opensource.org/licenses/MIT>
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2022-present Nathan Rockenbach <http://github.com/nathro>
+
+# @black_format
+
+"""The Profiler records the wall time, call counts and Item counts of each stage of a Schema
+run, such as the Input, each Filter, the Batcher, the Transformer and Repo operations. Profiling
+is disabled unless a Profiler is set, in which case stages are recorded using profile and
+profile_iter."""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, Iterator, List, Optional, TypedDict, TypeVar
+
+T = TypeVar("T")
+
+
+class StageStats(TypedDict):
+    """The statistics recorded for a stage."""
+
+    calls: int
+    items: int
+    seconds: float
+
+
+class Profiler:
+    """Records statistics for the stages of a run. Stages are reported in the order they were
+    first recorded. The time recorded for a stage excludes time spent in stages nested within
+    it, such as Filters checking the Items pulled by a Batcher, so stage times add up to at most
+    the total time. Safe to use from multiple threads.
+
+    Attributes:
+        _local (threading.local): Thread local storage of the stack of active stages.
+        _lock (threading.Lock): A lock guarding the stage statistics.
+        _stages (Dict[str, StageStats]): The statistics for each stage.
+        _start (float): The time the Profiler was created.
+    """
+
+    _local: threading.local
+    _lock: threading.Lock
+    _stages: Dict[str, StageStats]
+    _start: float
+
+    def __init__(self):
+        """A simple constructor."""
+
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._stages = {}
+        self._start = time.perf_counter()
+
+    def _get_stack(self) -> List[List[float]]:
+        """Gets the stack of active stages for the current thread, each holding the time spent
+        in its nested stages.
+
+        Returns:
+            List[List[float]]: The stack of active stages.
+        """
+
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = []
+            self._local.stack = stack
+        return stack
+
+    def push(self) -> None:
+        """Marks the start of a stage, so that time spent in nested stages can be excluded."""
+
+        self._get_stack().append([0.0])
+
+    def pop(self, seconds: float) -> float:
+        """Marks the end of a stage started with push.
+
+        Args:
+            seconds (float): The wall time spent in the stage, including nested stages.
+
+        Returns:
+            float: The time spent in the stage excluding nested stages.
+        """
+
+        nested_seconds = self._get_stack().pop()[0]
+        self._exclude(seconds)
+        return seconds - nested_seconds
+
+    def _exclude(self, seconds: float) -> None:
+        """Excludes time from the currently active stage.
+
+        Args:
+            seconds (float): The time spent in a nested stage.
+        """
+
+        stack = self._get_stack()
+        if stack:
+            stack[-1][0] += seconds
+
+    def add(self, stage: str, seconds: float, items: int = 0, calls: int = 1) -> None:
+        """Adds to the statistics of a stage measured outside of push and pop. The time is
+        excluded from the currently active stage.
+
+        Args:
+            stage (str): The name of the stage.
+            seconds (float): The wall time spent in the stage.
+            items (int, optional): The number of Items handled. Defaults to 0.
+            calls (int, optional): The number of calls made. Defaults to 1.
+        """
+
+        self._exclude(seconds)
+        self.record(stage, seconds, items, calls)
+
+    def record(self, stage: str, seconds: float, items: int, calls: int) -> None:
+        """Records statistics for a stage, without excluding the time from the currently active
+        stage. Used for stages whose time has already been excluded with push and pop.
+
+        Args:
+            stage (str): The name of the stage.
+            seconds (float): The wall time spent in the stage.
+            items (int): The number of Items handled.
+            calls (int): The number of calls made.
+        """
+
+        with self._lock:
+            stats = self._stages.setdefault(stage, {"calls": 0, "items": 0, "seconds": 0.0})
+            stats["calls"] += calls
+            stats["items"] += items
+            stats["seconds"] += seconds
+
+    def get_report(self) -> Dict[str, Any]:
+        """Gets a JSON encodable report of the recorded statistics.
+
+        Returns:
+            Dict[str, Any]: The report, containing the total wall time and each stage.
+        """
+
+        with self._lock:
+            stages = [{"stage": stage} | stats for stage, stats in self._stages.items()]
+        return {"total_seconds": time.perf_counter() - self._start, "stages": stages}
+
+    def get_table(self) -> str:
+        """Gets a human readable summary table of the recorded statistics.
+
+        Returns:
+            str: The summary table.
+        """
+
+        report = self.get_report()
+        rows: List[List[str]] = [["Stage", "Calls", "Items", "Seconds", "% Total"]]
+        total = report["total_seconds"] or 1.0
+        for stats in report["stages"]:
+            rows.append(
+                [
+                    stats["stage"],
+                    str(stats["calls"]),
+                    str(stats["items"]),
+                    f"{stats['seconds']:.3f}",
+                    f"{stats['seconds'] / total:.1%}",
+                ]
+            )
+        rows.append(["Total", "", "", f"{report['total_seconds']:.3f}", ""])
+        widths = [max(len(row[col]) for row in rows) for col in range(len(rows[0]))]
+        return "\n".join(
+            "  ".join(
+                cell.ljust(width) if col == 0 else cell.rjust(width)
+                for col, (cell, width) in enumerate(zip(row, widths))
+            )
+            for row in rows
+        )
+
+    def write_report(self, file_path: str) -> None:
+        """Writes the report to a file as JSON.
+
+        Args:
+            file_path (str): The file to write the report to.
+        """
+
+        directory = os.path.dirname(file_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(file_path, "w", encoding="UTF-8") as report_file:
+            json.dump(self.get_report(), report_file, indent=4)
+
+
+_PROFILER: Optional[Profiler] = None
+
+
+def get_profiler() -> Optional[Profiler]:
+    """Gets the active Profiler.
+
+    Returns:
+        Optional[Profiler]: The active Profiler, None if profiling is disabled.
+    """
+
+    return _PROFILER
+
+
+def set_profiler(profiler: Optional[Profiler]) -> None:
+    """Sets the active Profiler.
+
+    Args:
+        profiler (Optional[Profiler]): The Profiler to use, None to disable profiling.
+    """
+
+    global _PROFILER  # pylint: disable=global-statement
+    _PROFILER = profiler
+
+
+@contextmanager
+def profile(stage: str, items: int = 0) -> Iterator[None]:
+    """Records a call to a stage if profiling is enabled.
+
+    Args:
+        stage (str): The name of the stage.
+        items (int, optional): The number of Items handled by the call. Defaults to 0.
+
+    Returns:
+        Iterator[None]: A context for the call.
+    """
+
+    profiler = _PROFILER
+    if profiler is None:
+        yield
+        return
+    profiler.push()
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        seconds = profiler.pop(time.perf_counter() - start)
+        profiler.record(stage, seconds, items, 1)
+
+
+def profile_iter(stage: str, iterable: Iterable[T]) -> Iterable[T]:
+    """Records the time spent producing each value of an iterable if profiling is enabled. The
+    stage is recorded as a single call, with each value counted as an Item.
+
+    Args:
+        stage (str): The name of the stage.
+        iterable (Iterable[T]): The iterable to profile.
+
+    Returns:
+        Iterable[T]: The profiled iterable, or the original if profiling is disabled.
+    """
+
+    profiler = _PROFILER
+    if profiler is None:
+        return iterable
+    return _profile_iter(profiler, stage, iterable)
+
+
+def _profile_iter(profiler: Profiler, stage: str, iterable: Iterable[T]) -> Iterator[T]:
+    """Records the time spent producing each value of an iterable.
+
+    Args:
+        profiler (Profiler): The Profiler to record to.
+        stage (str): The name of the stage.
+        iterable (Iterable[T]): The iterable to profile.
+
+    Returns:
+        Iterator[T]: The profiled iterator.
+    """
+
+    iterator = iter(iterable)
+    seconds = 0.0
+    items = 0
+    try:
+        while True:
+            profiler.push()
+            start = time.perf_counter()
+            try:
+                value = next(iterator)
+            except StopIteration:
+                return
+            finally:
+                seconds += profiler.pop(time.perf_counter() - start)
+            items += 1
+            yield value
+    finally:
+        profiler.record(stage, seconds, items, 1)
@@ -0,0 +1,392 @@
+# AutoTransform
+# Large scale, component based code modification library
+#
+# Licensed under the MIT License <http://opensource.org/licenses/MIT>
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2022-present Nathan Rockenbach <http://github.com/nathro>
+
+# @black_format
+
+"""Utilities for analyzing regular expressions, used to cheaply rule out content that can not
+match a pattern before running the full regex and to check several patterns at once."""
+
+from __future__ import annotations
+
+import re
+from bisect import bisect_right
+from functools import lru_cache
+from itertools import accumulate
+from typing import Any, Iterator, List, Optional, Pattern, Sequence, Tuple
+
+try:
+    # pylint: disable=no-name-in-module
+    from re import _constants as sre_constants  # type: ignore [attr-defined]
+    from re import _parser as sre_parse  # type: ignore [attr-defined]
+except ImportError:  # pragma: no cover, Python versions before 3.11
+    import sre_constants  # type: ignore [no-redef] # pylint: disable=deprecated-module
+    import sre_parse  # type: ignore [no-redef] # pylint: disable=deprecated-module
+
+# Opcodes are created dynamically by sre_constants, so they are looked up by name. Opcodes that
+# the running version of Python does not have, such as ATOMIC_GROUP before 3.11, are None.
+_LITERAL, _AT, _SUBPATTERN, _ATOMIC_GROUP = (
+    getattr(sre_constants, op, None) for op in ("LITERAL", "AT", "SUBPATTERN", "ATOMIC_GROUP")
+)
+_REPEATS = {
+    getattr(sre_constants, op)
+    for op in ("MAX_REPEAT", "MIN_REPEAT", "POSSESSIVE_REPEAT")
+    if hasattr(sre_constants, op)
+}
+_GROUP_REFERENCES = {
+    getattr(sre_constants, op)
+    for op in (
+        "GROUPREF",
+        "GROUPREF_EXISTS",
+        "GROUPREF_IGNORE",
+        "GROUPREF_LOC_IGNORE",
+        "GROUPREF_UNI_IGNORE",
+    )
+    if hasattr(sre_constants, op)
+}
+_IN, _RANGE = (getattr(sre_constants, op, None) for op in ("IN", "RANGE"))
+# Ops with nested patterns that match the same way as their nested patterns
+_NESTED = _REPEATS | {
+    getattr(sre_constants, op)
+    for op in ("SUBPATTERN", "BRANCH", "ATOMIC_GROUP", "ASSERT", "ASSERT_NOT", "GROUPREF_EXISTS")
+    if hasattr(sre_constants, op)
+}
+# Anchors that do not depend on which characters are word characters
+_PLAIN_ANCHORS = {
+    getattr(sre_constants, at)
+    for at in (
+        "AT_BEGINNING",
+        "AT_BEGINNING_LINE",
+        "AT_BEGINNING_STRING",
+        "AT_END",
+        "AT_END_LINE",
+        "AT_END_STRING",
+    )
+}
+
+
+def _collect_literals(sub_pattern: Any, runs: List[List[str]]) -> None:
+    """Collects the runs of literal characters that every match of a parsed pattern contains.
+    The last run in runs is extended while the pattern continues to match literal characters.
+
+    Args:
+        sub_pattern (Any): The parsed pattern.
+        runs (List[List[str]]): The runs of literal characters found so far.
+    """
+
+    for op, av in sub_pattern:
+        if op == _LITERAL:
+            runs[-1].append(chr(av))
+        elif op == _AT:
+            # Anchors do not consume characters, so the literals around them are contiguous
+            continue
+        elif op == _SUBPATTERN and not av[1] & sre_constants.SRE_FLAG_IGNORECASE:
+            _collect_literals(av[-1], runs)
+        elif _ATOMIC_GROUP is not None and op == _ATOMIC_GROUP:
+            _collect_literals(av, runs)
+        elif op in _REPEATS and av[0] >= 1:
+            # The first repetition is required, but is not contiguous with what surrounds it
+            runs.append([])
+            _collect_literals(av[2], runs)
+            runs.append([])
+        else:
+            runs.append([])
+
+
+def get_required_literal(pattern: str) -> Optional[str]:
+    """Gets the longest string of literal characters that every match of a pattern contains,
+    which can be searched for with a plain substring search before running the regex.
+
+    Args:
+        pattern (str): The pattern.
+
+    Returns:
+        Optional[str]: The longest required literal, None if the pattern has none or is case
+            insensitive.
+    """
+
+    try:
+        parsed = sre_parse.parse(pattern)
+    except (re.error, RecursionError):
+        return None
+    if parsed.state.flags & sre_constants.SRE_FLAG_IGNORECASE:
+        return None
+
+    runs: List[List[str]] = [[]]
+    _collect_literals(parsed, runs)
+    longest = max(runs, key=len)
+    return "".join(longest) or None
+
+
+def get_literal_suffix(pattern: str) -> str:
+    """Gets the literal characters that end a pattern, which any match ending at the end of a
+    string must also end with.
+
+    Args:
+        pattern (str): The pattern.
+
+    Returns:
+        str: The literal characters at the end of the pattern, empty if there are none or the
+            pattern is invalid or uses global flags.
+    """
+
+    parsed = _parse(pattern)
+    if parsed is None:
+        return ""
+
+    suffix: List[str] = []
+    for op, av in reversed(list(parsed)):
+        if op != _LITERAL:
+            break
+        suffix.append(chr(av))
+    return "".join(reversed(suffix))
+
+
+def matches_bytes_equally(pattern: str) -> bool:
+    """Checks whether searching UTF-8 encoded text with the UTF-8 encoded pattern finds the
+    same matches as searching the text with the pattern. This holds when the pattern only
+    matches ASCII characters by their literal values or ranges. Patterns using the any
+    character, word, digit or whitespace classes, word boundaries, negated sets, non-ASCII
+    characters or case insensitivity do not qualify, as bytes patterns treat each byte of a
+    multibyte character as a separate, non-word character.
+
+    Args:
+        pattern (str): The pattern.
+
+    Returns:
+        bool: Whether the pattern can be used to search UTF-8 encoded bytes.
+    """
+
+    parsed = _parse(pattern)
+    return parsed is not None and _matches_ascii_only(parsed)
+
+
+@lru_cache(maxsize=256)
+def compile_text_and_bytes(
+    pattern: str, flags: int = 0
+) -> Tuple[Pattern[str], Optional[Pattern[bytes]]]:
+    """Compiles a pattern for searching both text and UTF-8 encoded bytes. Only patterns that
+    match bytes equally, see matches_bytes_equally, are compiled for bytes, and flags other
+    than re.MULTILINE prevent searching bytes.
+
+    Args:
+        pattern (str): The pattern.
+        flags (int, optional): The flags to compile the pattern with. Defaults to 0.
+
+    Raises:
+        re.error: Raised if the pattern is invalid.
+
+    Returns:
+        Tuple[Pattern[str], Optional[Pattern[bytes]]]: The text pattern and the bytes pattern,
+            which is None if searching bytes could find different matches than searching text.
+    """
+
+    str_pattern = re.compile(pattern, flags)
+    if flags & ~re.MULTILINE or not matches_bytes_equally(pattern):
+        return str_pattern, None
+    try:
+        return str_pattern, re.compile(pattern.encode("UTF-8"), flags)
+    except re.error:
+        return str_pattern, None
+
+
+def _matches_ascii_only(sub_pattern: Any) -> bool:
+    """Checks whether a parsed pattern only matches ASCII characters by their literal values
+    or ranges, see matches_bytes_equally.
+
+    Args:
+        sub_pattern (Any): The parsed pattern.
+
+    Returns:
+        bool: Whether the pattern only matches ASCII characters.
+    """
+
+    for op, av in sub_pattern:
+        if op == _LITERAL:
+            matches_ascii = av < 0x80
+        elif op == _IN:
+            matches_ascii = all(
+                (item_op == _LITERAL and item_av < 0x80)
+                or (item_op == _RANGE and item_av[1] < 0x80)
+                for item_op, item_av in av
+            )
+        elif op == _AT:
+            matches_ascii = av in _PLAIN_ANCHORS
+        elif op == _SUBPATTERN and av[1] & sre_constants.SRE_FLAG_IGNORECASE:
+            matches_ascii = False
+        elif op in _NESTED:
+            matches_ascii = all(_matches_ascii_only(nested) for nested in _iter_sub_patterns(av))
+        else:
+            matches_ascii = op in _GROUP_REFERENCES
+        if not matches_ascii:
+            return False
+    return True
+
+
+def _parse(pattern: str) -> Optional[Any]:
+    """Parses a pattern.
+
+    Args:
+        pattern (str): The pattern.
+
+    Returns:
+        Optional[Any]: The parsed pattern, None if the pattern is invalid or uses global flags.
+    """
+
+    try:
+        parsed = sre_parse.parse(pattern)
+    except (re.error, RecursionError):
+        return None
+    if parsed.state.flags & ~sre_constants.SRE_FLAG_UNICODE:
+        return None
+    return parsed
+
+
+def _iter_sub_patterns(value: Any) -> Iterator[Any]:
+    """Finds the nested patterns within the arguments of a parsed op.
+
+    Args:
+        value (Any): The arguments of the op.
+
+    Returns:
+        Iterator[Any]: The nested patterns.
+    """
+
+    if isinstance(value, sre_parse.SubPattern):
+        yield value
+    elif isinstance(value, (list, tuple)):
+        for nested_value in value:
+            yield from _iter_sub_patterns(nested_value)
+
+
+def _has_group_references(sub_pattern: Any) -> bool:
+    """Checks whether a parsed pattern refers back to a group, which would refer to a different
+    group once the pattern is fused with others.
+
+    Args:
+        sub_pattern (Any): The parsed pattern.
+
+    Returns:
+        bool: Whether the pattern contains a group reference.
+    """
+
+    for op, av in sub_pattern:
+        if op in _GROUP_REFERENCES:
+            return True
+        if any(_has_group_references(nested) for nested in _iter_sub_patterns(av)):
+            return True
+    return False
+
+
+class PatternMatcher:
+    """Checks whether text contains a match for any of several patterns, equivalent to calling
+    re.search with each pattern. Patterns that are plain literals are checked with substring
+    searches, while other patterns are fused into a single alternation when doing so can not
+    change what they match. Patterns that can not be fused are compiled individually.
+
+    Attributes:
+        _literals (Tuple[str, ...]): The patterns that are plain literals.
+        _regexes (List[Pattern[str]]): The compiled patterns.
+    """
+
+    _literals: Tuple[str, ...]
+    _regexes: List[Pattern[str]]
+
+    def __init__(self, patterns: Sequence[str]):
+        """A simple constructor.
+
+        Args:
+            patterns (Sequence[str]): The patterns to search for.
+
+        Raises:
+            re.error: Raised if a pattern is invalid.
+        """
+
+        literals: List[str] = []
+        fusable: List[str] = []
+        self._regexes = []
+        for pattern in patterns:
+            parsed = _parse(pattern)
+            if parsed is not None and all(op == _LITERAL for op, _ in parsed):
+                literals.append("".join(chr(av) for _, av in parsed))
+            elif parsed is not None and not _has_group_references(parsed):
+                fusable.append(pattern)
+            else:
+                self._regexes.append(re.compile(pattern))
+        self._literals = tuple(literals)
+
+        if len(fusable) > 1:
+            try:
+                self._regexes.insert(0, re.compile("|".join(f"(?:{p})" for p in fusable)))
+                return
+            except re.error:
+                # Such as when patterns define groups with the same name
+                pass
+        self._regexes[:0] = [re.compile(pattern) for pattern in fusable]
+
+    def search(self, text: str) -> bool:
+        """Checks whether the text contains a match for any of the patterns.
+
+        Args:
+            text (str): The text to search.
+
+        Returns:
+            bool: Whether any pattern matches.
+        """
+
+        return any(literal in text for literal in self._literals) or any(
+            regex.search(text) is not None for regex in self._regexes
+        )
+
+    def search_all(self, texts: Sequence[str]) -> List[bool]:
+        """Checks whether each of several texts contains a match for any of the patterns.
+        Literals are searched for in a single buffer joining the texts with newlines, skipping
+        to the next text after each match, unless a literal or text contains a newline.
+
+        Args:
+            texts (Sequence[str]): The texts to search.
+
+        Returns:
+            List[bool]: Whether any pattern matches each text, in order.
+        """
+
+        results = [False] * len(texts)
+        if not texts:
+            return results
+
+        literals = self._literals
+        if literals:
+            buffer = "\n".join(texts)
+            if buffer.count("\n") == len(texts) - 1 and not any("\n" in lit for lit in literals):
+                self._search_buffer(buffer, texts, results)
+            else:
+                results = [any(lit in text for lit in literals) for text in texts]
+
+        for regex in self._regexes:
+            search = regex.search
+            results = [found or search(text) is not None for found, text in zip(results, texts)]
+        return results
+
+    def _search_buffer(self, buffer: str, texts: Sequence[str], results: List[bool]) -> None:
+        """Searches for the literals in a buffer of newline separated texts.
+
+        Args:
+            buffer (str): The texts joined with newlines, none of which contain a newline.
+            texts (Sequence[str]): The texts in the buffer.
+            results (List[bool]): Whether each text matches, updated in place.
+        """
+
+        # The offset of the start of each text in the buffer
+        starts = [0, *accumulate(len(text) + 1 for text in texts)]
+        for literal in self._literals:
+            if not literal:
+                results[:] = [True] * len(texts)
+                return
+            pos = buffer.find(literal)
+            while pos != -1:
+                idx = bisect_right(starts, pos) - 1
+                results[idx] = True
+                pos = buffer.find(literal, starts[idx + 1])
@@ -0,0 +1,269 @@
+# AutoTransform
+# Large scale, component based code modification library
+#
+# Licensed under the MIT License <http://opensource.org/licenses/MIT>
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2022-present Nathan Rockenbach <http://github.com/nathro>
+
+# @black_format
+
+"""A fast directory walker used to list files. Directories are read with os.scandir and
+excluded or ignored directories are pruned before being descended into. Subtrees can be walked
+concurrently using a pool of threads, as scandir releases the GIL while reading directories."""
+
+from __future__ import annotations
+
+import fnmatch
+import os
+import re
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import (
+    Deque,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Pattern,
+    Sequence,
+    Tuple,
+)
+
+from autotransform.util.gitignore import GITIGNORE_FILE_NAME, GitIgnore, GitIgnoreMatcher
+
+# When walking in parallel, directories are expanded breadth first until there are this many
+# subtrees for each worker so that uneven subtrees are balanced across workers
+SUBTREES_PER_WORKER = 4
+
+
+class WalkDirectory(NamedTuple):
+    """A directory waiting to be walked.
+
+    Attributes:
+        path (str): The path used to read the directory.
+        prefix (str): The prefix for the paths of entries in the directory.
+        matcher (Optional[GitIgnoreMatcher]): The matcher for ignored entries, not including the
+            directory's own .gitignore file unless is_root is set. None if .gitignore files are
+            not honored.
+        is_root (bool): Whether the directory is a root of the walk.
+    """
+
+    path: str
+    prefix: str
+    matcher: Optional[GitIgnoreMatcher]
+    is_root: bool
+
+
+def _compile_globs(globs: Iterable[str]) -> Optional[Pattern[str]]:
+    """Compiles glob patterns into a single regex.
+
+    Args:
+        globs (Iterable[str]): The glob patterns.
+
+    Returns:
+        Optional[Pattern[str]]: A regex matching any of the patterns, None if there are none.
+    """
+
+    patterns = [fnmatch.translate(glob) for glob in globs]
+    return re.compile("|".join(patterns)) if patterns else None
+
+
+class FileWalker:  # pylint: disable=too-few-public-methods
+    """Recursively lists files within directories. Symlinks to directories are not followed.
+
+    Exclude patterns are globs. Patterns without a slash are matched against the name of each
+    file and directory, while patterns with a slash are matched against the full path.
+
+    Attributes:
+        max_workers (Optional[int]): The number of threads used to walk subtrees concurrently.
+            If None, directories are walked sequentially.
+        respect_gitignore (bool): Whether to skip files ignored by .gitignore files, along with
+            .git directories.
+        _name_regex (Optional[Pattern[str]]): Matches excluded names.
+        _path_regex (Optional[Pattern[str]]): Matches excluded paths.
+    """
+
+    max_workers: Optional[int]
+    respect_gitignore: bool
+    _name_regex: Optional[Pattern[str]]
+    _path_regex: Optional[Pattern[str]]
+
+    def __init__(
+        self,
+        exclude: Sequence[str] = (),
+        respect_gitignore: bool = False,
+        max_workers: Optional[int] = None,
+    ):
+        """A simple constructor.
+
+        Args:
+            exclude (Sequence[str], optional): Glob patterns for files and directories to skip.
+                Defaults to ().
+            respect_gitignore (bool, optional): Whether to skip files ignored by .gitignore
+                files, along with .git directories. Defaults to False.
+            max_workers (Optional[int], optional): The number of threads used to walk subtrees
+                concurrently. If None, directories are walked sequentially. Defaults to None.
+        """
+
+        self.max_workers = max_workers
+        self.respect_gitignore = respect_gitignore
+        self._name_regex = _compile_globs(glob for glob in exclude if "/" not in glob)
+        self._path_regex = _compile_globs(glob for glob in exclude if "/" in glob)
+
+    def walk(self, paths: Iterable[str]) -> Iterator[str]:
+        """Lazily lists all files within the directories. Paths use forward slashes and are
+        relative to the current directory when the supplied directories are. Directories within
+        other supplied directories are only walked once.
+
+        Args:
+            paths (Iterable[str]): The directories to walk.
+
+        Returns:
+            Iterator[str]: The files within the directories.
+        """
+
+        roots = [
+            WalkDirectory(
+                path,
+                prefix,
+                GitIgnoreMatcher.for_directory(path) if self.respect_gitignore else None,
+                True,
+            )
+            for path, prefix in get_roots(paths)
+        ]
+        if self.max_workers is not None and self.max_workers > 1:
+            return self._walk_parallel(roots, self.max_workers)
+        return self._walk(roots)
+
+    def _walk(self, directories: Sequence[WalkDirectory]) -> Iterator[str]:
+        """Walks directories depth first, listing the files of each directory before those of
+        its subdirectories.
+
+        Args:
+            directories (Sequence[WalkDirectory]): The directories to walk.
+
+        Returns:
+            Iterator[str]: The files within the directories.
+        """
+
+        stack = list(reversed(directories))
+        while stack:
+            files, subdirectories = self._scan(stack.pop())
+            yield from files
+            stack.extend(reversed(subdirectories))
+
+    def _walk_parallel(
+        self, directories: Sequence[WalkDirectory], max_workers: int
+    ) -> Iterator[str]:
+        """Walks subtrees of the directories concurrently. Files are yielded in a deterministic
+        order, though not the same order as a sequential walk.
+
+        Args:
+            directories (Sequence[WalkDirectory]): The directories to walk.
+            max_workers (int): The number of threads to use.
+
+        Returns:
+            Iterator[str]: The files within the directories.
+        """
+
+        frontier: Deque[WalkDirectory] = deque(directories)
+        while frontier and len(frontier) < max_workers * SUBTREES_PER_WORKER:
+            files, subdirectories = self._scan(frontier.popleft())
+            yield from files
+            frontier.extend(subdirectories)
+
+        executor = ThreadPoolExecutor(max_workers=max_workers)
+        try:
+            for files in executor.map(lambda directory: list(self._walk([directory])), frontier):
+                yield from files
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def _scan(self, directory: WalkDirectory) -> Tuple[List[str], List[WalkDirectory]]:
+        """Reads a directory, skipping excluded and ignored entries. Unreadable directories are
+        treated as empty, matching os.walk.
+
+        Args:
+            directory (WalkDirectory): The directory to read.
+
+        Returns:
+            Tuple[List[str], List[WalkDirectory]]: The files and subdirectories to walk.
+        """
+
+        try:
+            with os.scandir(directory.path) as scanner:
+                entries = list(scanner)
+        except OSError:
+            return [], []
+
+        matcher = directory.matcher
+        if matcher is not None and not directory.is_root:
+            if any(entry.name == GITIGNORE_FILE_NAME for entry in entries):
+                gitignore_path = os.path.join(directory.path, GITIGNORE_FILE_NAME)
+                matcher = matcher.with_gitignore(GitIgnore.load(gitignore_path))
+
+        files = []
+        subdirectories = []
+        for entry in entries:
+            name = entry.name
+            path = directory.prefix + name
+            if (self._name_regex is not None and self._name_regex.match(name)) or (
+                self._path_regex is not None and self._path_regex.match(path)
+            ):
+                continue
+            try:
+                is_dir = entry.is_dir()
+            except OSError:
+                is_dir = False
+            if matcher is not None and (
+                (is_dir and name == ".git") or matcher.is_ignored(name, is_dir)
+            ):
+                continue
+            if not is_dir:
+                files.append(path)
+            elif not entry.is_symlink():
+                subdirectories.append(
+                    WalkDirectory(
+                        entry.path,
+                        f"{path}/",
+                        None if matcher is None else matcher.descend(name),
+                        False,
+                    )
+                )
+        return files, subdirectories
+
+
+def get_roots(paths: Iterable[str]) -> List[Tuple[str, str]]:
+    """Normalizes directories to walk, removing duplicates and directories within other
+    directories.
+
+    Args:
+        paths (Iterable[str]): The directories to walk.
+
+    Returns:
+        List[Tuple[str, str]]: The path of each directory to walk and the prefix for the paths
+            of its entries, sorted by path.
+    """
+
+    normalized: Dict[str, str] = {}
+    for path in paths:
+        root = str(Path(path)).replace("\\", "/")
+        normalized.setdefault(os.path.join(os.path.abspath(root), ""), root)
+
+    roots: List[Tuple[str, str]] = []
+    last_root = None
+    # With a trailing separator, directories sort directly before their subdirectories
+    for absolute_path in sorted(normalized):
+        if last_root is not None and absolute_path.startswith(last_root):
+            continue
+        last_root = absolute_path
+        root = normalized[absolute_path]
+        if root == ".":
+            prefix = ""
+        else:
+            prefix = root if root.endswith("/") else f"{root}/"
+        roots.append((root, prefix))
+    return roots
@@ -0,0 +1,415 @@
+# AutoTransform
+# Large scale, component based code modification library
+#
+# Licensed under the MIT License <http://opensource.org/licenses/MIT>
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2022-present Nathan Rockenbach <http://github.com/nathro>
+
+# @black_format
+
+"""Persistent workers for script based components. Rather than starting the script for every
+run, a worker process is started once and is then sent a request for each run.
+
+Messages in both directions are a 4 byte big endian length followed by that many bytes of UTF-8
+encoded JSON. The worker is started with the arguments of the script, leaving out sentinel
+arguments, and each request is an object supplying the values of the sentinel arguments:
+    id (int): The ID of the request.
+    keys (List[str]): The keys of the Items, as with <<KEY>>.
+    extra_data (Dict[str, Any]): A mapping from Item key to extra_data, as with <<EXTRA_DATA>>.
+    metadata (Dict[str, Any]): The metadata of the Batch, as with <<METADATA>>.
+    items (List[Dict[str, Any]]): The bundled Items, as with <<ITEM_FILE>>.
+Each response is an object with the ID of its request, along with:
+    returncode (int, optional): The exit code of the run. Defaults to 0.
+    stdout (str, optional): The output of the run. Defaults to "".
+    stderr (str, optional): The error output of the run. Defaults to "".
+    result (Any, optional): The result of the run, as with <<RESULT_FILE>>.
+Requests may be sent before the responses to earlier requests are received, and responses may
+be sent in any order. Workers should exit once their STDIN is closed.
+"""
+
+from __future__ import annotations
+
+import atexit
+import json
+import re
+import struct
+import subprocess
+import threading
+from collections import deque
+from concurrent.futures import Future
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import IO, Any, Deque, Dict, List, Mapping, NamedTuple, Optional, Sequence, Tuple
+
+from autotransform.event.handler import EventHandler
+from autotransform.event.script import ScriptErrEvent, ScriptOutEvent, ScriptRunEvent
+from autotransform.item.base import Item
+from autotransform.util.cachedfile import FILE_CACHE, WRITE_JOURNAL
+
+# The length prefix of each message
+HEADER = struct.Struct(">I")
+
+# Arguments replaced by the fields of requests, which are not passed to workers
+SENTINEL_ARG = re.compile(r"^<<.*>>$")
+
+# The number of seconds a worker has to exit once its STDIN is closed before it is killed
+SHUTDOWN_TIMEOUT = 5
+
+# The number of lines of STDERR kept to report why a worker exited
+STDERR_LINES = 100
+
+
+class WorkerResponse(NamedTuple):
+    """The response to a request sent to a worker.
+
+    Attributes:
+        proc (subprocess.CompletedProcess): The run, as if the script had been run directly.
+        result (Any): The result of the run, None if the worker did not supply one.
+    """
+
+    proc: subprocess.CompletedProcess
+    result: Any
+
+
+class Worker:
+    """A persistent worker process that requests are sent to. The worker is started when the
+    first request is sent, and restarted by the next request if it exits. Requests in flight
+    when a worker exits fail with a CalledProcessError.
+
+    Attributes:
+        cmd (List[str]): The command used to start the worker.
+        _proc (Optional[subprocess.Popen]): The running worker, None if it is not running.
+        _pending (Dict[int, Future[Dict[str, Any]]]): The requests awaiting responses from the
+            running worker.
+        _next_id (int): The ID of the next request.
+        _stderr (Deque[str]): The last lines of STDERR from the running worker.
+        _lock (threading.Lock): Guards the running worker and its pending requests.
+        _write_lock (threading.Lock): Guards writes to the STDIN of the worker. Writes may block
+            until the worker reads, so they are made without holding the lock needed to handle
+            responses.
+    """
+
+    cmd: List[str]
+    _proc: Optional[subprocess.Popen]
+    _pending: Dict[int, Future[Dict[str, Any]]]
+    _next_id: int
+    _stderr: Deque[str]
+    _lock: threading.Lock
+    _write_lock: threading.Lock
+
+    def __init__(self, cmd: Sequence[str]):
+        """A simple constructor.
+
+        Args:
+            cmd (Sequence[str]): The command used to start the worker.
+        """
+
+        self.cmd = list(cmd)
+        self._proc = None
+        self._pending = {}
+        self._next_id = 0
+        self._stderr = deque(maxlen=STDERR_LINES)
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+
+    def submit(self, request: Mapping[str, Any]) -> Future[Dict[str, Any]]:
+        """Sends a request to the worker, starting the worker if it is not running. The request
+        is sent without waiting for the responses to earlier requests.
+
+        Args:
+            request (Mapping[str, Any]): The fields of the request.
+
+        Returns:
+            Future[Dict[str, Any]]: The response to the request.
+        """
+
+        future: Future[Dict[str, Any]] = Future()
+        with self._lock:
+            proc = self._proc if self._proc is not None else self._start()
+            request_id = self._next_id
+            self._next_id += 1
+            self._pending[request_id] = future
+
+        message = json.dumps({**request, "id": request_id}).encode("UTF-8")
+        assert proc.stdin is not None
+        with self._write_lock:
+            try:
+                proc.stdin.write(HEADER.pack(len(message)) + message)
+                proc.stdin.flush()
+            except (OSError, ValueError):
+                # The worker has exited, and the reader fails the request once it sees the exit
+                pass
+        return future
+
+    def wait(self, future: Future[Dict[str, Any]], timeout: Optional[int] = None) -> Dict[str, Any]:
+        """Waits for the response to a request. If the timeout expires, the worker is killed as
+        it can not be interrupted, failing any other requests in flight.
+
+        Args:
+            future (Future[Dict[str, Any]]): The response to the request.
+            timeout (Optional[int], optional): The number of seconds to wait. Defaults to None.
+
+        Raises:
+            subprocess.TimeoutExpired: Raised if the timeout expires.
+            subprocess.CalledProcessError: Raised if the worker exits before responding.
+
+        Returns:
+            Dict[str, Any]: The response.
+        """
+
+        try:
+            return future.result(timeout)
+        except FutureTimeoutError:
+            self.kill()
+            # The future can only time out when a timeout is set
+            assert timeout is not None
+            raise subprocess.TimeoutExpired(self.cmd, timeout) from None
+
+    def kill(self) -> None:
+        """Kills the worker if it is running, so that the next request starts a new worker."""
+
+        with self._lock:
+            proc = self._proc
+            self._proc = None
+        if proc is not None and proc.poll() is None:
+            proc.kill()
+
+    def close(self) -> None:
+        """Stops the worker if it is running, closing its STDIN and killing it if it does not
+        exit in time."""
+
+        with self._lock:
+            proc = self._proc
+            self._proc = None
+        if proc is None:
+            return
+        assert proc.stdin is not None
+        try:
+            with self._write_lock:
+                proc.stdin.close()
+        except OSError:
+            pass
+        try:
+            proc.wait(SHUTDOWN_TIMEOUT)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            proc.wait()
+
+    def _start(self) -> subprocess.Popen:
+        """Starts the worker. Must be called while holding the lock.
+
+        Returns:
+            subprocess.Popen: The worker process.
+        """
+
+        EventHandler.get().handle(ScriptRunEvent({"command": self.cmd}))
+        proc = subprocess.Popen(  # pylint: disable=consider-using-with
+            self.cmd, stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE
+        )
+        self._proc = proc
+        self._pending = {}
+        self._stderr = deque(maxlen=STDERR_LINES)
+        threading.Thread(target=self._read_stderr, args=(proc, self._stderr), daemon=True).start()
+        threading.Thread(
+            target=self._read_responses, args=(proc, self._pending, self._stderr), daemon=True
+        ).start()
+        return proc
+
+    @staticmethod
+    def _read_stderr(proc: subprocess.Popen, lines: Deque[str]) -> None:
+        """Drains the STDERR of a worker so that it can not block on it.
+
+        Args:
+            proc (subprocess.Popen): The worker process.
+            lines (Deque[str]): The last lines of STDERR.
+        """
+
+        assert proc.stderr is not None
+        for line in proc.stderr:
+            lines.append(line.decode("UTF-8", errors="replace"))
+
+    def _read_responses(
+        self,
+        proc: subprocess.Popen,
+        pending: Dict[int, Future[Dict[str, Any]]],
+        stderr: Deque[str],
+    ) -> None:
+        """Reads responses from a worker until it exits, then fails the requests that are still
+        pending.
+
+        Args:
+            proc (subprocess.Popen): The worker process.
+            pending (Dict[int, Future[Dict[str, Any]]]): The requests awaiting responses.
+            stderr (Deque[str]): The last lines of STDERR from the worker.
+        """
+
+        assert proc.stdout is not None
+        while (message := Worker._read_message(proc.stdout)) is not None:
+            message_id = message.get("id")
+            if not isinstance(message_id, int):
+                continue
+            with self._lock:
+                future = pending.pop(message_id, None)
+            if future is not None:
+                future.set_result(message)
+
+        with self._lock:
+            if self._proc is proc:
+                self._proc = None
+            failed = list(pending.values())
+            pending.clear()
+        if proc.poll() is None:
+            proc.kill()
+        returncode = proc.wait()
+        for future in failed:
+            future.set_exception(
+                subprocess.CalledProcessError(returncode, self.cmd, stderr="".join(stderr))
+            )
+
+    @staticmethod
+    def _read_message(stream: IO[bytes]) -> Optional[Dict[str, Any]]:
+        """Reads a message from a worker.
+
+        Args:
+            stream (IO[bytes]): The STDOUT of the worker.
+
+        Returns:
+            Optional[Dict[str, Any]]: The message, None if the worker has exited or sent a
+                malformed message.
+        """
+
+        header = stream.read(HEADER.size)
+        if len(header) < HEADER.size:
+            return None
+        (length,) = HEADER.unpack(header)
+        body = stream.read(length)
+        if len(body) < length:
+            return None
+        try:
+            message = json.loads(body)
+        except ValueError:
+            return None
+        return message if isinstance(message, dict) else None
+
+
+_WORKERS: Dict[Tuple[str, ...], Worker] = {}
+_WORKERS_LOCK = threading.Lock()
+
+
+def get_worker(cmd: Sequence[str]) -> Worker:
+    """Gets the worker for a script, shared by every component using the same command.
+    Sentinel arguments are left out of the command used to start the worker.
+
+    Args:
+        cmd (Sequence[str]): The command of the script, before replacing arguments.
+
+    Returns:
+        Worker: The worker.
+    """
+
+    worker_cmd = tuple(arg for arg in cmd if not SENTINEL_ARG.match(arg))
+    with _WORKERS_LOCK:
+        worker = _WORKERS.get(worker_cmd)
+        if worker is None:
+            worker = Worker(worker_cmd)
+            _WORKERS[worker_cmd] = worker
+        return worker
+
+
+def shutdown_workers() -> None:
+    """Stops every running worker."""
+
+    with _WORKERS_LOCK:
+        workers = list(_WORKERS.values())
+        _WORKERS.clear()
+    for worker in workers:
+        worker.close()
+
+
+atexit.register(shutdown_workers)
+
+
+def get_request(items: Sequence[Item], batch_metadata: Mapping[str, Any]) -> Dict[str, Any]:
+    """Gets the fields of a request to run a script on Items.
+
+    Args:
+        items (Sequence[Item]): The Items to run on.
+        batch_metadata (Mapping[str, Any]): The metadata for the Batch.
+
+    Returns:
+        Dict[str, Any]: The fields of the request.
+    """
+
+    return {
+        "keys": [item.key for item in items],
+        "extra_data": {item.key: item.extra_data for item in items if item.extra_data is not None},
+        "metadata": batch_metadata,
+        "items": [item.bundle() for item in items],
+    }
+
+
+def get_response(
+    worker: Worker, future: Future[Dict[str, Any]], timeout: Optional[int] = None
+) -> WorkerResponse:
+    """Waits for the response to a request, treating a worker that exits before responding as
+    a failed run. As the worker may modify files, cached file content is invalidated and the
+    WRITE_JOURNAL is untracked once the response is received.
+
+    Args:
+        worker (Worker): The worker the request was sent to.
+        future (Future[Dict[str, Any]]): The response to the request.
+        timeout (Optional[int], optional): The number of seconds to wait. Defaults to None.
+
+    Raises:
+        subprocess.TimeoutExpired: Raised if the timeout expires.
+
+    Returns:
+        WorkerResponse: The response.
+    """
+
+    try:
+        response = worker.wait(future, timeout)
+    except subprocess.CalledProcessError as err:
+        response = {"returncode": err.returncode or 1, "stderr": err.stderr}
+    finally:
+        FILE_CACHE.invalidate()
+        WRITE_JOURNAL.untrack()
+
+    proc: subprocess.CompletedProcess[str] = subprocess.CompletedProcess(
+        worker.cmd,
+        response.get("returncode", 0),
+        response.get("stdout", ""),
+        response.get("stderr", ""),
+    )
+    event_handler = EventHandler.get()
+    if proc.stdout.strip():
+        event_handler.handle(ScriptOutEvent({"proc": proc}))
+    if proc.stderr.strip():
+        event_handler.handle(ScriptErrEvent({"proc": proc}))
+    return WorkerResponse(proc, response.get("result"))
+
+
+def run_worker_on_items(
+    cmd: List[str],
+    items: Sequence[Item],
+    batch_metadata: Mapping[str, Any],
+    timeout: Optional[int] = None,
+) -> subprocess.CompletedProcess:
+    """Runs a script on Items using a persistent worker, equivalent to run_cmd_on_items.
+
+    Args:
+        cmd (List[str]): The command of the script, before replacing arguments.
+        items (Sequence[Item]): The Items to run on.
+        batch_metadata (Mapping[str, Any]): The metadata for the Batch.
+        timeout (Optional[int], optional): The number of seconds to wait for the response.
+            Defaults to None.
+
+    Raises:
+        subprocess.TimeoutExpired: Raised if the timeout expires.
+
+    Returns:
+        subprocess.CompletedProcess: The run.
+    """
+
+    worker = get_worker(cmd)
+    future = worker.submit(get_request(items, batch_metadata))
+    return get_response(worker, future, timeout).proc
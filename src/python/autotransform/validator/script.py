@@ -18,6 +18,7 @@ from autotransform.batcher.base import Batch
 from autotransform.item.base import Item
 from autotransform.item.file import FileItem
 from autotransform.util.functions import run_cmd_on_items
+from autotransform.util.worker import run_worker_on_items
 from autotransform.validator.base import (
     ValidationResult,
     ValidationResultLevel,
@@ -54,6 +55,10 @@ class ScriptValidator(Validator):
         per_item (bool, optional): Whether to run the script on each item. Defaults to False.
         run_on_changes (bool, optional): Whether to replace the Items in the batch with
             FileItems for the changed files. Defaults to False.
+        persistent (bool, optional): Whether to send each run to a persistent worker that is
+            started once, rather than starting the script for every run. Sentinel arguments
+            are supplied as fields of each request, see autotransform.util.worker for the
+            protocol. Defaults to False.
         name (ClassVar[ValidatorName]): The name of the Component.
     """
 
@@ -62,6 +67,7 @@ class ScriptValidator(Validator):
     failure_level: ValidationResultLevel = ValidationResultLevel.ERROR
     per_item: bool = False
     run_on_changes: bool = False
+    persistent: bool = False
 
     name: ClassVar[ValidatorName] = ValidatorName.SCRIPT
 
@@ -110,7 +116,8 @@ class ScriptValidator(Validator):
         cmd = [self.script]
         cmd.extend(self.args)
 
-        proc = run_cmd_on_items(cmd, [item], batch_metadata or {})
+        run = run_worker_on_items if self.persistent else run_cmd_on_items
+        proc = run(cmd, [item], batch_metadata or {})
 
         # Handle output
         level = self.failure_level if proc.returncode != 0 else ValidationResultLevel.NONE
@@ -143,7 +150,8 @@ class ScriptValidator(Validator):
         cmd = [self.script]
         cmd.extend(self.args)
 
-        proc = run_cmd_on_items(cmd, items, batch.get("metadata", {}))
+        run = run_worker_on_items if self.persistent else run_cmd_on_items
+        proc = run(cmd, items, batch.get("metadata", {}))
 
         # Handle output
         level = self.failure_level if proc.returncode != 0 else ValidationResultLevel.NONE
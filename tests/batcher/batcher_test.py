@@ -15,15 +15,18 @@ from autotransform.batcher.base import Batch, Batcher
 from autotransform.item.base import Item
 
 
-def check_batcher(batcher: Batcher, items: Sequence[Item], expected: List[Batch]):
+def check_batcher(
+    batcher: Batcher, items: Sequence[Item], expected: List[Batch], lazy: bool = False
+):
     """A convenience function to perform the actual testing of a Batcher.
 
     Args:
         batcher (Batcher): The Batcher being tested.
         items (Sequence[Item]): The Items for batching.
         expected (List[Batch]): The expected output Batches.
+        lazy (bool, optional): Whether to batch using iter_batches. Defaults to False.
     """
-    actual = batcher.batch(items)
+    actual = list(batcher.iter_batches(iter(items))) if lazy else batcher.batch(items)
 
     # pylint: disable=consider-using-enumerate
 
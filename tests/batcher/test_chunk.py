@@ -9,6 +9,7 @@
 
 """Tests for ChunkBatcher component."""
 
+import pytest
 from autotransform.batcher.chunk import ChunkBatcher
 from autotransform.item.base import Item
 
@@ -95,3 +96,56 @@ def test_with_multiple_items_and_max_batches():
             {"metadata": metadata, "items": items[2:], "title": expected_title_2},
         ],
     )
+
+
+def test_iter_batches_without_stream():
+    """Checks that iter_batches matches batch when the Batcher is not streaming."""
+
+    title = "foo"
+    items = [Item(key="foo.py"), Item(key="bar.py"), Item(key="baz.py")]
+    batcher = ChunkBatcher(title=title, chunk_size=2)
+    check_batcher(
+        batcher,
+        items,
+        [
+            {"items": items[:2], "title": "[1/2] foo"},
+            {"items": items[2:], "title": "[2/2] foo"},
+        ],
+        lazy=True,
+    )
+
+
+def test_with_stream():
+    """Checks that a streaming Batcher creates Batches as Items are produced."""
+
+    title = "foo"
+    metadata = {"summary": "bar", "tests": "baz"}
+    items = [Item(key="foo.py"), Item(key="bar.py"), Item(key="baz.py")]
+    batcher = ChunkBatcher(title=title, metadata=metadata, chunk_size=2, stream=True)
+    check_batcher(
+        batcher,
+        items,
+        [
+            {"metadata": metadata, "items": items[:2], "title": "[1] foo"},
+            {"metadata": metadata, "items": items[2:], "title": "[2] foo"},
+        ],
+        lazy=True,
+    )
+
+    pulled = []
+
+    def produce():
+        for item in items:
+            pulled.append(item.key)
+            yield item
+
+    first_batch = next(batcher.iter_batches(produce()))
+    assert [item.key for item in first_batch["items"]] == ["foo.py", "bar.py"]
+    assert pulled == ["foo.py", "bar.py"], "Only the Items for the first Batch should be pulled"
+
+
+def test_stream_with_max_chunks():
+    """Checks that max_chunks can not be used when streaming."""
+
+    with pytest.raises(ValueError, match="Can not supply max_chunks for a streaming ChunkBatcher"):
+        ChunkBatcher(title="foo", chunk_size=1, max_chunks=2, stream=True)
@@ -54,6 +54,7 @@ def test_fetching_and_bundling() -> None:
             {"script": "black", "args": ["-l", "100"], "per_item": True},
             {"script": "black", "args": ["-l", "100"], "run_on_changes": True},
             {"script": "black", "args": ["-l", "100"], "run_pre_validation": True},
+            {"script": "black", "args": ["-l", "100"], "persistent": True},
             {"script": "black", "args": ["-l", "100"], "per_item": True, "run_on_changes": True},
             {
                 "script": "black",
@@ -1,6 +1,16 @@
 """Sets up some configuration for PyTest."""
 
+import pytest
+
 from autotransform.change.base import TestState
 
 # Prevent pytest from trying to collect TestState as tests:
 TestState.__test__ = False  # type: ignore
+
+
+@pytest.fixture(autouse=True)
+def cache_directory(tmp_path_factory, monkeypatch):
+    """Keeps data cached by tests, such as Filter statistics, out of the user's cache directory."""
+
+    monkeypatch.delenv("AUTO_TRANSFORM_CACHE_DIRECTORY", raising=False)
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path_factory.mktemp("cache")))
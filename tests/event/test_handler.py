@@ -0,0 +1,63 @@
+# AutoTransform
+# Large scale, component based code modification library
+#
+# Licensed under the MIT License <http://opensource.org/licenses/MIT>
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2022-present Nathan Rockenbach <http://github.com/nathro>
+
+# @black_format
+
+"""Tests for the EventHandler and deferred Event messages."""
+
+from autotransform.event.debug import DebugEvent
+from autotransform.event.handler import EventHandler
+from autotransform.event.logginglevel import LoggingLevel
+from autotransform.event.verbose import VerboseEvent
+
+
+def test_is_enabled():
+    """Tests that is_enabled respects the logging level."""
+
+    event_handler = EventHandler.get()
+    original_level = event_handler.get_logging_level()
+    try:
+        event_handler.set_logging_level(LoggingLevel.VERBOSE)
+        assert event_handler.is_enabled(LoggingLevel.INFO)
+        assert event_handler.is_enabled(LoggingLevel.VERBOSE)
+        assert not event_handler.is_enabled(LoggingLevel.DEBUG)
+    finally:
+        event_handler.set_logging_level(original_level)
+
+
+def test_deferred_message_not_built_when_disabled():
+    """Tests that a deferred message is not built when the Event is dropped."""
+
+    event_handler = EventHandler.get()
+    original_level = event_handler.get_logging_level()
+    calls = []
+
+    def build_message() -> str:
+        calls.append(1)
+        return "foo"
+
+    try:
+        event_handler.set_logging_level(LoggingLevel.INFO)
+        event_handler.handle(DebugEvent({"message": build_message}))
+        assert not calls, "Deferred message should not be built"
+    finally:
+        event_handler.set_logging_level(original_level)
+
+
+def test_deferred_message_built_once():
+    """Tests that a deferred message is resolved once and then reused."""
+
+    calls = []
+
+    def build_message() -> str:
+        calls.append(1)
+        return "foo"
+
+    event = VerboseEvent({"message": build_message})
+    assert event.get_message() == "[Verbose] foo"
+    assert event.get_message() == "[Verbose] foo"
+    assert len(calls) == 1
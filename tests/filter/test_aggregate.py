@@ -12,11 +12,12 @@
 
 from __future__ import annotations
 
-from typing import List
+from typing import ClassVar, List, Sequence, Set
 
 import pytest
 from autotransform.filter.aggregate import AggregateFilter
-from autotransform.filter.base import Filter
+from autotransform.filter.base import BulkFilter, Filter
+from autotransform.filter.regex import RegexFileContentFilter, RegexFilter
 from autotransform.item.base import Item
 from autotransform.step.condition.aggregate import AggregatorType
 
@@ -35,6 +36,24 @@ class InvalidFilter(Filter):
         return False
 
 
+class KeysFilter(BulkFilter):
+    """A dummy BulkFilter that treats keys in a fixed set as valid."""
+
+    keys: List[str]
+    processed: ClassVar[List[str]] = []
+
+    def _get_valid_keys(self, items: Sequence[Item]) -> Set[str]:
+        KeysFilter.processed.append(",".join(self.keys))
+        return {item.key for item in items} & set(self.keys)
+
+
+class PyKeysFilter(KeysFilter):
+    """A dummy BulkFilter that also requires valid keys to be Python files."""
+
+    def _is_valid(self, item: Item) -> bool:
+        return super()._is_valid(item) and item.key.endswith(".py")
+
+
 @pytest.fixture
 def valid_filter() -> ValidFilter:
     """A simple pytest fixture.
@@ -139,3 +158,118 @@ def test_aggregate_filter_with_any_and_mixed_filters(
     filters = [valid_filter, invalid_filter]
     aggregate_filter = AggregateFilter(aggregator=AggregatorType.ANY, filters=filters)
     assert aggregate_filter.is_valid(Item(key="test"))
+
+
+def test_aggregate_filter_fuses_regex_filters(valid_filter: ValidFilter) -> None:
+    """Test that fused RegexFilters give the same results as checking each Filter."""
+
+    regex_filters: List[Filter] = [
+        RegexFilter(pattern="\\.py$"),
+        RegexFilter(pattern="test", inverted=True),
+        RegexFilter(pattern="^src/"),
+        RegexFilter(pattern="vendor", inverted=True),
+    ]
+    keys = ["src/foo.py", "src/test.py", "vendor/bar.py", "docs/foo.md", "src/vendor", "test"]
+    for aggregator in AggregatorType:
+        for filters in (regex_filters, [valid_filter, *regex_filters]):
+            aggregate_filter = AggregateFilter(aggregator=aggregator, filters=filters)
+            for key in keys:
+                item = Item(key=key)
+                results = [filt.is_valid(item) for filt in filters]
+                expected = all(results) if aggregator == AggregatorType.ALL else any(results)
+                assert aggregate_filter.is_valid(item) == expected
+            expected_mask = [aggregate_filter.is_valid(Item(key=key)) for key in keys]
+            assert aggregate_filter.get_valid_mask([Item(key=key) for key in keys]) == expected_mask
+
+
+def test_aggregate_filter_combines_bulk_filters(valid_filter: ValidFilter) -> None:
+    """Test that pre processed BulkFilters give the same results as checking each Filter."""
+
+    keys = ["a.py", "b.py", "c.md", "d.md", "e.txt"]
+    items = [Item(key=key) for key in keys]
+    bulk_filters: List[Filter] = [
+        KeysFilter(keys=["a.py", "c.md"]),
+        KeysFilter(keys=["a.py", "b.py", "e.txt"]),
+        KeysFilter(keys=["c.md"], inverted=True),
+        KeysFilter(keys=["b.py", "c.md", "d.md"], inverted=True),
+    ]
+    for filt in bulk_filters:
+        filt.pre_process(items)
+    other_filters: List[Filter] = [RegexFilter(pattern="\\.md$"), valid_filter]
+
+    for aggregator in AggregatorType:
+        for filters in (
+            bulk_filters,
+            bulk_filters[:2],
+            bulk_filters[2:],
+            [*bulk_filters, other_filters[0]],
+            [other_filters[0], *bulk_filters[1:3]],
+            [*bulk_filters, other_filters[1]],
+        ):
+            aggregate_filter = AggregateFilter(
+                aggregator=aggregator,
+                filters=[
+                    KeysFilter(keys=filt.keys, inverted=filt.inverted)
+                    if isinstance(filt, KeysFilter)
+                    else filt
+                    for filt in filters
+                ],
+            )
+            assert aggregate_filter.requires_pre_process()
+            aggregate_filter.pre_process(items)
+            for item in items:
+                results = [filt.is_valid(item) for filt in filters]
+                expected = all(results) if aggregator == AggregatorType.ALL else any(results)
+                assert aggregate_filter.is_valid(item) == expected, (aggregator, filters, item)
+            expected_mask = [aggregate_filter.is_valid(item) for item in items]
+            assert aggregate_filter.get_valid_mask(items) == expected_mask
+
+
+def test_aggregate_filter_pre_processes_nested_filters() -> None:
+    """Test that BulkFilters within nested AggregateFilters are pre processed once."""
+
+    KeysFilter.processed.clear()
+    items = [Item(key=key) for key in ["a.py", "b.py", "c.md"]]
+    aggregate_filter = AggregateFilter(
+        aggregator=AggregatorType.ALL,
+        filters=[
+            RegexFilter(pattern="\\.py$"),
+            AggregateFilter(
+                aggregator=AggregatorType.ANY,
+                filters=[KeysFilter(keys=["a.py"]), KeysFilter(keys=["c.md"])],
+            ),
+        ],
+    )
+    assert aggregate_filter.requires_pre_process()
+    assert not AggregateFilter(aggregator=AggregatorType.ALL, filters=[]).requires_pre_process()
+
+    aggregate_filter.pre_process(items)
+    assert sorted(KeysFilter.processed) == ["a.py", "c.md"]
+    assert [aggregate_filter.is_valid(item) for item in items] == [True, False, False]
+
+
+def test_aggregate_filter_is_io_bound(valid_filter: ValidFilter) -> None:
+    """Tests that an AggregateFilter is only I/O bound when every aggregated Filter is."""
+
+    content_filter = RegexFileContentFilter(pattern="foo")
+    assert AggregateFilter(aggregator=AggregatorType.ALL, filters=[content_filter]).is_io_bound()
+    assert not AggregateFilter(
+        aggregator=AggregatorType.ALL, filters=[content_filter, valid_filter]
+    ).is_io_bound()
+    assert not AggregateFilter(aggregator=AggregatorType.ALL, filters=[]).is_io_bound()
+
+
+def test_bulk_filter_with_overridden_is_valid() -> None:
+    """Tests that BulkFilters overriding _is_valid are checked per Item in bulk."""
+
+    items = [Item(key=key) for key in ["a.py", "b.md", "c.py"]]
+    keys_filter = KeysFilter(keys=["a.py", "b.md"])
+    py_keys_filter = PyKeysFilter(keys=["a.py", "b.md"])
+    for filt in (keys_filter, py_keys_filter):
+        filt.pre_process(items)
+
+    assert keys_filter.supports_bulk_check()
+    assert not py_keys_filter.supports_bulk_check()
+    assert keys_filter.get_valid_mask(items) == [True, True, False]
+    assert py_keys_filter.get_valid_mask(items) == [True, False, False]
+    assert py_keys_filter.get_valid_mask(items) == [py_keys_filter.is_valid(item) for item in items]
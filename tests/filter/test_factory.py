@@ -85,10 +85,14 @@ def test_encoding_and_decoding() -> None:
         FilterName.REGEX_FILE_CONTENT: [
             {"pattern": "foo"},
             {"pattern": "foo", "inverted": True},
+            {"pattern": "foo", "cache_content": False},
         ],
         FilterName.SCRIPT: [
             {"script": "echo", "args": ["foo.json"], "timeout": 360},
             {"script": "echo", "args": ["foo.json"], "timeout": 360, "chunk_size": 100},
+            {"script": "echo", "args": ["foo.json"], "timeout": 360, "ndjson": True},
+            {"script": "echo", "args": ["foo.json"], "timeout": 360, "max_workers": 4},
+            {"script": "echo", "args": ["foo.json"], "timeout": 360, "persistent": True},
         ],
         FilterName.KEY_HASH_SHARD: [
             {"num_shards": 5},
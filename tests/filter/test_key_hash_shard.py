@@ -32,6 +32,10 @@ def test_key_hash_shard():
     test_cases = [(FileItem(key=path), result) for path, result in test_cases.items()]
     for item, result in test_cases:
         assert filt.is_valid(item) == result
+    assert filt.get_valid_mask([item for item, _ in test_cases]) == [
+        result for _, result in test_cases
+    ]
+    assert filt.supports_bulk_check()
 
 
 def test_inverted_key_hash_shard():
@@ -53,3 +57,6 @@ def test_inverted_key_hash_shard():
     test_cases = [(FileItem(key=path), result) for path, result in test_cases.items()]
     for item, result in test_cases:
         assert filt.is_valid(item) == result
+    assert filt.get_valid_mask([item for item, _ in test_cases]) == [
+        result for _, result in test_cases
+    ]
@@ -0,0 +1,93 @@
+# AutoTransform
+# Large scale, component based code modification library
+#
+# Licensed under the MIT License <http://opensource.org/licenses/MIT>
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2022-present Nathan Rockenbach <http://github.com/nathro>
+
+# @black_format
+
+"""Tests for the FilterPlanner."""
+
+import json
+
+from autotransform.filter.aggregate import AggregateFilter
+from autotransform.filter.base import FilterCost
+from autotransform.filter.file import FileExistsFilter
+from autotransform.filter.planner import MIN_SAMPLES, FilterPlanner
+from autotransform.filter.regex import RegexFileContentFilter, RegexFilter
+from autotransform.step.condition.aggregate import AggregatorType
+
+
+def test_static_plan():
+    """Tests that Filters without statistics are ordered by cost class."""
+
+    filters = [
+        RegexFileContentFilter(pattern="foo"),
+        FileExistsFilter(),
+        RegexFilter(pattern="bar"),
+    ]
+    planner = FilterPlanner(filters, "test")
+    assert planner.get_plan() == [2, 1, 0]
+
+
+def test_aggregate_cost():
+    """Tests that an AggregateFilter uses the cost of its most expensive Filter."""
+
+    filt = AggregateFilter(
+        aggregator=AggregatorType.ANY,
+        filters=[RegexFilter(pattern="foo"), RegexFileContentFilter(pattern="bar")],
+    )
+    assert filt.get_cost() == FilterCost.CONTENT
+
+
+def test_learned_plan(tmp_path):
+    """Tests that learned selectivity is persisted and used to order Filters."""
+
+    stats_path = str(tmp_path / "stats" / "filter_stats.json")
+    filters = [RegexFilter(pattern="foo"), RegexFilter(pattern="bar")]
+    planner = FilterPlanner(filters, "test", stats_path)
+    assert planner.get_plan() == [0, 1]
+
+    # The first Filter passes everything while the second rejects everything
+    for _ in range(MIN_SAMPLES):
+        planner.record(0, True, 0.000001)
+        planner.record(1, False, 0.000001)
+    planner.save()
+
+    with open(stats_path, "r", encoding="UTF-8") as stats_file:
+        assert len(json.load(stats_file)) == 2
+
+    planner = FilterPlanner(filters, "test", stats_path)
+    assert planner.get_plan() == [1, 0]
+    assert planner.estimate(1)[1] == 0.0
+
+    # Statistics are namespaced
+    assert FilterPlanner(filters, "other", stats_path).get_plan() == [0, 1]
+
+
+def test_malformed_stats(tmp_path):
+    """Tests that malformed statistics are ignored."""
+
+    stats_path = tmp_path / "filter_stats.json"
+    stats_path.write_text("not json", encoding="UTF-8")
+    planner = FilterPlanner([RegexFilter(pattern="foo")], "test", str(stats_path))
+    assert planner.get_plan() == [0]
+    planner.record(0, True, 0.000001)
+    planner.save()
+    with open(stats_path, "r", encoding="UTF-8") as stats_file:
+        assert len(json.load(stats_file)) == 1
+
+
+def test_learned_plan_keeps_cost_order(tmp_path):
+    """Tests that learned statistics never move a Filter ahead of a cheaper cost class."""
+
+    stats_path = str(tmp_path / "filter_stats.json")
+    filters = [FileExistsFilter(), RegexFileContentFilter(pattern="foo")]
+    planner = FilterPlanner(filters, "test", stats_path)
+    for _ in range(MIN_SAMPLES):
+        planner.record(0, True, 0.001)
+        planner.record(1, False, 0.000001)
+    planner.save()
+
+    assert FilterPlanner(filters, "test", stats_path).get_plan() == [0, 1]
@@ -11,6 +11,7 @@
 
 from autotransform.filter.regex import RegexFileContentFilter, RegexFilter
 from autotransform.item.file import FileItem
+from autotransform.util.cachedfile import FILE_CACHE
 
 
 def test_regex():
@@ -93,3 +94,58 @@ def test_inverted_file_content_regex(tmpdir):
     test_cases = [(FileItem(key=path), result) for path, result in test_cases.items()]
     for item, result in test_cases:
         assert filt.is_valid(item) == result
+
+
+def test_file_content_regex_binary(tmpdir):
+    """Tests that the regex file content filter matches binary files as bytes."""
+
+    filt = RegexFileContentFilter(pattern="(foo|fizz)")
+    test_file_dir = tmpdir.mkdir("binary_dir")
+    test_file_1 = test_file_dir.join("test1.bin")
+    test_file_1.write_binary(b"\x00\xff\xfefoo")
+    test_file_2 = test_file_dir.join("test2.bin")
+    test_file_2.write_binary(b"\x00\xff\xfebar")
+    assert filt.is_valid(FileItem(key=str(test_file_1)))
+    assert not filt.is_valid(FileItem(key=str(test_file_2)))
+
+
+def test_file_content_regex_without_caching(tmpdir):
+    """Tests that scanning file content without caching matches searching cached content."""
+
+    test_file_dir = tmpdir.mkdir("scan_dir")
+    contents = {
+        "test1.txt": "import foo\n",
+        "test2.txt": "import bar\n",
+        "test3.txt": "x = 1\nfrom  fizz import buzz\n",
+        "test4.bin": b"\x00\xff\xfeimport foo",
+        "empty.txt": "",
+    }
+    for name, content in contents.items():
+        if isinstance(content, bytes):
+            test_file_dir.join(name).write_binary(content)
+        else:
+            test_file_dir.join(name).write(content)
+
+    items = [FileItem(key=str(test_file_dir.join(name))) for name in contents]
+    for pattern in ["import\\s+foo", "^from\\s+fizz", "(foo|fizz)", "^$", "é"]:
+        cached_filter = RegexFileContentFilter(pattern=pattern)
+        scan_filter = RegexFileContentFilter(pattern=pattern, cache_content=False)
+        for item in items:
+            assert scan_filter.is_valid(item) == cached_filter.is_valid(item), (pattern, item)
+
+
+def test_file_content_regex_without_caching_non_ascii(tmpdir):
+    """Tests that scanning non-ASCII file content matches searching cached content."""
+
+    test_file_dir = tmpdir.mkdir("scan_dir")
+    test_file_dir.join("test.txt").write_binary("x a\u00e9b y".encode("UTF-8"))
+    test_file_dir.join("test.bin").write_binary(b"\x00\xff x a\xc3\xa9b y")
+    items = [FileItem(key=str(test_file_dir.join(name))) for name in ["test.txt", "test.bin"]]
+    for pattern in ["a.b", "a\\wb", "[\u00e9]", "a[^x]b", "(?i)A\u00c9B", "\\ba", "a\\Wb"]:
+        cached_filter = RegexFileContentFilter(pattern=pattern)
+        scan_filter = RegexFileContentFilter(pattern=pattern, cache_content=False)
+        for item in items:
+            FILE_CACHE.clear()
+            expected = pattern != "a\\Wb"
+            assert scan_filter.is_valid(item) == expected, (pattern, item)
+            assert cached_filter.is_valid(item) == expected, (pattern, item)
@@ -0,0 +1,112 @@
+# AutoTransform
+# Large scale, component based code modification library
+#
+# Licensed under the MIT License <http://opensource.org/licenses/MIT>
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2022-present Nathan Rockenbach <http://github.com/nathro>
+
+# @black_format
+
+"""Tests for the ScriptFilter component."""
+
+import os
+import subprocess
+import sys
+
+import pytest
+from autotransform.filter.script import ScriptFilter
+from autotransform.item.file import FileItem
+
+FILTER_SCRIPT = """
+import json
+import sys
+import time
+with open(sys.argv[1]) as item_file:
+    keys = [item["key"] for item in json.load(item_file)]
+if len(sys.argv) > 2:
+    with open(sys.argv[2], "a") as log_file:
+        log_file.write(keys[0] + "\\n")
+if "bad.txt" in keys:
+    sys.exit(1)
+time.sleep(0.2)
+print(json.dumps([key for key in keys if key.endswith(".py")]))
+"""
+
+NDJSON_FILTER_SCRIPT = """
+import json
+import sys
+with open(sys.argv[1]) as item_file:
+    for item in json.load(item_file):
+        if item["key"].endswith(".py"):
+            print(json.dumps(item["key"]), flush=True)
+"""
+
+
+def test_pre_process():
+    """Tests that a ScriptFilter stores the valid keys when pre processed."""
+
+    items = [FileItem(key="foo.py"), FileItem(key="bar.txt"), FileItem(key="baz.py")]
+    script_filter = ScriptFilter(
+        script=sys.executable, args=["-c", FILTER_SCRIPT, "<<ITEM_FILE>>"], timeout=60
+    )
+    script_filter.pre_process(items)
+
+    assert [script_filter.is_valid(item) for item in items] == [True, False, True]
+
+
+def test_pre_process_parallel_ndjson():
+    """Tests pre processing concurrent chunks with a script outputting newline delimited JSON."""
+
+    items = [FileItem(key=f"file_{idx}.{'py' if idx % 3 else 'txt'}") for idx in range(10)]
+    script_filter = ScriptFilter(
+        script=sys.executable,
+        args=["-c", NDJSON_FILTER_SCRIPT, "<<ITEM_FILE>>"],
+        timeout=60,
+        chunk_size=3,
+        ndjson=True,
+        max_workers=2,
+    )
+    script_filter.pre_process(items)
+
+    assert [script_filter.is_valid(item) for item in items] == [
+        item.key.endswith(".py") for item in items
+    ]
+
+
+def test_parallel_chunks():
+    """Tests running chunks of Items concurrently."""
+
+    items = [FileItem(key=f"file_{idx}.{'py' if idx % 3 else 'txt'}") for idx in range(20)]
+    expected = {item.key for item in items if item.key.endswith(".py")}
+    args = ["-c", FILTER_SCRIPT, "<<ITEM_FILE>>"]
+    script_filter = ScriptFilter(script=sys.executable, args=args, timeout=60, chunk_size=3)
+    assert script_filter._get_valid_keys(items) == expected  # pylint: disable=protected-access
+
+    script_filter = ScriptFilter(
+        script=sys.executable, args=args, timeout=60, chunk_size=3, max_workers=4
+    )
+    assert script_filter._get_valid_keys(items) == expected  # pylint: disable=protected-access
+
+    with pytest.raises(ValueError):
+        ScriptFilter(script=sys.executable, args=args, timeout=60, max_workers=0)
+
+
+def test_parallel_chunks_fail_fast(tmpdir):
+    """Tests that chunks which have not started are cancelled once a chunk fails."""
+
+    log_path = os.path.join(str(tmpdir), "runs.log")
+    items = [FileItem(key="bad.txt"), *[FileItem(key=f"file_{idx}.py") for idx in range(9)]]
+    script_filter = ScriptFilter(
+        script=sys.executable,
+        args=["-c", FILTER_SCRIPT, "<<ITEM_FILE>>", log_path],
+        timeout=60,
+        chunk_size=1,
+        max_workers=2,
+    )
+    with pytest.raises(subprocess.CalledProcessError):
+        script_filter._get_valid_keys(items)  # pylint: disable=protected-access
+
+    with open(log_path, encoding="UTF-8") as log_file:
+        runs = log_file.read().splitlines()
+    assert "bad.txt" in runs
+    assert len(runs) < len(items)
@@ -0,0 +1,89 @@
+# AutoTransform
+# Large scale, component based code modification library
+#
+# Licensed under the MIT License <http://opensource.org/licenses/MIT>
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2022-present Nathan Rockenbach <http://github.com/nathro>
+
+# @black_format
+
+"""Tests for the ContentSearchInput component."""
+
+import pytest
+
+from autotransform.input.contentsearch import ContentSearchInput
+from autotransform.input.gitgrep import MATCHES_KEY
+
+
+def make_tree(tmpdir, monkeypatch) -> None:
+    """Creates a tree of files to search.
+
+    Args:
+        tmpdir: The directory to create the files in.
+        monkeypatch: Used to change the current directory.
+    """
+
+    monkeypatch.chdir(tmpdir)
+    src = tmpdir.mkdir("src")
+    for idx in range(200):
+        src.join(f"file_{idx:03}.py").write("import os\n" if idx % 50 == 0 else "import sys\n")
+    src.join("multi.py").write("x = 1\nimport os\n\nimport  os.path\n")
+    src.join("empty.py").write("")
+    tmpdir.mkdir("vendor").join("lib.py").write("import os\n")
+
+
+@pytest.mark.parametrize("max_workers", [1, 2])
+def test_get_items(tmpdir, monkeypatch, max_workers):
+    """Tests searching files, in the current process and in worker processes."""
+
+    make_tree(tmpdir, monkeypatch)
+    inp = ContentSearchInput(
+        pattern="^import\\s+os",
+        paths=["src", "vendor"],
+        exclude=["file_1*.py"],
+        max_workers=max_workers,
+    )
+    assert sorted(item.key for item in inp.get_items()) == [
+        "src/file_000.py",
+        "src/file_050.py",
+        "src/multi.py",
+        "vendor/lib.py",
+    ]
+
+
+def test_include_matches(tmpdir, monkeypatch):
+    """Tests storing the line number and text of each match."""
+
+    make_tree(tmpdir, monkeypatch)
+    inp = ContentSearchInput(
+        pattern="import\\s+os", paths=["src"], max_workers=1, include_matches=True
+    )
+    items = {item.key: item for item in inp.get_items()}
+    assert items["src/multi.py"].extra_data == {
+        MATCHES_KEY: [{"line": 2, "text": "import os"}, {"line": 4, "text": "import  os"}]
+    }
+    assert items["src/file_050.py"].extra_data == {MATCHES_KEY: [{"line": 1, "text": "import os"}]}
+
+
+def test_invalid_pattern():
+    """Tests that invalid patterns are rejected."""
+
+    with pytest.raises(ValueError, match="Invalid pattern"):
+        ContentSearchInput(pattern="(", paths=["."])
+
+
+def test_non_ascii(tmpdir, monkeypatch):
+    """Tests that patterns match non-ASCII content the same way as searching text."""
+
+    monkeypatch.chdir(tmpdir)
+    src = tmpdir.mkdir("src")
+    src.join("a.py").write_text("x = 'Ã'\n", encoding="UTF-8")
+    src.join("b.py").write_text("y = 'café'\n", encoding="UTF-8")
+
+    inp = ContentSearchInput(pattern="'[é]", paths=["src"], max_workers=1)
+    assert [item.key for item in inp.get_items()] == []
+
+    inp = ContentSearchInput(pattern="caf\\w'", paths=["src"], max_workers=1, include_matches=True)
+    assert [(item.key, item.extra_data) for item in inp.get_items()] == [
+        ("src/b.py", {MATCHES_KEY: [{"line": 1, "text": "café'"}]})
+    ]
@@ -80,3 +80,70 @@ def test_legacy_migration(tmpdir):
     assert inp.paths[0] == str(empty_dir)
     with pytest.raises(ValueError, match="Can not supply both path and paths for DirectoryInput"):
         DirectoryInput(path=str(empty_dir), paths=[str(empty_dir)])
+
+
+def test_iter_items(tmpdir):
+    """Tests that DirectoryInput lazily yields the same files as get_items."""
+
+    root_dir = tmpdir.mkdir("root_dir")
+    for idx in range(3):
+        root_dir.join(f"test{idx}.txt").write("test")
+    inp = DirectoryInput(paths=[str(root_dir)])
+    first_item = next(inp.iter_items())
+    assert inp._files is None, "Files should not be cached while streaming"
+    files = sorted(item.get_path() for item in inp.get_items())
+    assert first_item.get_path() in files
+    assert sorted(item.get_path() for item in inp.iter_items()) == files
+
+
+def test_exclude_and_gitignore(tmpdir):
+    """Tests that DirectoryInput skips excluded and ignored files."""
+
+    root_dir = tmpdir.mkdir("root_dir")
+    root_dir.join(".gitignore").write("*.log\nbuild/\n")
+    root_dir.join("keep.py").write("test")
+    root_dir.join("debug.log").write("test")
+    root_dir.mkdir("build").join("out.py").write("test")
+    root_dir.mkdir("node_modules").join("dep.js").write("test")
+    root_dir.mkdir(".git").join("HEAD").write("test")
+    sub_dir = root_dir.mkdir("sub")
+    sub_dir.join(".gitignore").write("!important.log\n")
+    sub_dir.join("important.log").write("test")
+    sub_dir.join("other.log").write("test")
+
+    root = str(root_dir).replace("\\", "/")
+    inp = DirectoryInput(paths=[root], exclude=["node_modules"], respect_gitignore=True)
+    assert sorted(item.get_path() for item in inp.get_items()) == [
+        f"{root}/.gitignore",
+        f"{root}/keep.py",
+        f"{root}/sub/.gitignore",
+        f"{root}/sub/important.log",
+    ]
+
+    inp = DirectoryInput(paths=[root], exclude=[f"{root}/sub/*", "*.py"])
+    assert sorted(item.get_path() for item in inp.get_items()) == [
+        f"{root}/.git/HEAD",
+        f"{root}/.gitignore",
+        f"{root}/debug.log",
+        f"{root}/node_modules/dep.js",
+    ]
+
+
+def test_parallel_and_overlapping_paths(tmpdir):
+    """Tests that DirectoryInput lists the same files when walking in parallel and only lists
+    files once when paths overlap."""
+
+    root_dir = tmpdir.mkdir("root_dir")
+    for dir_idx in range(10):
+        sub_dir = root_dir.mkdir(f"dir_{dir_idx}")
+        for file_idx in range(3):
+            sub_dir.mkdir(f"sub_{file_idx}").join(f"test_{file_idx}.txt").write("test")
+    root = str(root_dir).replace("\\", "/")
+
+    sequential = [item.get_path() for item in DirectoryInput(paths=[root]).get_items()]
+    parallel = [
+        item.get_path()
+        for item in DirectoryInput(paths=[root, f"{root}/dir_1"], max_workers=4).get_items()
+    ]
+    assert len(sequential) == 30
+    assert sorted(parallel) == sorted(sequential)
@@ -49,6 +49,17 @@ def test_encoding_and_decoding() -> None:
     """Tests the encoding and decoding of components."""
 
     test_components: Dict[InputName, List[Dict[str, Any]]] = {
+        InputName.CONTENT_SEARCH: [
+            {"pattern": "foo", "paths": ["foo"]},
+            {
+                "pattern": "import\\s+foo",
+                "paths": ["foo", "bar"],
+                "exclude": ["node_modules"],
+                "respect_gitignore": True,
+                "max_workers": 2,
+                "include_matches": True,
+            },
+        ],
         InputName.DIRECTORY: [
             {"paths": ["foo"]},
         ],
@@ -57,6 +68,13 @@ def test_encoding_and_decoding() -> None:
         ],
         InputName.GIT_GREP: [
             {"pattern": "foo"},
+            {"patterns": ["foo", "bar"], "match_all": True},
+            {"pattern": "foo", "paths": ["src"], "exclude": ["*.md"], "include_matches": True},
+        ],
+        InputName.GIT_LS_FILES: [
+            {},
+            {"paths": ["src"], "exclude": ["*.md"]},
+            {"changed_since": "<<LAST_RUN>>"},
         ],
         InputName.INLINE: [
             {"items": []},
@@ -72,6 +90,12 @@ def test_encoding_and_decoding() -> None:
         ],
         InputName.SCRIPT: [
             {"script": "echo", "args": ['[{"name":"file", "key":"foo.json"}]'], "timeout": 360},
+            {
+                "script": "echo",
+                "args": ['{"name":"file", "key":"foo.json"}'],
+                "timeout": 360,
+                "ndjson": True,
+            },
         ],
         InputName.TARGET: [
             {
@@ -9,7 +9,10 @@
 
 """Tests for the GitGrepInput component."""
 
-from autotransform.input.gitgrep import GitGrepInput
+import subprocess
+from typing import List
+
+from autotransform.input.gitgrep import MATCHES_KEY, GitGrepInput
 
 
 def test_pattern_present() -> None:
@@ -28,3 +31,42 @@ def test_pattern_not_present() -> None:
     inp = GitGrepInput(pattern="foobar" + "fizzbuzz" + "barfoo" + "buzzfizz" + "notpresent")
     found_files = inp.get_items()
     assert len(found_files) == 0, "No matches should be found"
+
+
+def test_iter_items() -> None:
+    """Tests that iter_items lazily yields the files git grep finds."""
+
+    inp = GitGrepInput(pattern="Tests for the GitGrepInput component.")
+    found_files = list(inp.iter_items())
+    assert [item.key for item in found_files] == [item.key for item in inp.get_items()]
+
+
+def test_patterns_and_matches(tmpdir, monkeypatch) -> None:
+    """Tests searching for several patterns, scoping with pathspecs and recording matches."""
+
+    monkeypatch.chdir(tmpdir)
+    subprocess.run(["git", "init", "-q"], check=True)
+    tmpdir.join("both.txt").write("a\nfoo bar\nbaz foo\n")
+    tmpdir.join("foo.txt").write("foo only\n")
+    tmpdir.mkdir("sub").join("baz.txt").write("baz\n")
+
+    def get_keys(inp: GitGrepInput) -> List[str]:
+        return sorted(item.key for item in inp.get_items())
+
+    assert get_keys(GitGrepInput(patterns=["foo", "baz"])) == ["both.txt", "foo.txt", "sub/baz.txt"]
+    assert get_keys(GitGrepInput(patterns=["foo", "baz"], match_all=True)) == ["both.txt"]
+    assert get_keys(GitGrepInput(pattern="baz", paths=["sub"])) == ["sub/baz.txt"]
+    assert get_keys(GitGrepInput(pattern="baz", exclude=["sub"])) == ["both.txt"]
+
+    items = GitGrepInput(pattern="foo", patterns=["baz"], include_matches=True).get_items()
+    assert {item.key: item.extra_data for item in items} == {
+        "both.txt": {
+            MATCHES_KEY: [
+                {"line": 2, "text": "foo"},
+                {"line": 3, "text": "baz"},
+                {"line": 3, "text": "foo"},
+            ]
+        },
+        "foo.txt": {MATCHES_KEY: [{"line": 1, "text": "foo"}]},
+        "sub/baz.txt": {MATCHES_KEY: [{"line": 1, "text": "baz"}]},
+    }
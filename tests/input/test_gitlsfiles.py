@@ -0,0 +1,127 @@
+# AutoTransform
+# Large scale, component based code modification library
+#
+# Licensed under the MIT License <http://opensource.org/licenses/MIT>
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2022-present Nathan Rockenbach <http://github.com/nathro>
+
+# @black_format
+
+"""Tests for the GitLsFilesInput component."""
+
+import subprocess
+
+import mock
+
+import autotransform
+from autotransform.input.gitlsfiles import LAST_RUN, GitLsFilesInput
+from autotransform.schema.config import SchemaConfig
+from autotransform.schema.schema import AutoTransformSchema
+
+
+def git(*args: str) -> None:
+    """Runs a git command in the current directory.
+
+    Args:
+        *args (str): The arguments for git.
+    """
+
+    subprocess.run(["git", *args], check=True, capture_output=True)
+
+
+def make_repo(tmpdir, monkeypatch) -> None:
+    """Creates a git repo with a single commit and changes to it.
+
+    Args:
+        tmpdir: The directory to create the repo in.
+        monkeypatch: Used to change the current directory.
+    """
+
+    monkeypatch.chdir(tmpdir)
+    git("init", "-q")
+    git("config", "user.name", "Test")
+    git("config", "user.email", "test@autotransform.invalid")
+    git("config", "commit.gpgsign", "false")
+    tmpdir.mkdir("src").join("foo.py").write("foo")
+    tmpdir.join("src", "bar.py").write("bar")
+    tmpdir.mkdir("docs").join("index.md").write("docs")
+    tmpdir.join("untracked.py").write("untracked")
+    git("add", "src", "docs")
+    git("commit", "-q", "-m", "Initial commit")
+
+
+def get_keys(inp: GitLsFilesInput):
+    """Gets the sorted keys of the Items from an Input.
+
+    Args:
+        inp (GitLsFilesInput): The Input.
+
+    Returns:
+        List[str]: The keys of the Items.
+    """
+
+    return sorted(item.key for item in inp.get_items())
+
+
+def test_pathspecs(tmpdir, monkeypatch):
+    """Tests listing tracked files using include and exclude pathspecs."""
+
+    make_repo(tmpdir, monkeypatch)
+
+    assert get_keys(GitLsFilesInput()) == ["docs/index.md", "src/bar.py", "src/foo.py"]
+    assert get_keys(GitLsFilesInput(paths=["*.py"])) == ["src/bar.py", "src/foo.py"]
+    assert get_keys(GitLsFilesInput(exclude=["src/bar.py"])) == ["docs/index.md", "src/foo.py"]
+
+    # Paths are relative to the root of the repo when run from a subdirectory
+    monkeypatch.chdir(tmpdir.join("src"))
+    assert get_keys(GitLsFilesInput(paths=["foo.py"])) == ["src/foo.py"]
+
+
+def test_changed_since(tmpdir, monkeypatch):
+    """Tests listing files changed since a ref, and since the last successful run."""
+
+    make_repo(tmpdir, monkeypatch)
+    monkeypatch.setattr(
+        GitLsFilesInput, "_get_runs_path", staticmethod(lambda: str(tmpdir.join("runs.json")))
+    )
+    schema = mock.create_autospec(AutoTransformSchema)
+    schema.config = SchemaConfig(schema_name="Test Schema")
+    monkeypatch.setattr(autotransform.schema, "current", schema)
+
+    # Without a previous run, all files are listed
+    inp = GitLsFilesInput(changed_since=LAST_RUN)
+    assert get_keys(inp) == ["docs/index.md", "src/bar.py", "src/foo.py"]
+    inp.record_run()
+
+    tmpdir.join("src", "foo.py").write("changed")
+    tmpdir.join("src", "baz.py").write("baz")
+    git("rm", "-q", "src/bar.py")
+    git("add", "src")
+    git("commit", "-q", "-m", "Change files")
+
+    assert get_keys(GitLsFilesInput(changed_since="HEAD~1")) == ["src/baz.py", "src/foo.py"]
+    assert get_keys(GitLsFilesInput(changed_since=LAST_RUN)) == ["src/baz.py", "src/foo.py"]
+    assert get_keys(GitLsFilesInput(changed_since=LAST_RUN, paths=["*baz*"])) == ["src/baz.py"]
+
+
+def test_is_cacheable():
+    """Tests that only Inputs listing all files are cached."""
+
+    assert GitLsFilesInput(paths=["*.py"]).is_cacheable()
+    assert not GitLsFilesInput(changed_since="origin/main").is_cacheable()
+    assert not GitLsFilesInput(changed_since=LAST_RUN).is_cacheable()
+
+
+def test_changed_since_missing_commit(tmpdir, monkeypatch):
+    """Tests that all files are listed when the commit of the last run no longer exists."""
+
+    make_repo(tmpdir, monkeypatch)
+    runs_path = tmpdir.join("runs.json")
+    runs_path.write('{"Test Schema": "' + "0" * 40 + '"}')
+    monkeypatch.setattr(GitLsFilesInput, "_get_runs_path", staticmethod(lambda: str(runs_path)))
+    schema = mock.create_autospec(AutoTransformSchema)
+    schema.config = SchemaConfig(schema_name="Test Schema")
+    monkeypatch.setattr(autotransform.schema, "current", schema)
+
+    inp = GitLsFilesInput(changed_since=LAST_RUN)
+    assert get_keys(inp) == ["docs/index.md", "src/bar.py", "src/foo.py"]
@@ -0,0 +1,39 @@
+# AutoTransform
+# Large scale, component based code modification library
+#
+# Licensed under the MIT License <http://opensource.org/licenses/MIT>
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2022-present Nathan Rockenbach <http://github.com/nathro>
+
+# @black_format
+
+"""Tests for the ScriptInput component."""
+
+import sys
+
+from autotransform.input.script import ScriptInput
+
+NDJSON_SCRIPT = """
+import sys
+lines = ['{"name": "file", "key": "foo.py"}', "", '{"name": "file", "key": "bar.py"}']
+if len(sys.argv) > 1:
+    with open(sys.argv[1], "w") as result_file:
+        result_file.write("\\n".join(lines))
+else:
+    print("\\n".join(lines))
+"""
+
+
+def test_ndjson():
+    """Tests getting Items from a script outputting newline delimited JSON."""
+
+    inp = ScriptInput(script=sys.executable, args=["-c", NDJSON_SCRIPT], timeout=60, ndjson=True)
+    assert [item.key for item in inp.iter_items()] == ["foo.py", "bar.py"]
+
+    inp = ScriptInput(
+        script=sys.executable,
+        args=["-c", NDJSON_SCRIPT, "<<RESULT_FILE>>"],
+        timeout=60,
+        ndjson=True,
+    )
+    assert [item.key for item in inp.get_items()] == ["foo.py", "bar.py"]
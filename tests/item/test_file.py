@@ -10,6 +10,7 @@
 """Tests for the FileItem component."""
 
 from autotransform.item.file import FileItem
+from autotransform.util.cachedfile import FILE_CACHE, ORIGINAL_FILE_CACHE, WRITE_JOURNAL
 
 
 def test_get_content(tmpdir):
@@ -31,3 +32,95 @@ def test_write_content(tmpdir):
     test_file.write("")
     FileItem(key=str(test_file)).write_content(test_content)
     assert test_file.read() == test_content
+
+
+def test_bytes_and_binary(tmpdir):
+    """Tests reading bytes and detecting binary files using FileItem."""
+
+    root_dir = tmpdir.mkdir("root_dir")
+    text_file = root_dir.join("test.txt")
+    text_file.write("test")
+    binary_file = root_dir.join("test.bin")
+    binary_file.write_binary(b"\x89PNG\x00\xff\xfe")
+
+    assert FileItem(key=str(text_file)).get_bytes() == b"test"
+    assert not FileItem(key=str(text_file)).is_binary()
+    assert FileItem(key=str(binary_file)).get_bytes() == b"\x89PNG\x00\xff\xfe"
+    assert FileItem(key=str(binary_file)).is_binary()
+
+
+def test_search_content(tmpdir, monkeypatch):
+    """Tests searching text, binary and memory mapped files using FileItem."""
+
+    root_dir = tmpdir.mkdir("root_dir")
+    text_file = root_dir.join("test.txt")
+    text_file.write("foo: bar")
+    binary_file = root_dir.join("test.bin")
+    binary_file.write_binary(b"\x00\xff foo: baz")
+    large_file = root_dir.join("large.txt")
+    large_file.write("foo: fizz")
+
+    assert FileItem(key=str(text_file)).search_content(r"foo: (\w+)") == ("bar",)
+    assert FileItem(key=str(text_file)).search_content(r"bar", from_start=True) is None
+    assert FileItem(key=str(binary_file)).search_content(r"foo: (\w+)") == ("baz",)
+
+    monkeypatch.setattr("autotransform.util.cachedfile.get_mmap_threshold", lambda: 5)
+    large_item = FileItem(key=str(large_file))
+    with large_item.get_buffer() as buffer:
+        assert buffer[:3] == b"foo"
+    assert large_item.search_content(r"foo: (\w+)", from_start=True) == ("fizz",)
+    assert str(large_file) not in FILE_CACHE
+
+
+def test_search_content_non_ascii(tmpdir, monkeypatch):
+    """Tests that large and binary files match non-ASCII content the same way as cached text."""
+
+    root_dir = tmpdir.mkdir("root_dir")
+    text_file = root_dir.join("test.txt")
+    text_file.write_binary("x a\u00e9b y".encode("UTF-8"))
+    binary_file = root_dir.join("test.bin")
+    binary_file.write_binary(b"\x00\xff x a\xc3\xa9b y")
+    patterns = [r"a.b", r"a\wb", "[\u00e9]", r"a[^x]b", r"(?i)A(.)B", r"\ba", r"x a"]
+
+    text_item = FileItem(key=str(text_file))
+    expected = [text_item.search_content(pattern) for pattern in patterns]
+    assert expected == [(), (), (), (), ("\u00e9",), (), ()]
+    assert [FileItem(key=str(binary_file)).search_content(p) for p in patterns] == expected
+
+    FILE_CACHE.clear()
+    monkeypatch.setattr("autotransform.util.cachedfile.get_mmap_threshold", lambda: 5)
+    assert [text_item.search_content(pattern) for pattern in patterns] == expected
+    assert str(text_file) not in FILE_CACHE
+
+
+def test_write_journal(tmpdir):
+    """Tests that writes are recorded in the WRITE_JOURNAL, skipping writes with no changes."""
+
+    root_dir = tmpdir.mkdir("root_dir")
+    changed_file = root_dir.join("changed.txt")
+    changed_file.write("foo")
+    unchanged_file = root_dir.join("unchanged.txt")
+    unchanged_file.write("foo")
+    restored_file = root_dir.join("restored.txt")
+    restored_file.write("foo")
+    new_file = root_dir.join("new.txt")
+
+    WRITE_JOURNAL.start()
+    try:
+        FileItem(key=str(changed_file)).write_content("bar")
+        FileItem(key=str(unchanged_file)).write_content("foo")
+        FileItem(key=str(restored_file)).write_content("bar")
+        FileItem(key=str(restored_file)).write_content("foo")
+        FileItem(key=str(new_file)).write_content("bar")
+        assert WRITE_JOURNAL.get_changed_files() == [str(changed_file), str(new_file)]
+
+        FileItem(key=str(new_file)).revert()
+        assert not new_file.exists()
+        assert WRITE_JOURNAL.get_changed_files() == [str(changed_file)]
+        assert str(unchanged_file) not in ORIGINAL_FILE_CACHE
+
+        WRITE_JOURNAL.untrack()
+        assert WRITE_JOURNAL.get_changed_files() is None
+    finally:
+        WRITE_JOURNAL.untrack()
+        FILE_CACHE.release_dirty()
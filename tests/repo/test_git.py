@@ -9,12 +9,15 @@
 
 """Tests for the GitRepo component."""
 
+import os
+
 import mock
 
 import autotransform
 from autotransform.repo.git import GitRepo
 from autotransform.schema.config import SchemaConfig
 from autotransform.schema.schema import AutoTransformSchema
+from autotransform.util.cachedfile import WRITE_JOURNAL
 
 
 def test_get_changed_files():
@@ -52,3 +55,23 @@ def test_get_commit_message(mock_schema):
 
     assert GitRepo.get_commit_message("Test") == "[AutoTransform][Test Schema] Test"
     assert GitRepo.get_commit_message("[1/2] Test") == "[AutoTransform][Test Schema][1/2] Test"
+
+
+@mock.patch.object(GitRepo, "_local_repo")
+def test_changed_files_from_journal(mock_local_repo):
+    """Tests that changed files come from the WRITE_JOURNAL when it is tracking writes."""
+
+    repo = GitRepo(base_branch="master")
+    mock_local_repo.git.status.return_value = "?? foo.py"
+
+    WRITE_JOURNAL.start()
+    try:
+        WRITE_JOURNAL.record("bar.py", True)
+        assert repo.get_changed_files({"items": [], "title": "test"}) == ["bar.py"]
+        repo.commit("test", False)
+        mock_local_repo.git.add.assert_called_once_with("--all", "--", os.path.abspath("bar.py"))
+        mock_local_repo.git.status.assert_not_called()
+    finally:
+        WRITE_JOURNAL.untrack()
+
+    assert repo.get_changed_files({"items": [], "title": "test"}) == ["foo.py"]
@@ -0,0 +1,46 @@
+# AutoTransform
+# Large scale, component based code modification library
+#
+# Licensed under the MIT License <http://opensource.org/licenses/MIT>
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2022-present Nathan Rockenbach <http://github.com/nathro>
+
+# @black_format
+
+"""Tests for SchemaConfig."""
+
+import pytest
+from autotransform.schema.config import SchemaConfig
+
+
+def test_max_submissions_must_be_positive():
+    """Tests that max_submissions is validated."""
+
+    assert SchemaConfig(schema_name="foo", max_submissions=1).max_submissions == 1
+    with pytest.raises(ValueError, match="Maximum number of submissions must be positive"):
+        SchemaConfig(schema_name="foo", max_submissions=0)
+
+
+def test_max_workers_must_be_positive():
+    """Tests that max_workers is validated."""
+
+    assert SchemaConfig(schema_name="foo").max_workers is None
+    assert SchemaConfig(schema_name="foo", max_workers=4).max_workers == 4
+    with pytest.raises(ValueError, match="Maximum number of workers must be positive"):
+        SchemaConfig(schema_name="foo", max_workers=0)
+
+
+def test_max_workers_bundle():
+    """Tests that max_workers is only bundled when set."""
+
+    assert "max_workers" not in SchemaConfig(schema_name="foo").bundle()
+    config = SchemaConfig.from_data(SchemaConfig(schema_name="foo", max_workers=2).bundle())
+    assert config.max_workers == 2
+
+
+def test_cache_ttl_must_be_positive():
+    """Tests that cache_ttl is validated."""
+
+    assert SchemaConfig(schema_name="foo", cache=True, cache_ttl=60).cache_ttl == 60
+    with pytest.raises(ValueError, match="Cache TTL must be positive"):
+        SchemaConfig(schema_name="foo", cache_ttl=0)
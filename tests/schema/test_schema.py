@@ -13,20 +13,34 @@
 
 import json
 import pathlib
-from typing import Any, List, Mapping, Optional, Sequence
+import subprocess
+import threading
+from typing import Any, ClassVar, List, Mapping, Optional, Sequence
 
+import pytest
+
+import autotransform.schema
+import autotransform.schema.schema as schema_module
 from autotransform.batcher.base import Batch
+from autotransform.batcher.chunk import ChunkBatcher
 from autotransform.batcher.single import SingleBatcher
 from autotransform.change.base import Change
-from autotransform.filter.regex import RegexFilter
+from autotransform.filter.base import Filter, FilterName
+from autotransform.filter.file import FileExistsFilter
+from autotransform.filter.key_hash_shard import KeyHashShardFilter
+from autotransform.filter.regex import RegexFileContentFilter, RegexFilter
 from autotransform.input.directory import DirectoryInput
+from autotransform.input.inline import InlineFileInput
 from autotransform.item.base import Item
+from autotransform.repo.git import GitRepo
 from autotransform.repo.github import GithubRepo
 from autotransform.schema.config import SchemaConfig
 from autotransform.schema.schema import AutoTransformSchema
+from autotransform.transformer.base import TransformerName
 from autotransform.transformer.regex import RegexTransformer
+from autotransform.transformer.single import SingleTransformer
 from git import Head
-from mock import patch
+from mock import Mock, patch
 
 ALLOWED_ITEMS = [Item(key="allowed")]
 ALL_ITEMS = [Item(key="allowed"), Item(key="not_allowed")]
@@ -52,9 +66,9 @@ def get_sample_schema() -> AutoTransformSchema:
     )
 
 
-def mock_input(mocked_get_items) -> None:
+def mock_input(mocked_iter_items) -> None:
     """Sets up the Input mock."""
-    mocked_get_items.return_value = ALL_ITEMS
+    mocked_iter_items.return_value = ALL_ITEMS
 
 
 def mock_filter(mocked_is_valid) -> None:
@@ -118,15 +132,15 @@ def mock_repo(
 # patches are in reverse order
 @patch.object(Head, "checkout")
 @patch.object(RegexFilter, "_is_valid")
-@patch.object(DirectoryInput, "get_items")
+@patch.object(DirectoryInput, "iter_items")
 def test_get_items(
-    mocked_get_items,
+    mocked_iter_items,
     mocked_is_valid,
     _mocked_checkout,
 ):
     """Checks that get_batches properly calls and uses components."""
     # Set up mocks
-    mock_input(mocked_get_items)
+    mock_input(mocked_iter_items)
     mock_filter(mocked_is_valid)
 
     # Run test
@@ -134,7 +148,7 @@ def test_get_items(
     actual_items = schema.get_items()
 
     # Check Input called
-    mocked_get_items.assert_called_once()
+    mocked_iter_items.assert_called_once()
 
     # Check Filter called
     assert mocked_is_valid.call_count == 2
@@ -146,6 +160,123 @@ def test_get_items(
     assert actual_keys == [item.key for item in ALLOWED_ITEMS]
 
 
+def test_get_items_with_filter_workers(tmpdir):
+    """Checks that I/O bound Filters run concurrently preserve the order of Items."""
+
+    paths = []
+    for idx in range(50):
+        test_file = tmpdir.join(f"test_{idx}.txt")
+        test_file.write("match" if idx % 3 else "skip")
+        paths.append(str(test_file).replace("\\", "/"))
+    paths.insert(10, str(tmpdir.join("missing.txt")).replace("\\", "/"))
+
+    schema = AutoTransformSchema(
+        input=InlineFileInput(files=paths),
+        batcher=SingleBatcher(title=EXPECTED_TITLE),
+        transformer=RegexTransformer(pattern="input", replacement="inputsource"),
+        config=SchemaConfig(schema_name="Sample", filter_workers=4),
+        filters=[
+            RegexFileContentFilter(pattern="match"),
+            FileExistsFilter(),
+            RegexFilter(pattern="test_[0-9]*[0-8]\\.txt$"),
+        ],
+    )
+    expected_keys = [
+        path
+        for idx, path in enumerate(paths[:10] + paths[11:])
+        if idx % 3 and not path.endswith("9.txt")
+    ]
+    assert [item.key for item in schema.get_items()] == expected_keys
+
+
+class ThreadRecordingFilter(Filter):
+    """A Filter that is not I/O bound, recording the threads it is checked on."""
+
+    name: ClassVar[FilterName] = FilterName.REGEX
+    threads: ClassVar[List[str]] = []
+
+    def _is_valid(self, item: Item) -> bool:
+        ThreadRecordingFilter.threads.append(threading.current_thread().name)
+        return True
+
+
+def test_get_items_with_filter_workers_checks_other_filters_on_caller(tmpdir):
+    """Checks that Filters that are not I/O bound are never checked by the pool of threads."""
+
+    paths = []
+    for idx in range(20):
+        test_file = tmpdir.join(f"test_{idx}.txt")
+        test_file.write("match")
+        paths.append(str(test_file).replace("\\", "/"))
+
+    ThreadRecordingFilter.threads.clear()
+    schema = AutoTransformSchema(
+        input=InlineFileInput(files=paths),
+        batcher=SingleBatcher(title=EXPECTED_TITLE),
+        transformer=RegexTransformer(pattern="input", replacement="inputsource"),
+        config=SchemaConfig(schema_name="Sample", filter_workers=4),
+        filters=[RegexFileContentFilter(pattern="match"), ThreadRecordingFilter()],
+    )
+    assert [item.key for item in schema.get_items()] == paths
+    assert ThreadRecordingFilter.threads == [threading.current_thread().name] * len(paths)
+
+
+def test_get_items_with_bulk_checks(tmpdir):
+    """Checks that bulk checks of key Filters give the same Items as checking each Item."""
+
+    paths = [str(tmpdir.join(f"dir_{idx % 7}", f"test_{idx}.txt")) for idx in range(100)]
+    schema = AutoTransformSchema(
+        input=InlineFileInput(files=paths),
+        batcher=SingleBatcher(title=EXPECTED_TITLE),
+        transformer=RegexTransformer(pattern="input", replacement="inputsource"),
+        config=SchemaConfig(schema_name="Sample"),
+        filters=[
+            RegexFilter(pattern="test_[0-9]*[0-8]\\.txt$"),
+            RegexFilter(pattern="dir_3", inverted=True),
+            KeyHashShardFilter(num_shards=2, valid_shard=1),
+        ],
+    )
+    expected_keys = [item.key for item in schema.iter_items()]
+    assert 0 < len(expected_keys) < len(paths)
+    with patch.object(RegexFilter, "_is_valid") as mocked_is_valid:
+        assert [item.key for item in schema.get_items()] == expected_keys
+        mocked_is_valid.assert_not_called()
+
+
+def test_get_items_with_cache(tmpdir, monkeypatch):
+    """Checks that cached Input Items are reused until the repo changes."""
+
+    monkeypatch.chdir(tmpdir.mkdir("repo"))
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmpdir.join("cache")))
+    for args in (
+        ["init", "-q"],
+        ["config", "user.name", "Test"],
+        ["config", "user.email", "test@autotransform.invalid"],
+        ["config", "commit.gpgsign", "false"],
+        ["commit", "-q", "--allow-empty", "-m", "Initial commit"],
+    ):
+        subprocess.run(["git", *args], check=True, capture_output=True)
+
+    schema = AutoTransformSchema(
+        input=InlineFileInput(files=["foo.py", "bar.py"]),
+        batcher=SingleBatcher(title=EXPECTED_TITLE),
+        transformer=RegexTransformer(pattern="input", replacement="inputsource"),
+        config=SchemaConfig(schema_name="Sample", cache=True),
+    )
+    with patch.object(InlineFileInput, "get_items", wraps=schema.input.get_items) as get_items:
+        assert [item.key for item in schema.get_items()] == ["foo.py", "bar.py"]
+        assert [item.key for item in schema.get_items()] == ["foo.py", "bar.py"]
+        assert get_items.call_count == 1
+
+        subprocess.run(
+            ["git", "commit", "-q", "--allow-empty", "-m", "Change"],
+            check=True,
+            capture_output=True,
+        )
+        assert [item.key for item in schema.get_items()] == ["foo.py", "bar.py"]
+        assert get_items.call_count == 2
+
+
 # patches are in reverse order
 @patch.object(Head, "checkout")
 @patch.object(SingleBatcher, "batch")
@@ -182,9 +313,9 @@ def test_get_batches(
 @patch.object(RegexTransformer, "transform")
 @patch.object(SingleBatcher, "batch")
 @patch.object(RegexFilter, "_is_valid")
-@patch.object(DirectoryInput, "get_items")
+@patch.object(DirectoryInput, "iter_items")
 def test_run_with_changes(
-    mocked_get_items,
+    mocked_iter_items,
     mocked_is_valid,
     mocked_batch,
     mocked_transform,
@@ -196,7 +327,7 @@ def test_run_with_changes(
 ):
     """Checks that get_batches properly calls and uses components."""
     # Set up mocks
-    mock_input(mocked_get_items)
+    mock_input(mocked_iter_items)
     mock_filter(mocked_is_valid)
     mock_batcher(mocked_batch)
     mock_transformer(mocked_transform)
@@ -207,7 +338,7 @@ def test_run_with_changes(
     schema.run()
 
     # Check Input called
-    mocked_get_items.assert_called_once()
+    mocked_iter_items.assert_called_once()
 
     # Check Filter called
     assert mocked_is_valid.call_count == 2
@@ -240,9 +371,9 @@ def test_run_with_changes(
 @patch.object(RegexTransformer, "transform")
 @patch.object(SingleBatcher, "batch")
 @patch.object(RegexFilter, "_is_valid")
-@patch.object(DirectoryInput, "get_items")
+@patch.object(DirectoryInput, "iter_items")
 def test_run_with_no_changes(
-    mocked_get_items,
+    mocked_iter_items,
     mocked_is_valid,
     mocked_batch,
     mocked_transform,
@@ -254,7 +385,7 @@ def test_run_with_no_changes(
 ):
     """Checks that get_batches properly calls and uses components."""
     # Set up mocks
-    mock_input(mocked_get_items)
+    mock_input(mocked_iter_items)
     mock_filter(mocked_is_valid)
     mock_batcher(mocked_batch)
     mock_transformer(mocked_transform)
@@ -265,7 +396,7 @@ def test_run_with_no_changes(
     schema.run()
 
     # Check Input called
-    mocked_get_items.assert_called_once()
+    mocked_iter_items.assert_called_once()
 
     # Check Filter called
     assert mocked_is_valid.call_count == 2
@@ -289,6 +420,307 @@ def test_run_with_no_changes(
     mocked_rewind.assert_called_once()
 
 
+# patches are in reverse order
+@patch.object(GithubRepo, "has_outstanding_change")
+@patch.object(GithubRepo, "rewind")
+@patch.object(GithubRepo, "submit")
+@patch.object(GithubRepo, "has_changes")
+@patch.object(GithubRepo, "clean")
+@patch.object(Head, "checkout")
+@patch.object(RegexTransformer, "transform")
+@patch.object(RegexFilter, "_is_valid")
+@patch.object(DirectoryInput, "iter_items")
+def test_run_stops_at_max_submissions(
+    mocked_iter_items,
+    mocked_is_valid,
+    mocked_transform,
+    _mocked_checkout,
+    mocked_clean,
+    mocked_has_changes,
+    mocked_submit,
+    mocked_rewind,
+    mocked_has_outstanding_change,
+):
+    """Checks that a streaming run stops executing Batches once max submissions is reached,
+    gathering every Item first when there is a Repo and pulling Items lazily otherwise."""
+    # Set up mocks
+    pulled_keys = []
+    pulled_when_transformed = []
+
+    def iter_items():
+        for item in ALL_ITEMS:
+            pulled_keys.append(item.key)
+            yield item
+
+    mocked_iter_items.side_effect = iter_items
+    mocked_is_valid.return_value = True
+    mocked_has_outstanding_change.return_value = False
+    mocked_transform.side_effect = lambda _batch: pulled_when_transformed.append(len(pulled_keys))
+    mock_repo(mocked_clean, mocked_has_changes, mocked_submit, mocked_rewind, True)
+
+    # Run test
+    schema = get_sample_schema()
+    schema.batcher = ChunkBatcher(title=EXPECTED_TITLE, chunk_size=1, metadata={}, stream=True)
+    schema.config.max_submissions = 1
+    schema.run()
+
+    # Check every Item was pulled before the first Batch, and only one Batch was submitted
+    assert pulled_when_transformed == [len(ALL_ITEMS)]
+    mocked_submit.assert_called_once()
+
+    # Without a Repo, Items are pulled as Batches are executed
+    pulled_keys.clear()
+    pulled_when_transformed.clear()
+    schema.repo = None
+    schema.run()
+    assert pulled_when_transformed == [1, 2]
+
+
+@patch.object(GithubRepo, "has_outstanding_change")
+@patch.object(GithubRepo, "rewind")
+@patch.object(GithubRepo, "submit")
+@patch.object(GithubRepo, "has_changes")
+@patch.object(GithubRepo, "clean")
+@patch.object(Head, "checkout")
+@patch.object(RegexTransformer, "transform")
+@patch.object(RegexFileContentFilter, "_is_valid")
+@patch.object(DirectoryInput, "iter_items")
+def test_run_checks_content_filters_first(
+    mocked_iter_items,
+    mocked_is_valid,
+    mocked_transform,
+    _mocked_checkout,
+    mocked_clean,
+    mocked_has_changes,
+    mocked_submit,
+    mocked_rewind,
+    mocked_has_outstanding_change,
+):
+    """Checks that Filters reading files check every Item before any Batch is executed."""
+    # Set up mocks
+    pulled_keys = []
+
+    def iter_items():
+        for item in ALL_ITEMS:
+            pulled_keys.append(item.key)
+            yield item
+
+    transformed_after = []
+
+    def transform(_batch: Batch) -> None:
+        transformed_after.append(len(pulled_keys))
+
+    mocked_iter_items.side_effect = iter_items
+    mocked_is_valid.return_value = True
+    mocked_has_outstanding_change.return_value = False
+    mocked_transform.side_effect = transform
+    mock_repo(mocked_clean, mocked_has_changes, mocked_submit, mocked_rewind, False)
+
+    # Run test
+    schema = get_sample_schema()
+    schema.filters = [RegexFileContentFilter(pattern="foo")]
+    schema.batcher = ChunkBatcher(title=EXPECTED_TITLE, chunk_size=1, metadata={}, stream=True)
+    schema.run()
+
+    # Check every Item was pulled before the first transformation
+    assert transformed_after == [len(ALL_ITEMS)] * len(ALL_ITEMS)
+
+
+@patch.object(GithubRepo, "has_outstanding_change")
+@patch.object(GithubRepo, "rewind")
+@patch.object(GithubRepo, "submit")
+@patch.object(GithubRepo, "has_changes")
+@patch.object(GithubRepo, "clean")
+@patch.object(Head, "checkout")
+@patch.object(RegexTransformer, "transform")
+@patch.object(RegexFilter, "_is_valid")
+@patch.object(DirectoryInput, "iter_items")
+def test_run_keeps_current_schema(
+    mocked_iter_items,
+    mocked_is_valid,
+    mocked_transform,
+    _mocked_checkout,
+    mocked_clean,
+    mocked_has_changes,
+    mocked_submit,
+    mocked_rewind,
+    mocked_has_outstanding_change,
+):
+    """Checks that the current Schema stays set while a streaming run pulls Items."""
+    # Set up mocks
+    current_schemas = []
+
+    def iter_items():
+        for item in ALL_ITEMS:
+            current_schemas.append(autotransform.schema.current)
+            yield item
+
+    mocked_iter_items.side_effect = iter_items
+    mocked_is_valid.return_value = True
+    mocked_has_outstanding_change.return_value = False
+    mock_transformer(mocked_transform)
+    mock_repo(mocked_clean, mocked_has_changes, mocked_submit, mocked_rewind, False)
+
+    # Run test
+    schema = get_sample_schema()
+    schema.batcher = ChunkBatcher(title=EXPECTED_TITLE, chunk_size=1, metadata={}, stream=True)
+    schema.run()
+
+    # Check the Schema was current for every pulled Item, and reset once the run ended
+    assert current_schemas == [schema] * len(ALL_ITEMS)
+    assert mocked_transform.call_count == len(ALL_ITEMS)
+    assert autotransform.schema.current is None
+
+
+@patch.object(Head, "checkout")
+@patch.object(DirectoryInput, "iter_items")
+def test_run_shuts_down_workers_on_failure(mocked_iter_items, _mocked_checkout, monkeypatch):
+    """Checks that persistent workers are stopped when a run fails."""
+    # Set up mocks
+    mocked_iter_items.side_effect = RuntimeError("Input failed")
+    shutdown_workers = Mock()
+    monkeypatch.setattr(schema_module, "shutdown_workers", shutdown_workers)
+
+    # Run test
+    with pytest.raises(RuntimeError):
+        get_sample_schema().run()
+
+    shutdown_workers.assert_called_once_with()
+    assert autotransform.schema.current is None
+
+
+def git(*args: str) -> str:
+    """Runs a git command in the current directory, returning its output."""
+
+    return subprocess.run(["git", *args], check=True, capture_output=True, encoding="UTF-8").stdout
+
+
+def make_git_repo(tmpdir, monkeypatch, names: Sequence[str]):
+    """Creates a git repo with files containing foo in a src directory, returning the directory
+    after changing to it."""
+
+    monkeypatch.chdir(tmpdir)
+    git("init", "-q", "--initial-branch=master")
+    git("config", "user.name", "Test")
+    git("config", "user.email", "test@autotransform.invalid")
+    git("config", "commit.gpgsign", "false")
+    src = tmpdir.mkdir("src")
+    for name in names:
+        src.join(name).write("foo")
+    git("add", "src")
+    git("commit", "-q", "-m", "Initial commit")
+    monkeypatch.chdir(src)
+    return src
+
+
+class OpenWriteTransformer(SingleTransformer):
+    """A Transformer that writes files without going through CachedFile."""
+
+    name: ClassVar[TransformerName] = TransformerName.REGEX
+
+    def _transform_item(self, item: Item) -> None:
+        with open(item.key, "w", encoding="UTF-8") as item_file:
+            item_file.write("bar")
+
+
+def test_run_with_untracked_writes(tmpdir, monkeypatch):
+    """Checks that changes written without CachedFile are submitted."""
+
+    make_git_repo(tmpdir, monkeypatch, ["a.txt"])
+
+    schema = AutoTransformSchema(
+        input=InlineFileInput(files=["a.txt"]),
+        batcher=SingleBatcher(title="Untracked"),
+        transformer=OpenWriteTransformer(),
+        repo=GitRepo(base_branch="master"),
+        config=SchemaConfig(schema_name="Untracked"),
+    )
+    schema.run()
+
+    branches = git("branch", "--format=%(refname:short)").split()
+    assert len(branches) == 2
+    branch = next(branch for branch in branches if branch != "master")
+    assert git("diff", "--name-only", "master", branch).split() == ["src/a.txt"]
+
+
+def test_run_parallel(tmpdir, monkeypatch):
+    """Checks that Batches run in git worktrees from the subdirectory matching the current one."""
+
+    src = make_git_repo(tmpdir, monkeypatch, ["a.txt", "b.txt", "c.txt"])
+
+    schema = AutoTransformSchema(
+        input=InlineFileInput(files=["a.txt", "b.txt", "c.txt"]),
+        batcher=ChunkBatcher(title="Parallel", chunk_size=1),
+        transformer=RegexTransformer(pattern="foo", replacement="bar"),
+        repo=GitRepo(base_branch="master"),
+        config=SchemaConfig(schema_name="Parallel", max_workers=2),
+    )
+    schema.run()
+
+    branches = git("branch", "--format=%(refname:short)").split()
+    assert sorted(branches) == [
+        "AUTO_TRANSFORM__Parallel__1_3_Parallel",
+        "AUTO_TRANSFORM__Parallel__2_3_Parallel",
+        "AUTO_TRANSFORM__Parallel__3_3_Parallel",
+        "master",
+    ]
+    for idx, name in enumerate(["a.txt", "b.txt", "c.txt"], start=1):
+        changed = git(
+            "diff", "--name-only", "master", f"AUTO_TRANSFORM__Parallel__{idx}_3_Parallel"
+        )
+        assert changed.split() == [f"src/{name}"]
+    assert len(git("worktree", "list").splitlines()) == 1
+    assert src.join("a.txt").read() == "foo"
+
+
+def test_run_parallel_requires_git_repo(tmpdir, monkeypatch):
+    """Checks that Batches are executed serially without a GitRepo to create worktrees in."""
+
+    monkeypatch.chdir(tmpdir)
+    for name in ["a.txt", "b.txt"]:
+        tmpdir.join(name).write("foo")
+    run_parallel = Mock()
+    monkeypatch.setattr(AutoTransformSchema, "_run_parallel", run_parallel)
+
+    schema = AutoTransformSchema(
+        input=InlineFileInput(files=["a.txt", "b.txt"]),
+        batcher=ChunkBatcher(title="Parallel", chunk_size=1),
+        transformer=RegexTransformer(pattern="foo", replacement="bar"),
+        config=SchemaConfig(schema_name="Parallel", max_workers=2),
+    )
+    schema.run()
+
+    run_parallel.assert_not_called()
+    assert tmpdir.join("a.txt").read() == "bar"
+    assert tmpdir.join("b.txt").read() == "bar"
+
+
+def test_worker_errors(monkeypatch):
+    """Checks that workers return the original error when it can be pickled."""
+
+    class UnpicklableError(Exception):
+        def __init__(self, message: str, code: int):
+            super().__init__(message)
+            self.code = code
+
+    batch: Batch = {"items": [], "title": "test"}
+    monkeypatch.setattr(
+        schema_module,
+        "_WORKER_SCHEMA",
+        Mock(execute_batch=Mock(side_effect=ValueError("bad value"))),
+    )
+    with pytest.raises(ValueError, match="bad value"):
+        schema_module._execute_worker_batch(batch)
+
+    monkeypatch.setattr(
+        schema_module,
+        "_WORKER_SCHEMA",
+        Mock(execute_batch=Mock(side_effect=UnpicklableError("bad", 1))),
+    )
+    with pytest.raises(RuntimeError, match="UnpicklableError: bad"):
+        schema_module._execute_worker_batch(batch)
+
+
 @patch.object(Head, "checkout")
 def test_json_encoding(_mocked_checkout):
     """Checks that the schema is encoded correctly."""
@@ -86,6 +86,7 @@ def test_encoding_and_decoding() -> None:
         TransformerName.SCRIPT: [
             {"script": "black", "args": ["-l", "100"], "timeout": 100},
             {"script": "black", "args": ["-l", "100"], "timeout": 100, "chunk_size": 1},
+            {"script": "black", "args": ["-l", "100"], "timeout": 100, "persistent": True},
         ],
     }
 
@@ -0,0 +1,134 @@
+# AutoTransform
+# Large scale, component based code modification library
+#
+# Licensed under the MIT License <http://opensource.org/licenses/MIT>
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2022-present Nathan Rockenbach <http://github.com/nathro>
+
+# @black_format
+
+"""Tests for the FileCache."""
+
+import sys
+
+import autotransform.util.cachedfile
+from autotransform.util.cachedfile import (
+    FILE_CACHE,
+    ORIGINAL_FILE_CACHE,
+    CachedFile,
+    FileCache,
+    get_stat_tag,
+)
+
+CONTENT_SIZE = sys.getsizeof("a" * 100)
+
+
+def test_evicts_least_recently_used():
+    """Tests that the least recently used content is evicted once the cache is full."""
+
+    cache = FileCache(max_size=CONTENT_SIZE * 2)
+    cache.add("foo.py", "a" * 100)
+    cache.add("bar.py", "b" * 100)
+    assert cache.get("foo.py") == "a" * 100
+    cache.add("baz.py", "c" * 100)
+
+    assert "foo.py" in cache
+    assert "bar.py" not in cache
+    assert "baz.py" in cache
+    assert cache.get("bar.py") is None
+    assert cache.get_stats() == {
+        "hits": 1,
+        "misses": 1,
+        "evictions": 1,
+        "invalidations": 0,
+        "entries": 2,
+        "dirty_entries": 0,
+        "size": CONTENT_SIZE * 2,
+        "max_size": CONTENT_SIZE * 2,
+    }
+
+    # Content larger than the cache is not cached
+    assert cache.add("large.py", "d" * 1000) == "d" * 1000
+    assert "large.py" not in cache
+    assert len(cache) == 2
+
+
+def test_dirty_entries_are_pinned():
+    """Tests that written content is kept until released."""
+
+    cache = FileCache(max_size=CONTENT_SIZE * 2)
+    cache.add_dirty("foo.py", "a" * 100)
+    cache.add_dirty("bar.py", "b" * 100)
+    cache.add("baz.py", "c" * 100)
+
+    assert cache.get("foo.py") == "a" * 100
+    assert cache.get("bar.py") == "b" * 100
+    assert "baz.py" not in cache
+    assert cache.add("foo.py", "stale") == "a" * 100
+
+    cache.release_dirty()
+    assert len(cache) == 0
+    assert cache.get_stats()["size"] == 0
+
+
+def test_invalidate_validates_stat_metadata(tmp_path):
+    """Tests that entries are checked against the metadata of their file after invalidation."""
+
+    unchanged = tmp_path / "unchanged.py"
+    unchanged.write_text("a", encoding="UTF-8")
+    changed = tmp_path / "changed.py"
+    changed.write_text("b", encoding="UTF-8")
+
+    cache = FileCache(max_size=CONTENT_SIZE * 2)
+    cache.add(str(unchanged), "a", get_stat_tag(str(unchanged)))
+    cache.add(str(changed), "b", get_stat_tag(str(changed)))
+
+    # Changes made outside the cache are not seen until the cache is invalidated
+    changed.write_text("bb", encoding="UTF-8")
+    assert cache.get(str(changed)) == "b"
+
+    cache.invalidate()
+    assert cache.get(str(unchanged)) == "a"
+    assert cache.get(str(changed)) is None
+    assert str(changed) not in cache
+    assert cache.get_stats()["invalidations"] == 1
+
+
+def test_scan_does_not_cache(tmpdir):
+    """Tests that scanning a file for a pattern does not cache its content."""
+
+    test_file = tmpdir.join("foo.py")
+    test_file.write("import os\nimport sys\n")
+    cached_file = CachedFile(str(test_file))
+    assert cached_file.scan("^import\\s+os")
+    assert not cached_file.scan("import re")
+    assert str(test_file) not in FILE_CACHE
+
+    # Written content is searched rather than the file
+    cached_file.write_content("import re\n")
+    try:
+        test_file.write("import os\n")
+        assert cached_file.scan("import re")
+    finally:
+        FILE_CACHE.release_dirty()
+        ORIGINAL_FILE_CACHE.pop(str(test_file), None)
+
+
+def test_non_utf8_locale(tmpdir, monkeypatch):
+    """Tests that cached and scanned content are decoded the same way on any locale."""
+
+    def latin1_open(path, mode="r", **kwargs):
+        if "b" not in mode:
+            kwargs.setdefault("encoding", "latin-1")
+        return open(path, mode, **kwargs)  # pylint: disable=unspecified-encoding
+
+    monkeypatch.setattr(autotransform.util.cachedfile, "open", latin1_open, raising=False)
+    test_file = tmpdir.join("foo.txt")
+    test_file.write_binary("caf\u00e9\n".encode("UTF-8"))
+    cached_file = CachedFile(str(test_file))
+    try:
+        assert cached_file.scan("caf\u00e9$")
+        assert cached_file.search("caf\u00e9$") is not None
+        assert cached_file.get_content() == "caf\u00e9\n"
+    finally:
+        FILE_CACHE.pop(str(test_file), None)
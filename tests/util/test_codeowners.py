@@ -0,0 +1,94 @@
+# AutoTransform
+# Large scale, component based code modification library
+#
+# Licensed under the MIT License <http://opensource.org/licenses/MIT>
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2022-present Nathan Rockenbach <http://github.com/nathro>
+
+# @black_format
+
+"""Tests for the CodeownersIndex."""
+
+import os
+
+from autotransform.util.codeowners import CodeownersIndex
+from codeowners import CodeOwners
+
+CODEOWNERS = """
+# Comments and blank lines are skipped
+* @default
+*.py @python-owner
+/docs/ @org/docs
+src/**/test_*.py @org/testers
+/src/autotransform/ @core
+build/ @builder
+README.md @readme
+space\\ dir/ @spaces
+/src/autotransform/util/*.py @utils
+[ab]?.txt @globber
+"""
+
+PATHS = [
+    "foo.py",
+    "foo.txt",
+    "docs/index.md",
+    "src/docs/index.md",
+    "src/autotransform/schema.py",
+    "src/autotransform/util/regex.py",
+    "src/autotransform/util/data/file.json",
+    "src/tests/util/test_regex.py",
+    "src/build/out.o",
+    "build",
+    "nested/README.md",
+    "README.md/child.txt",
+    "space dir/file.txt",
+    "other/space dir/file.txt",
+    "a1.txt",
+    "dir/b2.txt",
+    "abc.txt",
+    "/abs/path.py",
+]
+
+
+def test_matches_codeowners():
+    """Tests that the index gives the same owners as the codeowners library."""
+
+    expected = CodeOwners(CODEOWNERS)
+    index = CodeownersIndex.from_text(CODEOWNERS)
+    for path in PATHS:
+        assert index.of(path) == expected.of(path), path
+    # Memoized directories give the same results
+    for path in reversed(PATHS):
+        assert index.of(path) == expected.of(path), path
+
+    assert CodeownersIndex.from_text("").of("foo.py") == []
+
+
+def test_load(tmpdir):
+    """Tests loading an index, reusing it until the CODEOWNERS file changes."""
+
+    codeowners_path = os.path.join(str(tmpdir), "CODEOWNERS")
+    cache_dir = os.path.join(str(tmpdir), "cache")
+    with open(codeowners_path, "w", encoding="UTF-8") as codeowners_file:
+        codeowners_file.write(CODEOWNERS)
+
+    index = CodeownersIndex.load(codeowners_path, cache_dir)
+    assert CodeownersIndex.load(codeowners_path, cache_dir) is index
+    assert len(os.listdir(cache_dir)) == 1
+
+    # The index is read back from disk with the same rules
+    cache_path = os.path.join(cache_dir, os.listdir(cache_dir)[0])
+    stamp = (os.stat(codeowners_path).st_mtime_ns, os.path.getsize(codeowners_path))
+    cached = CodeownersIndex.read_cache(cache_path, stamp)
+    assert cached is not None
+    for path in PATHS:
+        assert cached.of(path) == index.of(path), path
+    assert CodeownersIndex.read_cache(cache_path, (0, 0)) is None
+
+    # Changes to the file are picked up
+    with open(codeowners_path, "w", encoding="UTF-8") as codeowners_file:
+        codeowners_file.write("* @changed\n")
+    os.utime(codeowners_path, ns=(0, stamp[0] + 1_000_000_000))
+    updated = CodeownersIndex.load(codeowners_path, cache_dir)
+    assert updated is not index
+    assert updated.of("foo.py") == [("USERNAME", "@changed")]
@@ -0,0 +1,58 @@
+# AutoTransform
+# Large scale, component based code modification library
+#
+# Licensed under the MIT License <http://opensource.org/licenses/MIT>
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2022-present Nathan Rockenbach <http://github.com/nathro>
+
+# @black_format
+
+"""Tests for utility functions."""
+
+import subprocess
+import sys
+
+import pytest
+
+from autotransform.util.cachedfile import WRITE_JOURNAL
+from autotransform.util.functions import read_ndjson, run_cmd, run_cmd_streaming, stream_cmd
+
+
+def test_stream_cmd():
+    """Tests streaming NUL delimited output from a command."""
+
+    cmd = [sys.executable, "-c", "import sys; sys.stdout.write('foo\\0bar baz\\0\\0qux')"]
+    assert list(stream_cmd(cmd, separator=b"\0", chunk_size=2)) == ["foo", "bar baz", "qux"]
+
+    with pytest.raises(subprocess.CalledProcessError):
+        list(stream_cmd([sys.executable, "-c", "import sys; sys.exit(1)"]))
+
+
+def test_run_cmd_streaming():
+    """Tests lazily reading script output, including stopping early and failures."""
+
+    script = 'import sys\nfor i in range(100000):\n    print(\'{"key": "%d"}\' % i)'
+    lines = run_cmd_streaming([sys.executable, "-c", script], timeout=60, buffer_size=10)
+    assert next(lines) == '{"key": "0"}'
+    assert next(read_ndjson(lines)) == {"key": "1"}
+    # Stopping early kills the script
+    lines.close()
+
+    failing = "print('foo')\nraise SystemExit(2)"
+    with pytest.raises(subprocess.CalledProcessError):
+        list(run_cmd_streaming([sys.executable, "-c", failing]))
+
+    with pytest.raises(subprocess.TimeoutExpired):
+        list(run_cmd_streaming([sys.executable, "-c", "import time; time.sleep(10)"], timeout=1))
+
+
+def test_scripts_untrack_write_journal():
+    """Tests that running a script untracks the WRITE_JOURNAL, as scripts may write files."""
+
+    WRITE_JOURNAL.start()
+    run_cmd([sys.executable, "-c", "pass"])
+    assert WRITE_JOURNAL.get_changed_files() is None
+
+    WRITE_JOURNAL.start()
+    assert not list(run_cmd_streaming([sys.executable, "-c", "pass"]))
+    assert WRITE_JOURNAL.get_changed_files() is None
@@ -0,0 +1,57 @@
+# AutoTransform
+# Large scale, component based code modification library
+#
+# Licensed under the MIT License <http://opensource.org/licenses/MIT>
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2022-present Nathan Rockenbach <http://github.com/nathro>
+
+# @black_format
+
+"""Tests for the .gitignore matcher."""
+
+from autotransform.util.gitignore import GitIgnore, GitIgnoreMatcher
+
+
+def test_patterns():
+    """Tests matching paths against gitignore patterns."""
+
+    gitignore = GitIgnore(
+        [
+            "# comment",
+            "",
+            "*.pyc",
+            "/dist",
+            "docs/*.md",
+            "**/cache/**",
+            "out/",
+            "!keep.pyc",
+            "file[0-9].txt",
+        ]
+    )
+
+    assert gitignore.match("foo.pyc", False)
+    assert gitignore.match("src/foo.pyc", False)
+    assert gitignore.match("src/keep.pyc", False) is False
+    assert gitignore.match("dist", True)
+    assert gitignore.match("src/dist", True) is None
+    assert gitignore.match("docs/index.md", False)
+    assert gitignore.match("docs/api/index.md", False) is None
+    assert gitignore.match("a/b/cache/data.bin", False)
+    assert gitignore.match("out", True)
+    assert gitignore.match("out", False) is None
+    assert gitignore.match("file1.txt", False)
+    assert gitignore.match("fileA.txt", False) is None
+
+
+def test_matcher_precedence():
+    """Tests that deeper .gitignore files take precedence over shallower ones."""
+
+    matcher = GitIgnoreMatcher([(GitIgnore(["*.log", "vendor/lib"]), "")])
+    sub_matcher = matcher.descend("vendor").with_gitignore(GitIgnore(["!keep.log"]))
+
+    assert matcher.is_ignored("debug.log", False)
+    assert not matcher.is_ignored("vendor", True)
+    assert matcher.descend("vendor").is_ignored("lib", True)
+    assert sub_matcher.is_ignored("lib", True)
+    assert sub_matcher.is_ignored("debug.log", False)
+    assert not sub_matcher.is_ignored("keep.log", False)
@@ -0,0 +1,84 @@
+# AutoTransform
+# Large scale, component based code modification library
+#
+# Licensed under the MIT License <http://opensource.org/licenses/MIT>
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2022-present Nathan Rockenbach <http://github.com/nathro>
+
+# @black_format
+
+"""Tests for the InputCache."""
+
+import os
+import subprocess
+import time
+
+from autotransform.item.base import Item
+from autotransform.item.file import FileItem
+from autotransform.util.inputcache import InputCache, get_repo_state
+
+
+def git(*args: str) -> None:
+    """Runs a git command in the current directory.
+
+    Args:
+        *args (str): The arguments for git.
+    """
+
+    subprocess.run(["git", *args], check=True, capture_output=True)
+
+
+def test_get_and_set(tmpdir):
+    """Tests storing Items, along with expiring and evicting entries."""
+
+    cache = InputCache(str(tmpdir), ttl=60)
+    items = [FileItem(key="foo.py"), Item(key="bar", extra_data={"baz": [1, 2]})]
+    key = InputCache.get_key({"name": "inline"}, "abc")
+    assert key != InputCache.get_key({"name": "inline"}, "def")
+    assert cache.get(key) is None
+
+    cache.set(key, items)
+    assert cache.get(key) == items
+
+    # Expired entries are removed
+    path = os.path.join(str(tmpdir), f"{key}.json.gz")
+    expired = time.time() - 120
+    os.utime(path, (expired, expired))
+    assert cache.get(key) is None
+    assert not os.path.exists(path)
+
+    # The oldest entries are evicted once the cache is too large
+    cache.set("first", items)
+    cache.max_size = os.path.getsize(os.path.join(str(tmpdir), "first.json.gz"))
+    older = time.time() - 30
+    os.utime(os.path.join(str(tmpdir), "first.json.gz"), (older, older))
+    cache.set("second", items)
+    assert cache.get("first") is None
+    assert cache.get("second") == items
+
+
+def test_get_repo_state(tmpdir, monkeypatch):
+    """Tests that the repo state tracks HEAD and uncommitted changes to tracked files."""
+
+    monkeypatch.chdir(tmpdir)
+    assert get_repo_state() is None
+
+    git("init", "-q")
+    git("config", "user.name", "Test")
+    git("config", "user.email", "test@autotransform.invalid")
+    git("config", "commit.gpgsign", "false")
+    tmpdir.join("foo.py").write("foo")
+    git("add", "foo.py")
+    git("commit", "-q", "-m", "Initial commit")
+    head = subprocess.check_output(["git", "rev-parse", "HEAD"], encoding="UTF-8").strip()
+    assert get_repo_state() == head
+
+    tmpdir.join("foo.py").write("bar")
+    dirty_state = get_repo_state()
+    assert dirty_state is not None and dirty_state.startswith(f"{head}-")
+    tmpdir.join("foo.py").write("baz")
+    assert get_repo_state() not in (head, dirty_state)
+
+    # Untracked files are not captured by the state
+    tmpdir.join("untracked.py").write("untracked")
+    assert get_repo_state() is None
@@ -0,0 +1,81 @@
+# AutoTransform
+# Large scale, component based code modification library
+#
+# Licensed under the MIT License <http://opensource.org/licenses/MIT>
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2022-present Nathan Rockenbach <http://github.com/nathro>
+
+# @black_format
+
+"""Tests for the ItemStateStore."""
+
+import os
+
+from autotransform.item.base import Item
+from autotransform.item.file import FileItem
+from autotransform.util.cachedfile import FILE_CACHE
+from autotransform.util.itemstate import ItemStateStore
+
+SCHEMA_BUNDLE = {"input": {"name": "directory", "paths": ["."]}}
+
+
+def test_record_and_check(tmp_path):
+    """Tests that recorded Items are unchanged until their content or the Schema changes."""
+
+    test_file = tmp_path / "test.txt"
+    test_file.write_text("foo", encoding="UTF-8")
+    item = FileItem(key=str(test_file))
+    db_path = str(tmp_path / "cache" / "item_state.sqlite")
+
+    with ItemStateStore(db_path, "test", SCHEMA_BUNDLE) as store:
+        assert not store.is_unchanged(item)
+        store.record([item, Item(key="not_a_file")])
+        assert store.is_unchanged(item)
+
+    # Touching the file without changing content keeps the Item unchanged
+    stat = os.stat(test_file)
+    os.utime(test_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1000000000))
+    with ItemStateStore(db_path, "test", SCHEMA_BUNDLE) as store:
+        assert store.is_unchanged(item)
+        assert not ItemStateStore(db_path, "other", SCHEMA_BUNDLE).is_unchanged(item)
+
+    # Changing the Schema invalidates the state
+    with ItemStateStore(db_path, "test", SCHEMA_BUNDLE | {"filters": []}) as store:
+        assert not store.is_unchanged(item)
+
+    # Changing the content invalidates the state
+    FILE_CACHE.pop(str(test_file), None)
+    test_file.write_text("foobar", encoding="UTF-8")
+    with ItemStateStore(db_path, "test", SCHEMA_BUNDLE) as store:
+        assert not store.is_unchanged(item)
+    FILE_CACHE.pop(str(test_file), None)
+
+
+def test_missing_file(tmp_path):
+    """Tests that missing files are never unchanged."""
+
+    test_file = tmp_path / "test.txt"
+    test_file.write_text("foo", encoding="UTF-8")
+    item = FileItem(key=str(test_file))
+    with ItemStateStore(str(tmp_path / "item_state.sqlite"), "test", SCHEMA_BUNDLE) as store:
+        store.record([item])
+        test_file.unlink()
+        assert not store.is_unchanged(item)
+    FILE_CACHE.pop(str(test_file), None)
+
+
+def test_binary_file(tmp_path):
+    """Tests that binary files are hashed by their bytes."""
+
+    test_file = tmp_path / "test.bin"
+    test_file.write_bytes(b"\x00\xff\xfe")
+    item = FileItem(key=str(test_file))
+    db_path = str(tmp_path / "item_state.sqlite")
+    with ItemStateStore(db_path, "test", SCHEMA_BUNDLE) as store:
+        store.record([item])
+        stat = os.stat(test_file)
+        os.utime(test_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1000000000))
+        assert store.is_unchanged(item)
+
+        test_file.write_bytes(b"\x00\xff\xfd")
+        assert not store.is_unchanged(item)
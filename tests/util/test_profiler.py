@@ -0,0 +1,66 @@
+# AutoTransform
+# Large scale, component based code modification library
+#
+# Licensed under the MIT License <http://opensource.org/licenses/MIT>
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2022-present Nathan Rockenbach <http://github.com/nathro>
+
+# @black_format
+
+"""Tests for the Profiler."""
+
+import json
+import time
+
+from autotransform.util.profiler import (
+    Profiler,
+    get_profiler,
+    profile,
+    profile_iter,
+    set_profiler,
+)
+
+
+def test_disabled():
+    """Tests that profiling helpers do nothing without an active Profiler."""
+
+    assert get_profiler() is None
+    values = [1, 2, 3]
+    assert profile_iter("stage", values) is values
+    with profile("stage"):
+        pass
+
+
+def test_nested_stages(tmp_path):
+    """Tests that stages are recorded with nested stage time excluded."""
+
+    profiler = Profiler()
+    set_profiler(profiler)
+    try:
+
+        def produce():
+            for value in range(3):
+                with profile("inner", 1):
+                    time.sleep(0.01)
+                yield value
+
+        assert list(profile_iter("outer", produce())) == [0, 1, 2]
+        profiler.add("filter", 0.5, 2)
+    finally:
+        set_profiler(None)
+
+    report = profiler.get_report()
+    stages = {stats["stage"]: stats for stats in report["stages"]}
+    assert [stats["stage"] for stats in report["stages"]] == ["inner", "outer", "filter"]
+    assert stages["inner"]["calls"] == 3
+    assert stages["inner"]["items"] == 3
+    assert stages["inner"]["seconds"] >= 0.03
+    assert stages["outer"]["calls"] == 1
+    assert stages["outer"]["items"] == 3
+    assert stages["outer"]["seconds"] < 0.03
+    assert stages["filter"] == {"stage": "filter", "calls": 1, "items": 2, "seconds": 0.5}
+    assert "inner" in profiler.get_table()
+
+    report_path = tmp_path / "profile" / "report.json"
+    profiler.write_report(str(report_path))
+    assert json.loads(report_path.read_text(encoding="UTF-8"))["stages"] == report["stages"]
@@ -0,0 +1,111 @@
+# AutoTransform
+# Large scale, component based code modification library
+#
+# Licensed under the MIT License <http://opensource.org/licenses/MIT>
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2022-present Nathan Rockenbach <http://github.com/nathro>
+
+# @black_format
+
+"""Tests for regex utilities."""
+
+import re
+
+import pytest
+from autotransform.util.regex import (
+    PatternMatcher,
+    compile_text_and_bytes,
+    get_literal_suffix,
+    get_required_literal,
+    matches_bytes_equally,
+)
+
+
+def test_get_required_literal():
+    """Tests finding the longest literal every match of a pattern contains."""
+
+    assert get_required_literal("foo") == "foo"
+    assert get_required_literal("import\\s+os") == "import"
+    assert get_required_literal("(?:abc)def\\d+xyzw") == "abcdef"
+    assert get_required_literal("\\bfoo\\b.*barbaz$") == "barbaz"
+    assert get_required_literal("(ab){2}c") == "ab"
+    assert get_required_literal("foo?bar") == "bar"
+
+    # Patterns without a required literal
+    assert get_required_literal("foo|bar") is None
+    assert get_required_literal("[a-z]+") is None
+    assert get_required_literal("(?:foo)?") is None
+    assert get_required_literal("(?i)foo") is None
+    assert get_required_literal("(?i:foo)") is None
+    assert get_required_literal("(") is None
+
+
+def test_get_literal_suffix():
+    """Tests finding the literal characters that end a pattern."""
+
+    assert get_literal_suffix("foo") == "foo"
+    assert get_literal_suffix("[^/]*\\.py") == ".py"
+    assert get_literal_suffix("src/.*/bar") == "/bar"
+    assert get_literal_suffix("foo[^/]*") == ""
+    assert get_literal_suffix("(?i)foo") == ""
+    assert get_literal_suffix("(") == ""
+
+
+def test_matches_bytes_equally():
+    """Tests detecting patterns that match UTF-8 encoded bytes the same way as text."""
+
+    equal = ["foo", "^import", "[a-z_]+\\.py$", "(a)\\1|b", "foo(?=bar)", "(?>ab)"]
+    for pattern in equal:
+        assert matches_bytes_equally(pattern), pattern
+
+    different = ["a.b", "a\\wb", "\\bfoo", "[^a]", "[\u00e9]", "\\xe9", "(?i)foo", "(?i:foo)", "("]
+    for pattern in different:
+        assert not matches_bytes_equally(pattern), pattern
+
+
+def test_compile_text_and_bytes():
+    """Tests compiling patterns for bytes only when they match bytes the same way as text."""
+
+    str_pattern, bytes_pattern = compile_text_and_bytes("^foo", re.MULTILINE)
+    assert str_pattern.pattern == "^foo"
+    assert bytes_pattern is not None and bytes_pattern.search(b"bar\nfoo") is not None
+    assert compile_text_and_bytes("a.b")[1] is None
+    assert compile_text_and_bytes("foo", re.IGNORECASE)[1] is None
+
+
+def test_pattern_matcher():
+    """Tests that searching for several patterns at once matches searching for each."""
+
+    patterns = [
+        "foo\\.py",
+        "^src/.*\\.java$",
+        "(?P<name>bar)",
+        "(?P<name>baz)",
+        "(a)\\1",
+        "(?i)README",
+        "",
+    ]
+    keys = ["foo.py", "fooxpy", "src/Foo.java", "lib/Foo.java", "bar", "baz", "aa", "ab"]
+    keys.extend(["readme.md", "qux", "foo.py.foo.py"])
+    for idx in range(len(patterns)):
+        for size in range(1, len(patterns) - idx + 1):
+            selected = patterns[idx : idx + size]
+            matcher = PatternMatcher(selected)
+            expected = [any(re.search(pattern, key) for pattern in selected) for key in keys]
+            assert [matcher.search(key) for key in keys] == expected, selected
+            assert matcher.search_all(keys) == expected, selected
+
+    # Literals are searched for in a joined buffer unless the keys contain newlines
+    matcher = PatternMatcher(["foo", "bar"])
+    assert matcher.search_all(["xfoo", "ba", "r", "barfoo", ""]) == [
+        True,
+        False,
+        False,
+        True,
+        False,
+    ]
+    assert matcher.search_all(["ba\nr", "fo\no", "foo\n"]) == [False, False, True]
+    assert not matcher.search_all([])
+
+    with pytest.raises(re.error):
+        PatternMatcher(["foo", "("])
@@ -0,0 +1,115 @@
+# AutoTransform
+# Large scale, component based code modification library
+#
+# Licensed under the MIT License <http://opensource.org/licenses/MIT>
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2022-present Nathan Rockenbach <http://github.com/nathro>
+
+# @black_format
+
+"""Tests for persistent workers."""
+
+import subprocess
+import sys
+
+import pytest
+from autotransform.filter.script import ScriptFilter
+from autotransform.item.file import FileItem
+from autotransform.util.worker import (
+    get_request,
+    get_response,
+    get_worker,
+    run_worker_on_items,
+    shutdown_workers,
+)
+
+WORKER_SCRIPT = """
+import json
+import os
+import struct
+import sys
+import time
+
+HEADER = struct.Struct(">I")
+while header := sys.stdin.buffer.read(HEADER.size):
+    request = json.loads(sys.stdin.buffer.read(HEADER.unpack(header)[0]))
+    keys = request["keys"]
+    if "crash" in keys:
+        os._exit(3)
+    if "sleep" in keys:
+        time.sleep(30)
+    response = {
+        "id": request["id"],
+        "returncode": 1 if "fail" in keys else 0,
+        "stdout": str(os.getpid()),
+        "result": [key for key in keys if key.endswith(".py")],
+    }
+    message = json.dumps(response).encode("UTF-8")
+    sys.stdout.buffer.write(HEADER.pack(len(message)) + message)
+    sys.stdout.buffer.flush()
+"""
+
+WORKER_CMD = [sys.executable, "-c", WORKER_SCRIPT, "<<KEY_FILE>>"]
+
+
+def test_requests():
+    """Tests pipelining requests to a worker, reusing the worker for each request."""
+
+    worker = get_worker(WORKER_CMD)
+    assert worker.cmd == WORKER_CMD[:-1]
+    assert get_worker(WORKER_CMD) is worker
+
+    chunks = [[FileItem(key=f"file_{idx}.py"), FileItem(key=f"file_{idx}.txt")] for idx in range(5)]
+    futures = [worker.submit(get_request(chunk, {})) for chunk in chunks]
+    responses = [get_response(worker, future, 60) for future in futures]
+    assert [response.result for response in responses] == [[f"file_{idx}.py"] for idx in range(5)]
+    assert len({response.proc.stdout for response in responses}) == 1
+
+    proc = run_worker_on_items(WORKER_CMD, [FileItem(key="fail")], {}, 60)
+    assert proc.returncode == 1
+    assert proc.stdout == responses[0].proc.stdout
+    shutdown_workers()
+
+
+def test_restart():
+    """Tests that workers are restarted after crashing or timing out."""
+
+    proc = run_worker_on_items(WORKER_CMD, [FileItem(key="foo.py")], {}, 60)
+    assert proc.returncode == 0
+    pid = proc.stdout
+
+    # A crash fails the run, then the worker is restarted
+    assert run_worker_on_items(WORKER_CMD, [FileItem(key="crash")], {}, 60).returncode == 3
+    proc = run_worker_on_items(WORKER_CMD, [FileItem(key="foo.py")], {}, 60)
+    assert proc.returncode == 0
+    assert proc.stdout != pid
+    pid = proc.stdout
+
+    # A timeout kills the worker, then the worker is restarted
+    with pytest.raises(subprocess.TimeoutExpired):
+        run_worker_on_items(WORKER_CMD, [FileItem(key="sleep")], {}, 1)
+    proc = run_worker_on_items(WORKER_CMD, [FileItem(key="foo.py")], {}, 60)
+    assert proc.returncode == 0
+    assert proc.stdout != pid
+    shutdown_workers()
+
+
+def test_script_filter():
+    """Tests a ScriptFilter using a persistent worker."""
+
+    items = [FileItem(key=f"file_{idx}.{'py' if idx % 2 else 'txt'}") for idx in range(10)]
+    script_filter = ScriptFilter(
+        script=WORKER_CMD[0],
+        args=[*WORKER_CMD[1:], "<<ITEM_FILE>>"],
+        timeout=60,
+        chunk_size=3,
+        persistent=True,
+    )
+    # pylint: disable=protected-access
+    assert script_filter._get_valid_keys(items) == {
+        item.key for item in items if item.key.endswith(".py")
+    }
+
+    with pytest.raises(subprocess.CalledProcessError):
+        script_filter._get_valid_keys([FileItem(key="fail")])
+    shutdown_workers()
@@ -57,6 +57,7 @@ def test_encoding_and_decoding() -> None:
             {"script": "black", "args": ["-l", "100"]},
             {"script": "black", "args": ["-l", "100"], "per_item": True},
             {"script": "black", "args": ["-l", "100"], "run_on_changes": True},
+            {"script": "black", "args": ["-l", "100"], "persistent": True},
             {
                 "script": "black",
                 "args": ["-l", "100"],